@@ -1,3 +1,4 @@
 from .agent import Agent
+from .population import Population, ACTION_DTYPE, GENOME_DTYPE, round_actions
 
-__all__ = ['Agent']
\ No newline at end of file
+__all__ = ['Agent', 'Population', 'ACTION_DTYPE', 'GENOME_DTYPE', 'round_actions']
\ No newline at end of file
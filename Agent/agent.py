@@ -1,21 +1,64 @@
-from typing import List, Dict
+from typing import List, Dict, Self
+import numpy as np
+from .population import Population
 
 class Agent:
-    def __init__(self, sale_history: Dict[str, List[int]]):
+    __slots__ = ('population', 'index')
+
+    def __init__(self, sale_history: Dict[str, List[int]] | None = None, *,
+                 population: Population | None = None, index: int = 0):
         # Taki słownik: {
         #   'ticker1': [1, 2, -1, -2, 3] <- Tyle elementów listy ile dni, dodatni to kupno, ujemny to sprzedaż
-        #   'ticker2': [9, 2, -2, 3, 0] 
+        #   'ticker2': [9, 2, -2, 3, 0]
         # }
-        self.sale_history = sale_history
-        self.profit = 0
-        self.age = 0
+        # Agent to tylko widok na jeden wiersz populacji
+        if population is None:
+            population = Population.from_sale_histories([sale_history])
+        self.population = population
+        self.index = index
+
+    @classmethod
+    def views(cls, population: Population) -> List[Self]:
+        return [cls(population=population, index=i) for i in range(len(population))]
+
+    @property
+    def tickers(self) -> List[str]:
+        return self.population.tickers
+
+    @property
+    def actions(self) -> np.ndarray:
+        return self.population.actions[self.index]
+
+    @property
+    def sale_history(self) -> Dict[str, np.ndarray]:
+        return self.population.sale_history(self.index)
+
+    @property
+    def profit(self) -> float:
+        return float(self.population.profits[self.index])
+
+    @profit.setter
+    def profit(self, value: float):
+        self.population.profits[self.index] = value
+
+    @property
+    def age(self) -> int:
+        return int(self.population.ages[self.index])
+
+    @age.setter
+    def age(self, value: int):
+        self.population.ages[self.index] = value
+
+    def copy(self) -> Self:
+        return Agent(population=self.population.take([self.index]))
 
     def execute(self, historical_prices, start_asset):
         curr_asset = start_asset
-        inventory = {ticker: 0 for ticker in self.sale_history}
+        sale_history = {ticker: actions.tolist() for ticker, actions in self.sale_history.items()}
+        inventory = {ticker: 0 for ticker in sale_history}
 
-        for i in range(len(next(iter(self.sale_history.values())))):
-            for ticker, actions in self.sale_history.items():
+        for i in range(len(next(iter(sale_history.values())))):
+            for ticker, actions in sale_history.items():
                 action = actions[i]
                 inventory[ticker] += action
                 if inventory[ticker] < 0:
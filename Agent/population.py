@@ -0,0 +1,75 @@
+from typing import Self, Sequence
+import numpy as np
+
+ACTION_DTYPE = np.int16
+GENOME_DTYPE = np.float32
+
+
+def round_actions(values: np.ndarray, dtype=ACTION_DTYPE) -> np.ndarray:
+    # liczba akcji z genomu; wartości spoza zakresu typu są przycinane, a nie zawijane przy rzutowaniu
+    limits = np.iinfo(dtype)
+    return np.clip(np.rint(values), limits.min, limits.max).astype(dtype)
+
+
+class Population:
+    # Wszystkie genomy populacji w jednej tablicy (agent, ticker, dzień)
+    def __init__(self, tickers: Sequence[str], actions: np.ndarray, dtype=ACTION_DTYPE,
+                 profits: np.ndarray | None = None, ages: np.ndarray | None = None):
+        self.tickers = list(tickers)
+        self.actions = np.ascontiguousarray(actions, dtype=dtype)
+        size = len(self.actions)
+        self.profits = np.zeros(size, dtype=np.float64) if profits is None else np.asarray(profits, dtype=np.float64)
+        self.ages = np.zeros(size, dtype=np.int64) if ages is None else np.asarray(ages, dtype=np.int64)
+
+    @classmethod
+    def empty(cls, tickers: Sequence[str], size: int, num_of_days: int, dtype=ACTION_DTYPE) -> Self:
+        return cls(tickers, np.zeros((size, len(tickers), num_of_days), dtype=dtype), dtype)
+
+    @classmethod
+    def from_sale_histories(cls, sale_histories: Sequence[dict], dtype=ACTION_DTYPE) -> Self:
+        tickers = list(sale_histories[0].keys())
+        actions = np.array([[history[ticker] for ticker in tickers] for history in sale_histories])
+        if np.issubdtype(np.dtype(dtype), np.integer):
+            actions = round_actions(actions, dtype)
+        return cls(tickers, actions, dtype)
+
+    @classmethod
+    def from_agents(cls, agents: Sequence, dtype=ACTION_DTYPE) -> Self:
+        population = cls(agents[0].tickers, np.stack([agent.actions for agent in agents]), dtype)
+        population.profits[:] = [agent.profit for agent in agents]
+        population.ages[:] = [agent.age for agent in agents]
+        return population
+
+    @classmethod
+    def concatenate(cls, populations: Sequence[Self]) -> Self:
+        return cls(
+            populations[0].tickers,
+            np.concatenate([population.actions for population in populations]),
+            populations[0].dtype,
+            np.concatenate([population.profits for population in populations]),
+            np.concatenate([population.ages for population in populations])
+        )
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.actions.dtype
+
+    @property
+    def num_of_days(self) -> int:
+        return self.actions.shape[2]
+
+    def take(self, indices) -> Self:
+        return Population(self.tickers, self.actions[indices], self.dtype, self.profits[indices], self.ages[indices])
+
+    def astype(self, dtype) -> Self:
+        if np.issubdtype(np.dtype(dtype), np.integer) and np.dtype(dtype) != self.dtype:
+            actions = round_actions(self.actions, dtype)
+        else:
+            actions = self.actions
+        return Population(self.tickers, actions, dtype, self.profits.copy(), self.ages.copy())
+
+    def sale_history(self, index: int) -> dict[str, np.ndarray]:
+        return {ticker: self.actions[index, i] for i, ticker in enumerate(self.tickers)}
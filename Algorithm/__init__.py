@@ -1,4 +1,7 @@
 from .genetic_algorithm import GeneticAlgorithm
 from .genome import Genome
+from .age_statistics import AgeStatistics
+from .algorithm_settings import GASettings
+from .feasibility_repair import FeasibilityRepair
 
-__all__ = ['GeneticAlgorithm', 'Genome']
\ No newline at end of file
+__all__ = ['GeneticAlgorithm', 'Genome', 'AgeStatistics', 'GASettings', 'FeasibilityRepair']
\ No newline at end of file
@@ -0,0 +1,71 @@
+from typing import Self
+import numpy as np
+
+
+class AgeStatistics:
+    # Statystyki wieku agentów w stałej pamięci: histogram wieków (wiek to liczba całkowita,
+    # więc mediana i średnia są dokładne, jak w module statistics) oraz średnia i wariancja
+    # liczone metodą Welforda, które można łączyć między niezależnymi przebiegami
+    def __init__(self, histogram: np.ndarray | None = None, count: int = 0, running_mean: float = 0.0,
+                 m2: float = 0.0) -> None:
+        self.histogram = np.zeros(64, dtype=np.int64) if histogram is None else np.asarray(histogram, dtype=np.int64)
+        self.count = count
+        self.running_mean = running_mean
+        self.m2 = m2
+
+    def add(self, ages: np.ndarray) -> None:
+        ages = np.asarray(ages, dtype=np.int64)
+        if len(ages) == 0:
+            return
+        counts = np.bincount(ages)
+        self._grow(len(counts))
+        self.histogram[:len(counts)] += counts
+        self._combine(len(ages), float(ages.mean()), float(((ages - ages.mean()) ** 2).sum()))
+
+    def merge(self, other: Self) -> None:
+        if other.count == 0:
+            return
+        self._grow(len(other.histogram))
+        self.histogram[:len(other.histogram)] += other.histogram
+        self._combine(other.count, other.running_mean, other.m2)
+
+    def _grow(self, size: int) -> None:
+        if size > len(self.histogram):
+            histogram = np.zeros(max(size, 2 * len(self.histogram)), dtype=np.int64)
+            histogram[:len(self.histogram)] = self.histogram
+            self.histogram = histogram
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        # łączenie dwóch zbiorów (Chan i in.), dla count == 1 to zwykły krok Welforda
+        total = self.count + count
+        delta = mean - self.running_mean
+        self.running_mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mean(self) -> int | float:
+        # ten sam wynik co statistics.mean dla liczb całkowitych
+        if self.count == 0:
+            raise ValueError('mean requires at least one data point')
+        total = int(np.arange(len(self.histogram)) @ self.histogram)
+        return total // self.count if total % self.count == 0 else total / self.count
+
+    @property
+    def median(self) -> int | float:
+        # ten sam wynik co statistics.median dla liczb całkowitych
+        if self.count == 0:
+            raise ValueError('no median for empty data')
+        cumulative = np.cumsum(self.histogram)
+        upper = int(np.searchsorted(cumulative, self.count // 2 + 1))
+        if self.count % 2 == 1:
+            return upper
+        lower = int(np.searchsorted(cumulative, self.count // 2))
+        return (lower + upper) / 2
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
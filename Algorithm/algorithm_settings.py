@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Self
 
 @dataclass
 class GASettings:
@@ -10,4 +11,9 @@ class GASettings:
     mutate_change_chance: float = 0.5
     mutate_rotate_chance: float = 0.5
     crossover_point_amount: int = 2
-    crossover_point_chance: float = 0.5
\ No newline at end of file
+    crossover_point_chance: float = 0.5
+    repair: bool = False
+
+    @classmethod
+    def from_json(cls, json_content: dict | None) -> Self:
+        return cls(**(json_content or {}))
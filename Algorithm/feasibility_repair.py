@@ -0,0 +1,74 @@
+from typing import List, Self
+from Stocks import PricePanel
+import numpy as np
+
+
+class FeasibilityRepair:
+    # Naprawa dzieci po mutacji: dzień po dniu sprzedaż jest przycinana do posiadanych akcji,
+    # a zakupy skalowane (w dół, do całych akcji) do gotówki dostępnej po sprzedaży.
+    # Naprawiani są tylko agenci, którzy bez naprawy dostaliby zysk 0.
+    CASH_MARGIN = 1e-9
+
+    def __init__(self, prices: np.ndarray, start_asset: float):
+        # prices: (tickers, days), te same co w PopulationEvaluator
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.start_asset = start_asset
+        self.children = 0
+        self.infeasible_before = 0
+        self.infeasible_after = 0
+
+    @classmethod
+    def from_historical_prices(cls, historical_prices: PricePanel, tickers: List[str],
+                               simulation_length: int, start_asset: float) -> Self:
+        return cls(historical_prices.matrix(tickers)[:, :simulation_length], start_asset)
+
+    @property
+    def infeasible_rate_before(self) -> float:
+        return self.infeasible_before / self.children if self.children else 0.0
+
+    @property
+    def infeasible_rate_after(self) -> float:
+        return self.infeasible_after / self.children if self.children else 0.0
+
+    def infeasible(self, actions: np.ndarray) -> np.ndarray:
+        # to samo kryterium i kolejność sumowania co PopulationEvaluator.simulate
+        num_of_agents, num_of_tickers, num_of_days = actions.shape
+        negative_inventory = (np.cumsum(actions, axis=2, dtype=np.int64) < 0).any(axis=(1, 2))
+        flows = np.empty((num_of_agents, 1 + num_of_days * num_of_tickers), dtype=np.float64)
+        flows[:, 0] = self.start_asset
+        np.negative((actions * self.prices[np.newaxis]).transpose(0, 2, 1).reshape(num_of_agents, -1), out=flows[:, 1:])
+        cash = np.cumsum(flows, axis=1)[:, num_of_tickers::num_of_tickers]
+        return negative_inventory | (cash < 0).any(axis=1)
+
+    def repair(self, actions: np.ndarray) -> np.ndarray:
+        # actions: (agents, tickers, days), naprawiane w miejscu
+        infeasible = np.flatnonzero(self.infeasible(actions))
+        self.children += len(actions)
+        self.infeasible_before += len(infeasible)
+        if len(infeasible) == 0:
+            return actions
+
+        repaired = actions[infeasible].astype(np.int64)
+        inventory = np.zeros(repaired.shape[:2], dtype=np.int64)
+        cash = np.full(len(repaired), self.start_asset, dtype=np.float64)
+        for day in range(repaired.shape[2]):
+            prices = self.prices[:, day]
+            day_actions = np.maximum(repaired[:, :, day], -inventory)
+            available = cash - np.minimum(day_actions, 0) @ prices
+            buys = np.maximum(day_actions, 0)
+            cost = buys @ prices
+            # margines, żeby zaokrąglenia przy sumowaniu w ewaluatorze nie dały ujemnej gotówki
+            budget = available * (1 - self.CASH_MARGIN)
+            over = cost > budget
+            if over.any():
+                scale = budget[over] / cost[over]
+                buys[over] = np.floor(buys[over] * scale[:, np.newaxis]).astype(np.int64)
+                day_actions = np.where(day_actions > 0, buys, day_actions)
+                cost = buys @ prices
+            cash = available - cost
+            inventory += day_actions
+            repaired[:, :, day] = day_actions
+
+        actions[infeasible] = repaired
+        self.infeasible_after += int(np.count_nonzero(self.infeasible(actions[infeasible])))
+        return actions
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+import numpy as np
+from typing import Self
+
+@dataclass(slots=True)
+class GeneBatch:
+    # Operatory genetyczne dla wielu genów naraz: content ma kształt (geny, dni),
+    # każdy wiersz jest modyfikowany niezależnie
+    content: np.ndarray
+
+    def mutate_change(self, settings, rng: np.random.Generator, mask: np.ndarray):
+        rows = np.flatnonzero(mask)
+        days = rng.integers(0, self.content.shape[1], len(rows))
+        self.content[rows, days] += rng.normal(0, settings.float_mutation_variance, len(rows))
+
+    def mutate_rotate(self, settings, rng: np.random.Generator, mask: np.ndarray):
+        length = self.content.shape[1]
+        rows = np.flatnonzero(mask)
+        start = rng.integers(0, length, len(rows))
+        size = rng.lognormal(0, settings.rotation_size_variance, len(rows)).astype(np.int64)
+        shift = rng.lognormal(0, settings.rotation_shift_variance, len(rows)).astype(np.int64)
+
+        keep = size != 1
+        rows, start, size, shift = rows[keep], start[keep], size[keep], shift[keep]
+        if len(rows) == 0:
+            return
+
+        # gdy size > długości genu, pozycje się powtarzają i wygrywa ostatni zapis,
+        # więc wystarczy ostatnie `length` kroków pętli obrotu po kolejnych pozycjach
+        i = np.maximum(size - length, 0)[:, np.newaxis] + np.arange(length)
+        valid = i < size[:, np.newaxis]
+        offset = np.where(i < (size - shift)[:, np.newaxis], i + shift[:, np.newaxis], i + (shift - size)[:, np.newaxis])
+        cur_pos = (start[:, np.newaxis] + i) % length
+        target_pos = (start[:, np.newaxis] + offset) % length
+
+        old_content = self.content[rows]
+        new_content = old_content.copy()
+        row_idx = np.broadcast_to(np.arange(len(rows))[:, np.newaxis], i.shape)
+        new_content[row_idx[valid], cur_pos[valid]] = old_content[row_idx[valid], target_pos[valid]]
+        self.content[rows] = new_content
+
+    def mutate(self, settings, rng: np.random.Generator):
+        genes = len(self.content)
+        self.mutate_change(settings, rng, rng.random(genes) < settings.mutate_change_chance)
+        self.mutate_rotate(settings, rng, rng.random(genes) < settings.mutate_rotate_chance)
+
+    def crossover_point(self, other: Self, settings, rng: np.random.Generator) -> Self:
+        genes, length = self.content.shape
+        # po wymianie ogonów w punktach p_1..p_k pozycja j pochodzi od drugiego rodzica,
+        # jeśli liczba punktów <= j jest nieparzysta; na koniec losowane jest jedno z dwojga dzieci
+        points = rng.integers(0, length, (genes, settings.crossover_point_amount))
+        swapped = (points[:, :, np.newaxis] <= np.arange(length)).sum(axis=1) % 2 == 1
+        first_child = rng.random(genes) < 0.5
+        from_self = swapped != first_child[:, np.newaxis]
+        return GeneBatch(np.where(from_self, self.content, other.content))
+
+    def crossover_uniform(self, other: Self, settings, rng: np.random.Generator) -> Self:
+        beta = rng.uniform(-settings.crossover_imbalance, 1+settings.crossover_imbalance, self.content.shape)
+        return GeneBatch((self.content*beta + other.content*(1-beta)).astype(self.content.dtype))
+
+    def crossover(self, other: Self, settings, rng: np.random.Generator) -> Self:
+        point = rng.random(len(self.content)) < settings.crossover_point_chance
+        new_content = np.empty_like(self.content)
+        new_content[point] = GeneBatch(self.content[point]).crossover_point(
+            GeneBatch(other.content[point]), settings, rng).content
+        new_content[~point] = GeneBatch(self.content[~point]).crossover_uniform(
+            GeneBatch(other.content[~point]), settings, rng).content
+        return GeneBatch(new_content)
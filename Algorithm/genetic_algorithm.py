@@ -1,11 +1,12 @@
-import random
-from Agent import Agent
+from Agent import Population, ACTION_DTYPE, GENOME_DTYPE, round_actions
 import numpy as np
 from .algorithm_settings import GASettings
-from .genome import Genome
+from .gene_batch import GeneBatch
+from .age_statistics import AgeStatistics
+from .feasibility_repair import FeasibilityRepair
 
 class GeneticAlgorithm:
-    def __init__(self, ga_config=None):
+    def __init__(self, ga_config=None, seed=None):
         self.settings = GASettings()
         if ga_config:
             self.settings.children_ratio = ga_config["children_ratio"]
@@ -17,42 +18,66 @@ class GeneticAlgorithm:
             self.settings.mutate_rotate_chance = ga_config["mutate_rotate_chance"]
             self.settings.crossover_point_amount = ga_config["crossover_point_amount"]
             self.settings.crossover_point_chance = ga_config["crossover_point_chance"]
+            self.settings.repair = ga_config.get("repair", False)
 
-        self.agent_life_lengths = []
+        self.agent_life_lengths = AgeStatistics()
+        # (agenci, 2): indeksy rodziców każdego agenta z ostatniego evolve w poprzedniej populacji
+        self.parents = None
+        self.rng = np.random.default_rng(seed)
+        self.repair: FeasibilityRepair | None = None
 
-    def evolve(self, agents: list[Agent]) -> list[Agent]:
-        fitness = [agent.profit for agent in agents]
-        sum_fitness = sum(fitness)
+    def use_repair(self, repair: FeasibilityRepair | None):
+        self.repair = repair
+
+    def reseed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def evolve(self, population: Population, fitness: np.ndarray | None = None) -> Population:
+        # fitness: nieujemne przystosowanie agentów, domyślnie ich zysk
+        num_of_days = population.num_of_days
+        fitness = population.profits if fitness is None else fitness
+        sum_fitness = fitness.sum()
         if sum_fitness == 0:
-            agents_next = []
-            for agent in agents:
-                child = Genome.from_agent(agent)
-                child.mutate(self.settings)
-                agents_next.append(child.to_agent())
-            return agents_next
-
-        fitness = [f / sum_fitness for f in fitness]
-
-        children = []
-        children_size = int(len(agents) * self.settings.children_ratio)
-        while len(children) < children_size:
-            parent1 = Genome.from_agent(np.random.choice(agents, p=fitness))
-            parent2 = Genome.from_agent(np.random.choice(agents, p=fitness))
-            child = parent1.crossover(parent2, self.settings)
-            child.mutate(self.settings)
-            child_agent = child.to_agent()
-            child_agent.age = 0
-            children.append(child_agent)
-
-        alive_size = len(agents) - len(children)
-        alive_indices = np.random.choice(range(len(agents)), size=alive_size, p=fitness).tolist()
-        
-        alive = np.array(agents)[alive_indices]
-        for agent in alive:
-            agent.age += 1
-
-        dead = np.delete(agents, alive_indices)
-        for agent in dead:
-            self.agent_life_lengths.append(agent.age)
-
-        return alive.tolist() + children
+            children = GeneBatch(population.actions.astype(GENOME_DTYPE).reshape(-1, num_of_days))
+            children.mutate(self.settings, self.rng)
+            self.parents = np.repeat(np.arange(len(population))[:, np.newaxis], 2, axis=1)
+            children = Population(population.tickers, round_actions(children.content).reshape(population.actions.shape), ACTION_DTYPE)
+            if self.repair is not None:
+                self.repair.repair(children.actions)
+            return children
+
+        fitness = fitness / sum_fitness
+
+        # rodzice wszystkich dzieci i ocalali losowani jednym wywołaniem
+        children_size = int(len(population) * self.settings.children_ratio)
+        alive_size = len(population) - children_size
+        drawn = self.rng.choice(len(population), size=2*children_size + alive_size, p=fitness)
+        parents1, parents2, alive_indices = np.split(drawn, [children_size, 2*children_size])
+
+        # każdy ticker dziecka to osobny gen, więc operatory działają na macierzy (dzieci*tickery, dni)
+        genes1 = GeneBatch(population.actions[parents1].astype(GENOME_DTYPE).reshape(-1, num_of_days))
+        genes2 = GeneBatch(population.actions[parents2].astype(GENOME_DTYPE).reshape(-1, num_of_days))
+        children = genes1.crossover(genes2, self.settings, self.rng)
+        children.mutate(self.settings, self.rng)
+        children = Population(
+            population.tickers,
+            round_actions(children.content).reshape(children_size, len(population.tickers), num_of_days),
+            ACTION_DTYPE
+        )
+        if self.repair is not None:
+            self.repair.repair(children.actions)
+
+        # agent wylosowany k razy starzeje się o k, jak wspólny obiekt Agent przed przejściem na tablice
+        alive = population.take(alive_indices)
+        alive.ages += np.bincount(alive_indices, minlength=len(population))[alive_indices]
+
+        dead = np.ones(len(population), dtype=bool)
+        dead[alive_indices] = False
+        self.agent_life_lengths.add(population.ages[dead])
+
+        self.parents = np.concatenate([
+            np.stack([alive_indices, alive_indices], axis=1),
+            np.stack([parents1, parents2], axis=1)
+        ])
+
+        return Population.concatenate([alive, children])
@@ -1,87 +1,79 @@
-from .gene import Gene
 from typing import Self
-from dataclasses import dataclass
-from Agent import Agent
+from Agent import Agent, Population, ACTION_DTYPE, GENOME_DTYPE, round_actions
 import numpy as np
-from Stocks import StockUtility
-import random
+from Stocks import StockUtility, PricePanel
 
-@dataclass
 class Genome:
-    sale_history: dict[str, Gene]
+    # Widok na jeden wiersz populacji zmiennoprzecinkowej (GENOME_DTYPE)
+    __slots__ = ('population', 'index')
 
-    def mutate(self, settings):
-        [gene.mutate(settings) for gene in self.sale_history.values()]
-
-    def crossover(self, other: Self, settings) -> Self:
-        new_genome = Genome({})
-
-        for ticker in self.sale_history.keys():
-            new_genome.sale_history[ticker] = self.sale_history[ticker].crossover(
-                other.sale_history[ticker],
-                settings
-            )
-
-        return new_genome
+    def __init__(self, population: Population, index: int = 0):
+        self.population = population
+        self.index = index
 
     @classmethod
     def from_agent(cls, agent: Agent) -> Self:
-        return cls(
-            sale_history={
-                ticker: Gene(content=history if isinstance(history, list) else history.content)
-                for ticker, history in agent.sale_history.items()
-            }
-        )
+        return cls(Population(agent.tickers, agent.actions[np.newaxis], GENOME_DTYPE))
 
     def to_agent(self) -> Agent:
-        return Agent(
-            sale_history={
-                ticker: [int(round(value)) for value in gene.content]
-                for ticker, gene in self.sale_history.items()
-            }
-        )
+        return Agent(population=self.population.take([self.index]).astype(ACTION_DTYPE))
 
     @classmethod
-    def warm_start(cls, *, stocks: list[tuple[str, StockUtility]], historical_prices: dict[str, list[float]],
+    def warm_start(cls, *, stocks: list[tuple[str, StockUtility]], historical_prices: PricePanel,
                    start_asset: float, max_actions_per_day_bought: int, max_actions_per_day_sold: int,
                    simulation_length: int) -> Self:
-        sale_history = {ticker: [] for ticker, _ in stocks}
-        curr_asset = start_asset
-        inventory = {ticker: 0 for ticker, _ in stocks}
+        population = cls.warm_start_population(
+            stocks=stocks, historical_prices=historical_prices, start_asset=start_asset,
+            max_actions_per_day_bought=max_actions_per_day_bought, max_actions_per_day_sold=max_actions_per_day_sold,
+            simulation_length=simulation_length, size=1
+        )
+        return cls(population.astype(GENOME_DTYPE))
+
+    @staticmethod
+    def warm_start_population(*, stocks: list[tuple[str, StockUtility]], historical_prices: PricePanel,
+                              start_asset: float, max_actions_per_day_bought: int, max_actions_per_day_sold: int,
+                              simulation_length: int, size: int, rng: np.random.Generator | None = None) -> Population:
+        rng = np.random.default_rng() if rng is None else rng
+        tickers = [ticker for ticker, _ in stocks]
+        prices = historical_prices.matrix(tickers)[:, :simulation_length]
+        prev_prices = np.concatenate((prices[:, :1], prices[:, :-1]), axis=1)
+
+        # Macierz predykcji liczona raz na ticker: dzień d korzysta z okna kończącego się na sesji d-1
+        dates = historical_prices.dates[:simulation_length]
+        future_prices = np.empty_like(prices)
+        for i, (_, stock_utility) in enumerate(stocks):
+            next_day_predictions = stock_utility.get_estimation_matrix().estimated_prices[:, 0]
+            future_prices[i] = next_day_predictions[stock_utility.estimation_windows(dates)]
+
+        price_change_ratio = (future_prices - prev_prices) / prev_prices
+        buy_signal = price_change_ratio > 0.001
+        sell_signal = price_change_ratio < -0.0001
+
+        # Wszyscy kandydaci generowani naraz; budżet i stan portfela liczone po cenie
+        # wykonania z danego dnia, więc żaden kandydat nie łamie ograniczeń
+        actions = np.zeros((size, len(tickers), simulation_length), dtype=np.int64)
+        curr_asset = np.full(size, start_asset, dtype=np.float64)
+        inventory = np.zeros((size, len(tickers)), dtype=np.int64)
+        agents = np.arange(size)
 
         for day in range(simulation_length):
-            predictions = {
-                ticker: next(stock_utility.get_estimations()).estimated_prices
-                for ticker, stock_utility in stocks
-            }
-
-            tickers_shuffled = stocks[:]
-            random.shuffle(tickers_shuffled)
-
-            for ticker, _ in tickers_shuffled:
-                if day == 0:
-                    prev_price = historical_prices[ticker][0]
-                else:
-                    prev_price = historical_prices[ticker][day - 1]
-
-                future_price = predictions[ticker][0]
-
-                price_change_ratio = (future_price - prev_price) / prev_price
-                action = 0
-
-                if price_change_ratio > 0.001:
-                    max_affordable = int(curr_asset / prev_price)
-                    if max_affordable > 0:
-                        action = random.randint(1, min(max_affordable, max_actions_per_day_bought))
-                        curr_asset -= action * prev_price
-                        inventory[ticker] += action
-
-                elif price_change_ratio < -0.0001 and inventory[ticker] > 0:
-                    action = -random.randint(1, min(inventory[ticker], max_actions_per_day_sold))
-                    curr_asset -= action * prev_price
-                    inventory[ticker] += action
-
-                sale_history[ticker].append(action)
-
-        sale_history = {ticker: Gene(actions) for ticker, actions in sale_history.items()}
-        return cls(sale_history=sale_history)
\ No newline at end of file
+            tickers_shuffled = np.argsort(rng.random((size, len(tickers))), axis=1)
+            draws = rng.random((len(tickers), size))
+            for ticker, draw in zip(tickers_shuffled.T, draws):
+                price = prices[ticker, day]
+                held = inventory[agents, ticker]
+
+                # losowanie liczby całkowitej z [1, max] jak random.randint(1, max)
+                max_bought = np.minimum(curr_asset // price, max_actions_per_day_bought)
+                bought = 1 + np.floor(draw * max_bought)
+                sold = 1 + np.floor(draw * np.minimum(held, max_actions_per_day_sold))
+
+                buy = buy_signal[ticker, day] & (max_bought >= 1)
+                sell = sell_signal[ticker, day] & (held > 0)
+                action = np.where(buy, bought, np.where(sell, -sold, 0)).astype(np.int64)
+
+                curr_asset -= action * price
+                inventory[agents, ticker] += action
+                actions[agents, ticker, day] = action
+
+        return Population(tickers, round_actions(actions), ACTION_DTYPE)
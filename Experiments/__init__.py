@@ -0,0 +1,5 @@
+from .experiment_runner import ExperimentRunner, ExperimentJob, ExperimentResult
+from .hyperparameter_search import HyperparameterSearch, Trial, SEARCH_SPACE
+from .walk_forward import WalkForward, WalkForwardSettings, WalkForwardWindow, WindowResult
+
+__all__ = ['ExperimentRunner', 'ExperimentJob', 'ExperimentResult', 'HyperparameterSearch', 'Trial', 'SEARCH_SPACE', 'WalkForward', 'WalkForwardSettings', 'WalkForwardWindow', 'WindowResult']
\ No newline at end of file
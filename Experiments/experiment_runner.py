@@ -0,0 +1,111 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+import json
+import os
+import time
+import pandas as pd
+
+from Stocks import Period, PriceStore, SharedPriceData, EstimationCache, EstimationConfig
+
+_SHARED_PRICES: SharedPriceData | None = None
+
+
+@dataclass
+class ExperimentJob:
+    config_path: str
+    it: int
+
+
+@dataclass
+class ExperimentResult:
+    config_path: str
+    it: int
+    best_agent: dict
+    metrics_path: Path
+    wall_time: float
+    cpu_time: float
+    worker: int
+
+
+def _init_worker(shared_prices: SharedPriceData) -> None:
+    global _SHARED_PRICES
+    _SHARED_PRICES = shared_prices
+
+
+def _run_job(job: ExperimentJob) -> ExperimentResult:
+    from main import main
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    best_agent, metrics_path = main(job.config_path, job.it, price_store=_SHARED_PRICES)
+    return ExperimentResult(
+        config_path=job.config_path,
+        it=job.it,
+        best_agent=best_agent,
+        metrics_path=metrics_path,
+        wall_time=time.perf_counter() - wall_start,
+        cpu_time=time.process_time() - cpu_start,
+        worker=os.getpid()
+    )
+
+
+class ExperimentRunner:
+    def __init__(self, config_paths: list[str], repetitions: int = 10, workers: int | None = None,
+                 offline: bool = False) -> None:
+        self.config_paths = [str(path) for path in config_paths]
+        self.repetitions = repetitions
+        self.workers = workers or os.cpu_count()
+        self.price_store = PriceStore(Path(__file__).parent.parent / "data" / "prices", offline=offline)
+        # procesy robocze zapisują estymacje w data/estimations, nowe ceny unieważniają je tutaj
+        self.price_store.refresh_listeners.append(EstimationCache(Path(__file__).parent.parent / "data" / "estimations").invalidate)
+
+    def jobs(self) -> list[ExperimentJob]:
+        return [ExperimentJob(path, it) for path in self.config_paths for it in range(self.repetitions)]
+
+    def price_periods(self) -> dict[str, Period]:
+        # Jeden zakres dat na ticker, obejmujący dane do estymacji (lookback_days sesji przed startem) we wszystkich konfiguracjach
+        periods = {}
+        for path in self.config_paths:
+            with open(path, encoding='utf-8-sig') as f:
+                cfg = json.load(f)
+            start = EstimationConfig.history_start(date.fromisoformat(cfg['start_date']), cfg['lookback_days'])
+            end = date.fromisoformat(cfg['end_date'])
+            for ticker in cfg['stocks']:
+                period = periods.get(ticker, Period(start, end))
+                periods[ticker] = Period(min(period.start, start), max(period.end, end))
+        return periods
+
+    def run(self) -> Iterator[ExperimentResult]:
+        shared_prices = SharedPriceData.from_source(self.price_store, self.price_periods())
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(shared_prices,)) as executor:
+                futures = [executor.submit(_run_job, job) for job in self.jobs()]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            shared_prices.close()
+
+    @staticmethod
+    def summary(results: list[ExperimentResult]) -> pd.DataFrame:
+        rows = [
+            {
+                'config': Path(result.config_path).name,
+                'it': result.it,
+                'profit': result.best_agent['profit'],
+                'wall_time': result.wall_time,
+                'cpu_time': result.cpu_time,
+                'worker': result.worker
+            }
+            for result in results
+        ]
+        return pd.DataFrame(rows).sort_values(['config', 'it'], ignore_index=True)
+
+    @staticmethod
+    def write_summary(results: list[ExperimentResult], filename: str = "experiments_summary.csv") -> Path:
+        results_path = Path(__file__).parent.parent / "csv_results"
+        results_path.mkdir(parents=True, exist_ok=True)
+        ExperimentRunner.summary(results).to_csv(results_path / filename)
+        return results_path / filename
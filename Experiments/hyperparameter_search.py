@@ -0,0 +1,154 @@
+from dataclasses import dataclass, asdict, fields, replace
+from pathlib import Path
+import json
+import math
+import tempfile
+import numpy as np
+import pandas as pd
+
+from Algorithm import GASettings
+from .experiment_runner import ExperimentRunner
+
+# zakres losowania każdego parametru: (min, max, rozkład)
+SEARCH_SPACE = {
+    'children_ratio': (0.1, 0.6, 'uniform'),
+    'crossover_imbalance': (0.0, 0.5, 'uniform'),
+    'float_mutation_variance': (0.01, 1.0, 'log'),
+    'rotation_size_variance': (0.1, 3.0, 'log'),
+    'rotation_shift_variance': (0.1, 3.0, 'log'),
+    'mutate_change_chance': (0.0, 1.0, 'uniform'),
+    'mutate_rotate_chance': (0.0, 1.0, 'uniform'),
+    'crossover_point_amount': (1, 5, 'int'),
+    'crossover_point_chance': (0.0, 1.0, 'uniform')
+}
+
+
+@dataclass
+class Trial:
+    candidate: int
+    rung: int
+    iterations: int
+    score: float
+    settings: GASettings
+
+
+def sample_settings(rng: np.random.Generator, space: dict = SEARCH_SPACE, base: GASettings | None = None) -> GASettings:
+    # parametry spoza space (np. repair) zostają takie jak w base
+    settings = GASettings() if base is None else replace(base)
+    for field in fields(GASettings):
+        if field.name not in space:
+            continue
+        low, high, kind = space[field.name]
+        if kind == 'int':
+            value = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            value = float(rng.uniform(low, high))
+        setattr(settings, field.name, value)
+    return settings
+
+
+class HyperparameterSearch:
+    # Successive halving po GASettings: wszyscy kandydaci dostają min_iterations iteracji,
+    # po każdym szczeblu zostaje najlepsza 1/eta z nich, a budżet rośnie eta razy aż do max_iterations.
+    # Kandydaci jednego szczebla są uruchamiani równolegle przez ExperimentRunner.
+    def __init__(self, base_config: str, min_iterations: int = 100, max_iterations: int = 2700, eta: int = 3,
+                 candidates: int | None = None, repetitions: int = 1, workers: int | None = None, seed: int = 0,
+                 offline: bool = False) -> None:
+        if eta < 2:
+            raise ValueError('eta must be at least 2')
+        if min_iterations < 1 or max_iterations < min_iterations:
+            raise ValueError('expected 1 <= min_iterations <= max_iterations')
+        self.base_config = Path(base_config)
+        with open(self.base_config, encoding='utf-8-sig') as f:
+            self.config = json.load(f)
+        self.eta = eta
+        self.budgets = self.schedule(min_iterations, max_iterations, eta)
+        # domyślnie tylu kandydatów, żeby na ostatnim szczeblu został jeden
+        self.candidates = candidates or eta ** (len(self.budgets) - 1)
+        self.repetitions = repetitions
+        self.workers = workers
+        self.offline = offline
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.trials: list[Trial] = []
+
+    @staticmethod
+    def schedule(min_iterations: int, max_iterations: int, eta: int) -> list[int]:
+        rungs = int(math.floor(math.log(max_iterations / min_iterations, eta) + 1e-9)) + 1
+        return [min_iterations * eta ** rung for rung in range(rungs)]
+
+    @property
+    def results_dir(self) -> Path:
+        # pliki z przebiegów kandydatów, osobno od wyników zwykłych uruchomień
+        return Path(__file__).parent.parent / "csv_results" / f"search_{self.base_config.stem}"
+
+    def trial_config(self, candidate: int, settings: GASettings, iterations: int) -> dict:
+        cfg = dict(self.config)
+        cfg['ga'] = asdict(settings)
+        cfg['num_of_iterations'] = iterations
+        # każdy kandydat ma własne ziarno (main dokłada do niego numer powtórzenia), to samo na każdym szczeblu;
+        # bez punktów kontrolnych i wypisywania postępu
+        cfg['seed'] = [self.seed, candidate]
+        cfg['checkpoint_interval'] = 0
+        cfg['report_interval'] = 0
+        cfg['results_dir'] = str(self.results_dir)
+        return cfg
+
+    def run_rung(self, rung: int, survivors: dict[int, GASettings], directory: Path) -> list[Trial]:
+        iterations = self.budgets[rung]
+        paths = {}
+        for candidate, settings in survivors.items():
+            path = directory / f"search_{self.base_config.stem}_c{candidate}_r{rung}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.trial_config(candidate, settings, iterations), f, indent=4)
+            paths[str(path)] = candidate
+
+        runner = ExperimentRunner(list(paths), repetitions=self.repetitions, workers=self.workers, offline=self.offline)
+        profits = {candidate: [] for candidate in survivors}
+        for result in runner.run():
+            profits[paths[result.config_path]].append(result.best_agent['profit'])
+
+        trials = [Trial(candidate, rung, iterations, float(np.mean(profits[candidate])), settings)
+                  for candidate, settings in survivors.items()]
+        for trial in sorted(trials, key=lambda trial: -trial.score):
+            print(f"Rung {rung} ({iterations} iterations): candidate {trial.candidate} profit {round(trial.score, 2)}")
+        return trials
+
+    def run(self) -> Trial:
+        # kandydat 0 to ustawienia z konfiguracji bazowej, jako punkt odniesienia
+        base = GASettings.from_json(self.config.get('ga'))
+        survivors = {candidate: sample_settings(self.rng, base=base) for candidate in range(self.candidates)}
+        survivors[0] = base
+        with tempfile.TemporaryDirectory() as directory:
+            for rung in range(len(self.budgets)):
+                trials = self.run_rung(rung, survivors, Path(directory))
+                self.trials += trials
+                keep = max(1, len(trials) // self.eta)
+                best = sorted(trials, key=lambda trial: -trial.score)[:keep]
+                survivors = {trial.candidate: trial.settings for trial in best}
+        return max(trials, key=lambda trial: trial.score)
+
+    def results(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {'candidate': trial.candidate, 'rung': trial.rung, 'iterations': trial.iterations,
+             'score': trial.score, **asdict(trial.settings)}
+            for trial in self.trials
+        ])
+
+    def write_config(self, best: Trial, path: Path | None = None) -> Path:
+        # gotowa konfiguracja: bazowa z najlepszym blokiem 'ga'
+        path = self.base_config.with_name(f"{self.base_config.stem}_tuned.json") if path is None else Path(path)
+        cfg = dict(self.config)
+        cfg['ga'] = asdict(best.settings)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cfg, f, indent=4)
+        return path
+
+    def write_results(self, filename: str | None = None) -> Path:
+        results_path = Path(__file__).parent.parent / "csv_results"
+        results_path.mkdir(parents=True, exist_ok=True)
+        filename = filename or f"search_{self.base_config.stem}.csv"
+        self.results().to_csv(results_path / filename, index=False)
+        return results_path / filename
@@ -0,0 +1,241 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Self
+import json
+import numpy as np
+import pandas as pd
+
+from Agent import Population
+from Algorithm import GeneticAlgorithm, Genome, FeasibilityRepair
+from Simulation import Simulation, PopulationEvaluator, StoppingSettings, FitnessSettings
+from Stocks import StockUtility, StockUtilityFactory, Period, PricePanel, EstimationConfig
+from Stocks.estimators import EstimatorStrategy
+
+ESTIMATOR_STRATEGIES = {
+    'mom': EstimatorStrategy.METHOD_OF_MOMENTS,
+    'lse': EstimatorStrategy.LEAST_SQUARE_METHOD,
+    'ml': EstimatorStrategy.MAXIMUM_LIKELIHOOD
+}
+
+
+@dataclass
+class WalkForwardSettings:
+    # długości okien w dniach sesyjnych; step_days domyślnie równe test_days (okna testowe się nie nakładają)
+    train_days: int = 250
+    test_days: int = 60
+    step_days: int | None = None
+    # z przenoszeniem okna zależą od poprzednich i są liczone po kolei; równolegle (workers procesów)
+    # liczone są tylko przy carry_over=False
+    carry_over: bool = True
+    # część populacji okna zasiana ocalałymi z poprzedniego (tylko z zyskiem w nowym oknie), reszta z warm startu
+    carry_over_fraction: float = 0.5
+    top_agents: int = 5
+    workers: int | None = None
+
+    @classmethod
+    def from_json(cls, json_content: dict | None) -> Self:
+        settings = cls(**(json_content or {}))
+        if settings.train_days < 2 or settings.test_days < 1:
+            raise ValueError('train_days must be at least 2 and test_days at least 1')
+        if settings.step_days is None:
+            settings.step_days = settings.test_days
+        return settings
+
+
+@dataclass
+class WalkForwardWindow:
+    index: int
+    train: Period
+    test: Period
+    # przesunięcie początku okna treningowego względem poprzedniego okna, w dniach sesyjnych
+    shift: int
+
+
+@dataclass
+class WindowResult:
+    window: int
+    train_start: date
+    train_end: date
+    test_start: date
+    test_end: date
+    train_profit: float
+    # Genom to plan transakcji przypisany do kolejnych dni, więc nie ma strategii, którą dałoby się
+    # uruchomić na nowych datach. replay_* to zysk planów z okna treningowego odtworzonych od pierwszego
+    # dnia okna testowego (ten sam numer dnia sesyjnego, inne daty i ceny): miara tego, jak bardzo wynik
+    # treningowy zależy od dopasowania do konkretnych cen, a nie prognoza zysku strategii.
+    # buy_and_hold_profit to punkt odniesienia na tym samym oknie: gotówka po równo na wszystkie tickery
+    replay_profit: float
+    replay_mean_profit: float
+    replay_repaired_fraction: float
+    buy_and_hold_profit: float
+    carried_over: int
+
+
+def replay(actions: np.ndarray, num_of_days: int) -> np.ndarray:
+    # plan agenta odtwarzany od pierwszego dnia okna według numeru dnia, nie daty:
+    # ucięty albo dopełniony dniami bez transakcji
+    replayed = np.zeros(actions.shape[:2] + (num_of_days,), dtype=actions.dtype)
+    days = min(num_of_days, actions.shape[2])
+    replayed[:, :, :days] = actions[:, :, :days]
+    return replayed
+
+
+def buy_and_hold(prices: np.ndarray, start_asset: float) -> np.ndarray:
+    # (1, tickers, days): całe akcje za równą część gotówki pierwszego dnia, bez dalszych transakcji
+    actions = np.zeros((1,) + prices.shape, dtype=np.int64)
+    actions[0, :, 0] = np.floor(start_asset / len(prices) / prices[:, 0] * (1 - FeasibilityRepair.CASH_MARGIN))
+    return actions
+
+
+def _run_window(cfg: dict, name: str, panel: PricePanel, settings: WalkForwardSettings, window: WalkForwardWindow,
+                survivors: Population | None) -> tuple[WindowResult, Population]:
+    start_asset = cfg['start_asset']
+    tickers = cfg['stocks']
+    # estymatory liczą okna od początku okna treningowego, dane wcześniejsze są w panelu
+    StockUtility.use_price_store(panel)
+    factory = StockUtilityFactory(ESTIMATOR_STRATEGIES[cfg['estimator_strategy']],
+                                  {**cfg, 'start_date': str(window.train.start), 'end_date': str(window.train.end)})
+    stocks = [(t, factory.create_stock_utilty(t)) for t in tickers]
+
+    train_prices = panel.between(window.train)
+    simulation_length = len(train_prices)
+    evaluator = PopulationEvaluator.from_historical_prices(train_prices, tickers, simulation_length, start_asset)
+    repair = FeasibilityRepair.from_historical_prices(train_prices, tickers, simulation_length, start_asset)
+
+    agents = []
+    carried_over = 0
+    if survivors is not None:
+        # ocalali z poprzedniego okna: plan przesunięty o window.shift dni, żeby transakcje wypadały
+        # w te same daty; usunięcie początku planu psuje portfel, więc plan jest naprawiany.
+        # Przechodzą tylko agenci z zyskiem w nowym oknie (naprawa potrafi wyzerować cały plan),
+        # najlepsi, najwyżej carry_over_fraction populacji
+        actions = np.zeros((len(survivors), len(tickers), simulation_length), dtype=survivors.dtype)
+        overlap = min(simulation_length, max(survivors.num_of_days - window.shift, 0))
+        actions[:, :, :overlap] = survivors.actions[:, :, window.shift:window.shift + overlap]
+        seeded = Population(tickers, repair.repair(actions))
+        evaluator.evaluate_population(seeded)
+        profitable = np.flatnonzero(seeded.profits > start_asset)
+        best = profitable[np.argsort(seeded.profits[profitable])[::-1]]
+        seeded = seeded.take(best[:int(cfg['size'] * settings.carry_over_fraction)])
+        agents.append(seeded)
+        carried_over = len(seeded)
+
+    warm_started = carried_over
+    while warm_started < cfg['size']:
+        population = Genome.warm_start_population(stocks=stocks, historical_prices=train_prices, start_asset=start_asset,
+                                                  max_actions_per_day_bought=cfg['max_actions_per_day']['buy'],
+                                                  max_actions_per_day_sold=cfg['max_actions_per_day']['sell'],
+                                                  simulation_length=simulation_length, size=cfg['size'] - warm_started)
+        evaluator.evaluate_population(population)
+        population = population.take(np.flatnonzero(population.profits > 0))
+        agents.append(population)
+        warm_started += len(population)
+        if len(agents) >= 100:
+            raise Exception("Warm start failed, change configuration")
+
+    GA = GeneticAlgorithm(cfg['ga'], seed=cfg.get('seed'))
+    if GA.settings.repair:
+        GA.use_repair(repair)
+    simulation = Simulation(Population.concatenate(agents), stocks, start_asset, cfg['num_of_iterations'], GA,
+                            train_prices, window.index, report_interval=cfg.get('report_interval', 0),
+                            stopping=StoppingSettings.from_json(cfg.get('stopping')),
+                            fitness_function=FitnessSettings.from_json(cfg.get('fitness')).create())
+    best_agent, _ = simulation.run_simulation(f"{Path(name).stem}_walk_forward.json")
+
+    # odtworzenie na oknie testowym (patrz WindowResult): najlepszy agent i najlepsi z końcowej populacji;
+    # przy innych cenach plan może łamać ograniczenia, więc jest wykonywany z przycięciem sprzedaży i zakupów
+    test_prices = panel.between(window.test)
+    test_evaluator = PopulationEvaluator.from_historical_prices(test_prices, tickers, len(test_prices), start_asset)
+    test_repair = FeasibilityRepair.from_historical_prices(test_prices, tickers, len(test_prices), start_asset)
+    top = np.concatenate([best_agent.actions[np.newaxis], simulation.best_agents(settings.top_agents).actions])
+    replay_profits = test_evaluator.evaluate(test_repair.repair(replay(top, len(test_prices))))
+    buy_and_hold_profit = test_evaluator.evaluate(buy_and_hold(test_evaluator.prices, start_asset))[0]
+
+    result = WindowResult(
+        window=window.index,
+        train_start=window.train.start,
+        train_end=window.train.end,
+        test_start=window.test.start,
+        test_end=window.test.end,
+        train_profit=best_agent.profit - start_asset,
+        replay_profit=float(replay_profits[0]) - start_asset,
+        replay_mean_profit=float(replay_profits.mean()) - start_asset,
+        replay_repaired_fraction=test_repair.infeasible_rate_before,
+        buy_and_hold_profit=float(buy_and_hold_profit) - start_asset,
+        carried_over=carried_over
+    )
+    return result, simulation.population
+
+
+class WalkForward:
+    # Kolejne okna trening/test na zakresie start_date-end_date konfiguracji. Z przenoszeniem populacji
+    # (domyślnie) okna liczone są po kolei, bez niego są niezależne i liczone równolegle.
+    # Wynik testowy to odtworzenie planów z treningu, nie zysk strategii poza próbą (patrz WindowResult).
+    def __init__(self, config_path: str, price_store, settings: WalkForwardSettings | None = None) -> None:
+        self.config_path = config_path
+        with open(config_path, encoding='utf-8-sig') as f:
+            self.cfg = json.load(f)
+        self.settings = settings or WalkForwardSettings.from_json(self.cfg.get('walk_forward'))
+        start_date = date.fromisoformat(self.cfg['start_date'])
+        self.end_date = date.fromisoformat(self.cfg['end_date'])
+        self.panel = PricePanel.load(self.cfg['stocks'],
+                                     Period(EstimationConfig.history_start(start_date, self.cfg['lookback_days']), self.end_date),
+                                     price_store, fill=self.cfg.get('fill_policy', PricePanel.DEFAULT_FILL))
+        self.dates = self.panel.between(Period(start_date, self.end_date)).dates
+
+    def windows(self) -> list[WalkForwardWindow]:
+        settings = self.settings
+        period = lambda lo, hi: Period(self.dates[lo].item(), self.dates[hi].item() if hi < len(self.dates) else self.end_date)
+        windows = []
+        start = 0
+        while start + settings.train_days + settings.test_days <= len(self.dates):
+            test_start = start + settings.train_days
+            windows.append(WalkForwardWindow(len(windows), period(start, test_start),
+                                             period(test_start, test_start + settings.test_days),
+                                             settings.step_days if windows else 0))
+            start += settings.step_days
+        if not windows:
+            raise ValueError(f'{len(self.dates)} trading days are not enough for one train and test window')
+        return windows
+
+    def run(self) -> pd.DataFrame:
+        windows = self.windows()
+        if self.settings.carry_over:
+            results, survivors = [], None
+            for window in windows:
+                print(f"Walk-forward window {window.index}: train {window.train.start} - {window.train.end}, "
+                      f"test {window.test.start} - {window.test.end}")
+                result, survivors = _run_window(self.cfg, self.config_path, self.panel, self.settings, window, survivors)
+                results.append(result)
+        else:
+            with ProcessPoolExecutor(max_workers=self.settings.workers) as executor:
+                futures = [executor.submit(_run_window, self.cfg, self.config_path, self.panel, self.settings, window, None)
+                           for window in windows]
+                results = [future.result()[0] for future in futures]
+        return pd.DataFrame([result.__dict__ for result in results])
+
+    def summary(self, results: pd.DataFrame) -> dict:
+        start_asset = self.cfg['start_asset']
+        return {
+            'windows': len(results),
+            'mean_train_profit': float(results['train_profit'].mean()),
+            'mean_replay_profit': float(results['replay_profit'].mean()),
+            'median_replay_profit': float(results['replay_profit'].median()),
+            'positive_replay_windows': float((results['replay_profit'] > 0).mean()),
+            'replay_beats_buy_and_hold': float((results['replay_profit'] > results['buy_and_hold_profit']).mean()),
+            # zwrot przy reinwestowaniu kapitału w kolejnych oknach testowych
+            'compounded_replay_return': float(np.prod(1 + results['replay_profit'] / start_asset) - 1),
+            'compounded_buy_and_hold_return': float(np.prod(1 + results['buy_and_hold_profit'] / start_asset) - 1)
+        }
+
+    def write(self, results: pd.DataFrame) -> Path:
+        # wyniki okien w CSV, podsumowanie poza próbą obok w JSON
+        results_path = Path(__file__).parent.parent / "csv_results"
+        results_path.mkdir(parents=True, exist_ok=True)
+        path = results_path / f"walk_forward_{Path(self.config_path).stem}.csv"
+        results.to_csv(path, index=False)
+        with open(path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.summary(results), f, indent=2)
+        return path
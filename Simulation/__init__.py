@@ -1,3 +1,11 @@
 from .simulation import Simulation
+from .population_evaluator import PopulationEvaluator, PopulationState, EvaluationCheckpoints
+from .fitness_cache import FitnessCache
+from .checkpoint import SimulationCheckpoint, CheckpointWriter
+from .metrics import MetricsSink, METRICS_DTYPE
+from .island_model import IslandModel, IslandSettings
+from .early_stopping import StoppingSettings, EarlyStopping
+from .fitness import FitnessFunction, FitnessSettings, FinalValueFitness, RiskAdjustedFitness, \
+    DrawdownPenalizedFitness, TurnoverPenalizedFitness
 
-__all__ = ['Simulation']
\ No newline at end of file
+__all__ = ['Simulation', 'PopulationEvaluator', 'PopulationState', 'EvaluationCheckpoints', 'FitnessCache', 'SimulationCheckpoint', 'CheckpointWriter', 'MetricsSink', 'METRICS_DTYPE', 'IslandModel', 'IslandSettings', 'StoppingSettings', 'EarlyStopping', 'FitnessFunction', 'FitnessSettings', 'FinalValueFitness', 'RiskAdjustedFitness', 'DrawdownPenalizedFitness', 'TurnoverPenalizedFitness']
@@ -0,0 +1,198 @@
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Thread
+from typing import Self
+import copy
+import json
+import os
+import random
+import numpy as np
+
+from Agent import Agent, Population
+from Algorithm import AgeStatistics
+from .population_evaluator import EvaluationCheckpoints
+
+
+@dataclass
+class SimulationCheckpoint:
+    # Wszystko co potrzebne, żeby kontynuować Simulation.run_simulation tak, jakby nie było przerwy
+    iteration: int
+    population: Population
+    best_agent: Population
+    best_profit: float
+    best_profit_idx: int
+    # budżety max_seconds i max_evaluations obejmują też czas i ewaluacje sprzed wznowienia
+    elapsed: float
+    evaluations: int
+    stopping_history: list[tuple[int, float]]
+    # zawartość FitnessCache ewaluatora i funkcji przystosowania oraz punkty kontrolne ostatniej
+    # generacji; bez nich po wznowieniu te same genomy byłyby symulowane ponownie
+    fitness_cache: tuple[np.ndarray, np.ndarray, np.ndarray] | None
+    fitness_function_cache: tuple[np.ndarray, np.ndarray, np.ndarray]
+    evaluation_checkpoints: EvaluationCheckpoints | None
+    fitness: np.ndarray | None
+    metrics_offset: int | None
+    agent_life_lengths: AgeStatistics
+    parents: np.ndarray | None
+    python_random_state: tuple
+    numpy_random_state: tuple
+    ga_random_state: dict
+
+    @classmethod
+    def capture(cls, simulation) -> Self:
+        # kopie tablic, bo zapis odbywa się w osobnym wątku, a symulacja idzie dalej;
+        # metryki są zrzucane na dysk, żeby zapamiętana pozycja w pliku była kompletna
+        if simulation.metrics is not None:
+            simulation.metrics.flush()
+        return cls(
+            iteration=simulation.iteration,
+            population=simulation.population.take(slice(None)),
+            best_agent=simulation.best_agent.population.take(slice(None)),
+            best_profit=simulation.best_profit,
+            best_profit_idx=simulation.best_profit_idx,
+            elapsed=simulation.elapsed,
+            evaluations=simulation.evaluator.evaluations,
+            stopping_history=list(simulation.stopping_history),
+            fitness_cache=None if simulation.evaluator.cache is None else simulation.evaluator.cache.snapshot(),
+            fitness_function_cache=simulation.fitness_function.cache.snapshot(),
+            evaluation_checkpoints=copy.deepcopy(simulation.evaluator.previous_checkpoints()),
+            fitness=None if simulation.fitness is None else simulation.fitness.copy(),
+            metrics_offset=simulation.metrics.offset if simulation.metrics is not None else None,
+            agent_life_lengths=copy.deepcopy(simulation.GA.agent_life_lengths),
+            parents=None if simulation.GA.parents is None else simulation.GA.parents.copy(),
+            python_random_state=random.getstate(),
+            numpy_random_state=np.random.get_state(),
+            ga_random_state=simulation.GA.rng.bit_generator.state
+        )
+
+    def restore(self, simulation) -> None:
+        simulation.iteration = self.iteration
+        simulation.population = self.population
+        simulation.best_agent = Agent(population=self.best_agent)
+        simulation.best_profit = self.best_profit
+        simulation.best_profit_idx = self.best_profit_idx
+        simulation.elapsed = self.elapsed
+        simulation.metrics_offset = self.metrics_offset
+        simulation.GA.agent_life_lengths = self.agent_life_lengths
+        simulation.GA.parents = self.parents
+        simulation.GA.rng.bit_generator.state = self.ga_random_state
+        simulation.stopping_history = deque(self.stopping_history)
+        simulation.evaluator.restore_previous(self.population, self.evaluation_checkpoints)
+        simulation.evaluator.evaluations = self.evaluations
+        if simulation.evaluator.cache is not None and self.fitness_cache is not None:
+            simulation.evaluator.cache.restore(*self.fitness_cache)
+        simulation.fitness_function.cache.restore(*self.fitness_function_cache)
+        simulation.fitness = self.fitness
+        random.setstate(self.python_random_state)
+        np.random.set_state(self.numpy_random_state)
+
+    def save(self, path: Path) -> None:
+        # zapis do pliku tymczasowego i podmiana, więc przerwanie w trakcie nie psuje poprzedniego punktu
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        bit_generator, key, pos, has_gauss, cached_gaussian = self.numpy_random_state
+        version, python_state, gauss = self.python_random_state
+        meta = {
+            'iteration': self.iteration,
+            'tickers': self.population.tickers,
+            'best_profit': self.best_profit,
+            'best_profit_idx': self.best_profit_idx,
+            'elapsed': self.elapsed,
+            'evaluations': self.evaluations,
+            'stopping_history': self.stopping_history,
+            'metrics_offset': self.metrics_offset,
+            'agent_life_lengths': [self.agent_life_lengths.count, self.agent_life_lengths.running_mean,
+                                   self.agent_life_lengths.m2],
+            'python_random_state': [version, list(python_state), gauss],
+            'numpy_random_state': [bit_generator, pos, has_gauss, cached_gaussian],
+            'ga_random_state': self.ga_random_state
+        }
+        arrays = {
+            'meta': np.array(json.dumps(meta)),
+            'actions': self.population.actions,
+            'profits': self.population.profits,
+            'ages': self.population.ages,
+            'best_agent_actions': self.best_agent.actions,
+            'best_agent_profits': self.best_agent.profits,
+            'best_agent_ages': self.best_agent.ages,
+            'agent_life_histogram': self.agent_life_lengths.histogram,
+            'numpy_random_key': key
+        }
+        if self.parents is not None:
+            arrays['parents'] = self.parents
+        if self.fitness_cache is not None:
+            arrays['fitness_cache_keys'], arrays['fitness_cache_values'], arrays['fitness_cache_counts'] = \
+                self.fitness_cache
+        (arrays['fitness_function_cache_keys'], arrays['fitness_function_cache_values'],
+         arrays['fitness_function_cache_counts']) = self.fitness_function_cache
+        if self.evaluation_checkpoints is not None:
+            checkpoints = self.evaluation_checkpoints
+            arrays['evaluation_cash'] = checkpoints.cash
+            arrays['evaluation_inventory'] = checkpoints.inventory
+            arrays['evaluation_infeasible'] = checkpoints.infeasible
+            arrays['evaluation_valid'] = checkpoints.valid
+        if self.fitness is not None:
+            arrays['fitness'] = self.fitness
+
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            tickers = meta['tickers']
+            version, python_state, gauss = meta['python_random_state']
+            bit_generator, pos, has_gauss, cached_gaussian = meta['numpy_random_state']
+            return cls(
+                iteration=meta['iteration'],
+                population=Population(tickers, data['actions'], data['actions'].dtype, data['profits'], data['ages']),
+                best_agent=Population(tickers, data['best_agent_actions'], data['best_agent_actions'].dtype,
+                                      data['best_agent_profits'], data['best_agent_ages']),
+                best_profit=meta['best_profit'],
+                best_profit_idx=meta['best_profit_idx'],
+                elapsed=meta['elapsed'],
+                evaluations=meta['evaluations'],
+                stopping_history=[tuple(entry) for entry in meta['stopping_history']],
+                fitness_cache=(data['fitness_cache_keys'], data['fitness_cache_values'], data['fitness_cache_counts'])
+                if 'fitness_cache_keys' in data else None,
+                fitness_function_cache=(data['fitness_function_cache_keys'], data['fitness_function_cache_values'],
+                                        data['fitness_function_cache_counts']),
+                evaluation_checkpoints=EvaluationCheckpoints(data['evaluation_cash'], data['evaluation_inventory'],
+                                                             data['evaluation_infeasible'], data['evaluation_valid'])
+                if 'evaluation_cash' in data else None,
+                fitness=data['fitness'] if 'fitness' in data else None,
+                metrics_offset=meta['metrics_offset'],
+                agent_life_lengths=AgeStatistics(data['agent_life_histogram'], *meta['agent_life_lengths']),
+                parents=data['parents'] if 'parents' in data else None,
+                python_random_state=(version, tuple(python_state), gauss),
+                numpy_random_state=(bit_generator, data['numpy_random_key'], pos, has_gauss, cached_gaussian),
+                ga_random_state=meta['ga_random_state']
+            )
+
+
+class CheckpointWriter:
+    DEFAULT_INTERVAL = 1000
+
+    def __init__(self, path: Path, interval: int = DEFAULT_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self._thread: Thread | None = None
+
+    def maybe_save(self, simulation) -> bool:
+        if self.interval <= 0 or simulation.iteration % self.interval != 0:
+            return False
+        checkpoint = SimulationCheckpoint.capture(simulation)
+        # naraz zapisywany jest najwyżej jeden punkt kontrolny
+        self.wait()
+        self._thread = Thread(target=checkpoint.save, args=(self.path,), daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
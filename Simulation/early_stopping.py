@@ -0,0 +1,89 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Self
+import time
+import numpy as np
+
+
+@dataclass
+class StoppingSettings:
+    # None wyłącza dane kryterium; domyślnie symulacja wykonuje wszystkie num_of_iterations iteracji
+    patience: int | None = None
+    min_relative_improvement: float | None = None
+    improvement_window: int = 1000
+    min_diversity: float | None = None
+    diversity_interval: int = 100
+    max_seconds: float | None = None
+    max_evaluations: int | None = None
+
+    @classmethod
+    def from_json(cls, json_content: dict | None) -> Self:
+        return cls(**(json_content or {}))
+
+
+class EarlyStopping:
+    MAX_ITERATIONS = 'max_iterations'
+    PATIENCE = 'patience'
+    MIN_IMPROVEMENT = 'min_improvement'
+    DIVERSITY = 'diversity'
+    TIME_BUDGET = 'time_budget'
+    EVALUATION_BUDGET = 'evaluation_budget'
+
+    def __init__(self, settings: StoppingSettings, start_asset: float, best_profit: float = 0,
+                 best_iteration: int | None = None, elapsed: float = 0, history: deque | None = None) -> None:
+        self.settings = settings
+        self.start_asset = start_asset
+        self.best_profit = best_profit
+        self.best_iteration = best_iteration or 0
+        # (iteracja, najlepszy zysk) z ostatnich improvement_window iteracji, po wznowieniu z punktu kontrolnego
+        self.history = deque() if history is None else history
+        # elapsed: czas liczenia przed wznowieniem z punktu kontrolnego, wliczany do max_seconds
+        self.started = time.perf_counter() - elapsed
+        self.reason = self.MAX_ITERATIONS
+
+    def update(self, iteration: int, best_profit: float, evaluations: int, diversity: float | None = None) -> bool:
+        # iteration to liczba wykonanych iteracji; zwraca True, gdy trzeba przerwać symulację
+        settings = self.settings
+        if best_profit > self.best_profit:
+            self.best_profit = best_profit
+            self.best_iteration = iteration
+
+        if settings.patience is not None and iteration - self.best_iteration >= settings.patience:
+            return self.stop(self.PATIENCE)
+
+        if settings.min_relative_improvement is not None:
+            net_profit = best_profit - self.start_asset
+            self.history.append((iteration, net_profit))
+            while len(self.history) > 1 and self.history[1][0] <= iteration - settings.improvement_window:
+                self.history.popleft()
+            past_iteration, past_profit = self.history[0]
+            if iteration - past_iteration >= settings.improvement_window:
+                improvement = (net_profit - past_profit) / max(abs(past_profit), 1e-9)
+                if improvement < settings.min_relative_improvement:
+                    return self.stop(self.MIN_IMPROVEMENT)
+
+        if settings.min_diversity is not None and diversity is not None and diversity < settings.min_diversity:
+            return self.stop(self.DIVERSITY)
+        if settings.max_seconds is not None and self.elapsed >= settings.max_seconds:
+            return self.stop(self.TIME_BUDGET)
+        if settings.max_evaluations is not None and evaluations >= settings.max_evaluations:
+            return self.stop(self.EVALUATION_BUDGET)
+        return False
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def stop(self, reason: str) -> bool:
+        self.reason = reason
+        return True
+
+    def needs_diversity(self, iteration: int) -> bool:
+        return self.settings.min_diversity is not None and iteration % self.settings.diversity_interval == 0
+
+    @staticmethod
+    def diversity(actions: np.ndarray) -> float:
+        # odsetek różnych genomów w populacji
+        rows = np.ascontiguousarray(actions.reshape(len(actions), -1))
+        unique = np.unique(rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))))
+        return len(unique) / len(actions)
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Self
+from Agent import Population
+from .population_evaluator import PopulationEvaluator, PopulationState
+from .fitness_cache import FitnessCache
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+class FitnessFunction(ABC):
+    # Przystosowanie używane przez GeneticAlgorithm.evolve do losowania rodziców. Zawsze nieujemne
+    # i równe 0 dla agentów łamiących ograniczenia. Funkcje inne niż końcowa wartość portfela
+    # liczą krzywe kapitału przez PopulationEvaluator.evaluate_curves (od pierwszego dnia, blokami), ale tylko
+    # dla genomów, których przystosowania nie ma jeszcze w cache; ten koszt ma osobne liczniki ewaluatora.
+    def __init__(self, cache_size: int = FitnessCache.DEFAULT_MAX_SIZE):
+        self.cache = FitnessCache(cache_size)
+
+    def evaluate(self, evaluator: PopulationEvaluator, population: Population) -> np.ndarray:
+        fitness = np.zeros(len(population), dtype=np.float64)
+        feasible = np.flatnonzero(population.profits > 0)
+        if len(feasible) == 0:
+            return fitness
+        keys = self.cache.keys(population.actions[feasible])
+        values = {}
+        missing = {}
+        for row, key in zip(feasible.tolist(), keys):
+            value = values.get(key)
+            if value is None and key not in missing:
+                value = self.cache.get(key)
+            if value is None:
+                missing.setdefault(key, row)
+            else:
+                values[key] = value
+
+        if missing:
+            rows = np.array(list(missing.values()), dtype=np.int64)
+            value = evaluator.evaluate_curves(population.actions[rows], lambda actions, state, equity:
+                                              self.from_curves(evaluator, actions, state, equity))
+            for key, row_value in zip(missing.keys(), np.maximum(value, 0).tolist()):
+                self.cache.put(key, row_value)
+                values[key] = row_value
+        fitness[feasible] = [values[key] for key in keys]
+        return fitness
+
+    @abstractmethod
+    def from_curves(self, evaluator: PopulationEvaluator, actions: np.ndarray, state: PopulationState,
+                    equity: np.ndarray) -> np.ndarray:
+        pass
+
+
+class FinalValueFitness(FitnessFunction):
+    # dotychczasowe przystosowanie: wartość portfela na końcu symulacji
+    def evaluate(self, evaluator: PopulationEvaluator, population: Population) -> np.ndarray:
+        return population.profits
+
+    def from_curves(self, evaluator, actions, state, equity) -> np.ndarray:
+        return state.profit
+
+
+class RiskAdjustedFitness(FitnessFunction):
+    # końcowa wartość podzielona przez 1 + risk_aversion * roczna zmienność dziennych zmian kapitału
+    def __init__(self, risk_aversion: float = 1.0):
+        super().__init__()
+        self.risk_aversion = risk_aversion
+
+    def from_curves(self, evaluator, actions, state, equity) -> np.ndarray:
+        volatility = np.std(np.diff(equity, axis=1) / evaluator.start_asset, axis=1) * np.sqrt(TRADING_DAYS)
+        return state.profit / (1 + self.risk_aversion * volatility)
+
+
+class DrawdownPenalizedFitness(FitnessFunction):
+    # końcowa wartość pomniejszona o penalty * największe obsunięcie kapitału (ułamek od szczytu)
+    def __init__(self, penalty: float = 1.0):
+        super().__init__()
+        self.penalty = penalty
+
+    def from_curves(self, evaluator, actions, state, equity) -> np.ndarray:
+        peak = np.maximum.accumulate(equity, axis=1)
+        drawdown = np.max((peak - equity) / np.maximum(peak, 1e-9), axis=1)
+        return state.profit * (1 - self.penalty * drawdown)
+
+
+class TurnoverPenalizedFitness(FitnessFunction):
+    # końcowa wartość podzielona przez 1 + penalty * obrót (wartość transakcji / kapitał początkowy)
+    def __init__(self, penalty: float = 0.01):
+        super().__init__()
+        self.penalty = penalty
+
+    def from_curves(self, evaluator, actions, state, equity) -> np.ndarray:
+        turnover = np.einsum('atd,td->a', np.abs(actions.astype(np.float64)), evaluator.prices) / evaluator.start_asset
+        return state.profit / (1 + self.penalty * turnover)
+
+
+@dataclass
+class FitnessSettings:
+    function: str = 'final_value'
+    risk_aversion: float = 1.0
+    drawdown_penalty: float = 1.0
+    turnover_penalty: float = 0.01
+
+    FUNCTIONS = ('final_value', 'risk_adjusted', 'drawdown', 'turnover')
+
+    @classmethod
+    def from_json(cls, json_content: dict | None) -> Self:
+        settings = cls(**(json_content or {}))
+        if settings.function not in cls.FUNCTIONS:
+            raise ValueError(f'Fitness function not recognized: {settings.function}')
+        return settings
+
+    def create(self) -> FitnessFunction:
+        match self.function:
+            case 'risk_adjusted':
+                return RiskAdjustedFitness(self.risk_aversion)
+            case 'drawdown':
+                return DrawdownPenalizedFitness(self.drawdown_penalty)
+            case 'turnover':
+                return TurnoverPenalizedFitness(self.turnover_penalty)
+            case _:
+                return FinalValueFitness()
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from hashlib import blake2b
+import numpy as np
+
+
+class FitnessCache:
+    DEFAULT_MAX_SIZE = 100_000
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(actions: np.ndarray) -> bytes:
+        return blake2b(np.ascontiguousarray(actions).tobytes(), digest_size=16).digest()
+
+    def keys(self, actions: np.ndarray) -> list[bytes]:
+        return [self.key(agent_actions) for agent_actions in actions]
+
+    def get(self, key: bytes):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: bytes, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def snapshot(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # klucze (wiersze po 16 bajtów) i wartości w kolejności LRU oraz [hits, misses], do zapisu w punkcie kontrolnym
+        keys = np.frombuffer(b''.join(self.entries.keys()), dtype=np.uint8).reshape(-1, 16)
+        return keys, np.array(list(self.entries.values()), dtype=np.float64), np.array([self.hits, self.misses])
+
+    def restore(self, keys: np.ndarray, values: np.ndarray, counts: np.ndarray) -> None:
+        self.entries = OrderedDict(zip((key.tobytes() for key in keys), values.tolist()))
+        self.hits, self.misses = (int(count) for count in counts)
+
+    def __len__(self) -> int:
+        return len(self.entries)
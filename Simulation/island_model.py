@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+from multiprocessing import Pipe, Process
+from typing import Self
+import random
+import time
+import numpy as np
+import pandas as pd
+
+from Agent import Agent, Population
+from Algorithm import GeneticAlgorithm, AgeStatistics
+from .simulation import Simulation
+from .early_stopping import EarlyStopping
+from .metrics import METRICS_DTYPE
+
+
+@dataclass
+class IslandSettings:
+    count: int = 1
+    migration_size: int = 2
+    migration_interval: int = 100
+    topology: str = 'ring'
+
+    TOPOLOGIES = ('ring', 'fully_connected')
+
+    @classmethod
+    def from_json(cls, json_content: dict | None) -> Self:
+        settings = cls(**(json_content or {}))
+        if settings.topology not in cls.TOPOLOGIES:
+            raise ValueError(f'Island topology not recognized: {settings.topology}')
+        return settings
+
+
+@dataclass
+class IslandReport:
+    island: int
+    iterations: int
+    elapsed: float
+    evaluations: int
+    best_profit: float
+
+    @property
+    def throughput(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _island_worker(conn, island: int, seed: int, migration_size: int, population: Population, start_asset,
+                   num_of_iterations, GA: GeneticAlgorithm, historical_prices, it, fitness_cache_size, filename,
+                   fitness_function, results_dir):
+    # każda wyspa ma własny strumień liczb losowych
+    random.seed(seed)
+    np.random.seed(seed)
+    GA.reseed(seed)
+    simulation = Simulation(population, [], start_asset, num_of_iterations, GA,
+                            historical_prices, it, fitness_cache_size=fitness_cache_size, report_interval=0,
+                            fitness_function=fitness_function, results_dir=results_dir)
+    simulation.open_metrics(filename, island)
+
+    while True:
+        command, argument = conn.recv()
+        if command == 'run':
+            start, evaluations = time.perf_counter(), simulation.evaluator.evaluations
+            for _ in range(argument):
+                simulation.step()
+            report = IslandReport(island, argument, time.perf_counter() - start,
+                                  simulation.evaluator.evaluations - evaluations, simulation.best_profit)
+            conn.send((report, simulation.best_agents(migration_size)))
+        elif command == 'migrate':
+            simulation.receive_migrants(argument)
+        elif command == 'stop':
+            simulation.metrics.close()
+            conn.send((simulation.best_agent.population, simulation.metrics.path, simulation.GA.agent_life_lengths))
+            conn.close()
+            return
+
+
+class IslandModel:
+    def __init__(self, simulation: Simulation, settings: IslandSettings):
+        self.simulation = simulation
+        self.settings = settings
+
+    def sources(self, island: int) -> list[int]:
+        if self.settings.topology == 'ring':
+            return [(island - 1) % self.settings.count]
+        return [source for source in range(self.settings.count) if source != island]
+
+    @staticmethod
+    def merge_metrics(frames: list[pd.DataFrame], sizes: list[int]) -> pd.DataFrame:
+        # najlepsze wyniki to maksimum po wyspach, średnie ważone liczebnością wysp; mediany archipelagu
+        # nie da się odtworzyć z median wysp, więc median_profit to ich średnia ważona (przybliżenie).
+        # Kolumny takie same jak w pliku z jednej wyspy (METRICS_DTYPE)
+        weights = np.array(sizes, dtype=np.float64) / sum(sizes)
+        weighted = lambda column: sum(weight * frame[column] for weight, frame in zip(weights, frames))
+        return pd.DataFrame({
+            'iteration': frames[0]['iteration'],
+            'best_agent_profit': np.max([frame['best_agent_profit'] for frame in frames], axis=0),
+            'iteration_best_agent_profit': np.max([frame['iteration_best_agent_profit'] for frame in frames], axis=0),
+            'mean_profit': weighted('mean_profit'),
+            'median_profit': weighted('median_profit'),
+            'feasible_fraction': weighted('feasible_fraction'),
+            'evaluation_time': np.max([frame['evaluation_time'] for frame in frames], axis=0)
+        }, columns=list(METRICS_DTYPE.names))
+
+    def run_simulation(self, filename):
+        simulation = self.simulation
+        count = self.settings.count
+        # ziarna wysp z generatora GA, więc przebieg z ustalonym seed w konfiguracji jest powtarzalny
+        seeds = simulation.GA.rng.integers(0, 2 ** 32, size=count)
+        cache = simulation.evaluator.cache
+        populations = [simulation.population.take(indices)
+                       for indices in np.array_split(np.arange(len(simulation.population)), count)]
+
+        connections, processes = [], []
+        for island in range(count):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_island_worker, args=(
+                child_conn, island, int(seeds[island]), self.settings.migration_size, populations[island],
+                simulation.start_asset, simulation.num_of_iterations, simulation.GA, simulation.historical_prices,
+                simulation.it, cache.max_size if cache is not None else 0, filename, simulation.fitness_function,
+                simulation.results_dir
+            ))
+            process.start()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        # kryteria zatrzymania sprawdzane po każdej epoce na wynikach całego archipelagu (bez różnorodności)
+        stopping = simulation.early_stopping()
+        evaluations = 0
+        try:
+            done = 0
+            while done < simulation.num_of_iterations:
+                epoch = min(self.settings.migration_interval, simulation.num_of_iterations - done)
+                for conn in connections:
+                    conn.send(('run', epoch))
+                results = [conn.recv() for conn in connections]
+                done += epoch
+
+                print("=" * 100)
+                for report, _ in results:
+                    print(f"Island {report.island}: {round(report.throughput, 2)} it/s, "
+                          f"{report.evaluations} evaluations, "
+                          f"best profit so far = {round(report.best_profit - simulation.start_asset, 2)}")
+
+                evaluations += sum(report.evaluations for report, _ in results)
+                if stopping.update(done, max(report.best_profit for report, _ in results), evaluations):
+                    print(f"Stopped after {done} iterations: {stopping.reason}")
+                    break
+
+                if done < simulation.num_of_iterations and count > 1:
+                    for island, conn in enumerate(connections):
+                        migrants = Population.concatenate([results[source][1] for source in self.sources(island)])
+                        conn.send(('migrate', migrants))
+
+            for conn in connections:
+                conn.send(('stop', None))
+            finals = [conn.recv() for conn in connections]
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        # wynik całego archipelagu: najlepszy agent i maksimum po wyspach w każdej iteracji
+        best_populations = [final[0] for final in finals]
+        best_agent = Agent(population=max(best_populations, key=lambda population: population.profits[0]))
+        agent_life_lengths = AgeStatistics()
+        for final in finals:
+            agent_life_lengths.merge(final[2])
+        results = self.merge_metrics([pd.read_csv(final[1], index_col=0) for final in finals],
+                                     [len(population) for population in populations])
+        metrics_path = simulation.results_path(filename)
+        results.to_csv(metrics_path)
+
+        print(f"Best agent sale history: {simulation.format_sale_history(best_agent)}")
+        simulation.export_to_csv(
+            filename=filename,
+            median_agent_age=agent_life_lengths.median,
+            mean_agent_age=agent_life_lengths.mean,
+            best_agent=best_agent,
+            iterations=done,
+            stop_reason=stopping.reason
+        )
+        return best_agent, metrics_path
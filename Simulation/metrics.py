@@ -0,0 +1,61 @@
+from pathlib import Path
+import numpy as np
+
+METRICS_DTYPE = np.dtype([
+    ('iteration', np.int64),
+    ('best_agent_profit', np.float64),
+    ('iteration_best_agent_profit', np.float64),
+    ('mean_profit', np.float64),
+    ('median_profit', np.float64),
+    ('feasible_fraction', np.float64),
+    ('evaluation_time', np.float64)
+])
+
+
+class MetricsSink:
+    # Rekordy z iteracji trafiają do stałego bufora i są dopisywane do pliku CSV porcjami,
+    # więc zużycie pamięci nie zależy od liczby iteracji
+    DEFAULT_BUFFER_SIZE = 1024
+
+    def __init__(self, path: Path, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = Path(path)
+        self.buffer = np.zeros(buffer_size, dtype=METRICS_DTYPE)
+        self.size = 0
+        self.offset = 0
+        self._file = None
+
+    def open(self, offset: int | None = None) -> None:
+        # offset: pozycja w pliku zapisana w punkcie kontrolnym, późniejsze rekordy są odrzucane
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if offset is None:
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._file.write(',' + ','.join(METRICS_DTYPE.names) + '\n')
+        else:
+            self._file = open(self.path, 'r+', encoding='utf-8', newline='')
+            self._file.truncate(offset)
+            self._file.seek(offset)
+        self.offset = self._file.tell()
+
+    def append(self, *record) -> None:
+        if self.size == len(self.buffer):
+            self.flush()
+        self.buffer[self.size] = record
+        self.size += 1
+
+    def flush(self) -> None:
+        if self._file is None:
+            return
+        lines = [
+            f"{record[0]}," + ','.join(map(str, record)) + '\n'
+            for record in self.buffer[:self.size].tolist()
+        ]
+        self._file.writelines(lines)
+        self._file.flush()
+        self.offset = self._file.tell()
+        self.size = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
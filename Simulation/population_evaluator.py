@@ -0,0 +1,252 @@
+from dataclasses import dataclass
+from typing import List, Self
+from Agent import Agent, Population
+from Stocks import PricePanel
+from .fitness_cache import FitnessCache
+import numpy as np
+
+
+@dataclass
+class PopulationState:
+    inventory: np.ndarray           # (agents, tickers, days) - stan portfela po każdym dniu
+    cash: np.ndarray                # (agents, days) - gotówka na koniec każdego dnia
+    negative_inventory: np.ndarray  # (agents,)
+    negative_cash: np.ndarray       # (agents,)
+    profit: np.ndarray              # (agents,)
+
+    @property
+    def infeasible(self) -> np.ndarray:
+        return self.negative_inventory | self.negative_cash
+
+
+@dataclass
+class EvaluationCheckpoints:
+    # Stan agenta przed dniem c*stride: gotówka, portfel i czy wcześniej złamał ograniczenia
+    cash: np.ndarray        # (agents, checkpoints)
+    inventory: np.ndarray   # (agents, checkpoints, tickers)
+    infeasible: np.ndarray  # (agents, checkpoints)
+    valid: np.ndarray       # (agents,)
+
+    @classmethod
+    def empty(cls, num_of_agents: int, num_of_checkpoints: int, num_of_tickers: int, start_asset: float) -> Self:
+        cash = np.empty((num_of_agents, num_of_checkpoints), dtype=np.float64)
+        cash[:, 0] = start_asset
+        inventory = np.zeros((num_of_agents, num_of_checkpoints, num_of_tickers), dtype=np.int64)
+        infeasible = np.zeros((num_of_agents, num_of_checkpoints), dtype=bool)
+        return cls(cash, inventory, infeasible, np.zeros(num_of_agents, dtype=bool))
+
+    def copy_rows(self, rows, other: Self, other_rows) -> None:
+        self.cash[rows] = other.cash[other_rows]
+        self.inventory[rows] = other.inventory[other_rows]
+        self.infeasible[rows] = other.infeasible[other_rows]
+        self.valid[rows] = other.valid[other_rows]
+
+
+@dataclass
+class _EvaluatedGeneration:
+    actions: np.ndarray
+    profits: np.ndarray
+    checkpoints: EvaluationCheckpoints
+
+
+class PopulationEvaluator:
+    DEFAULT_CHUNK_SIZE = 1024
+    DEFAULT_CHECKPOINT_STRIDE = 16
+
+    def __init__(self, prices: np.ndarray, start_asset: float, final_prices: np.ndarray | None = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, cache: FitnessCache | None = None,
+                 checkpoint_stride: int = DEFAULT_CHECKPOINT_STRIDE):
+        # prices: (tickers, days), final_prices: cena po której wyceniany jest portfel na końcu
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.final_prices = self.prices[:, -1] if final_prices is None else np.asarray(final_prices, dtype=np.float64)
+        self.start_asset = start_asset
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.checkpoint_stride = checkpoint_stride
+        self.evaluations = 0
+        self.day_steps = 0
+        self.simulated_day_steps = 0
+        # koszt krzywych kapitału dla funkcji przystosowania, liczony osobno od ewaluacji zysku
+        self.curve_evaluations = 0
+        self.curve_day_steps = 0
+        self._previous: _EvaluatedGeneration | None = None
+
+    @classmethod
+    def from_historical_prices(cls, historical_prices: PricePanel, tickers: List[str],
+                               simulation_length: int, start_asset: float, **kwargs) -> Self:
+        prices = historical_prices.matrix(tickers)
+        return cls(prices[:, :simulation_length], start_asset, prices[:, -1], **kwargs)
+
+    @property
+    def num_of_tickers(self) -> int:
+        return self.prices.shape[0]
+
+    @property
+    def skipped_day_steps_fraction(self) -> float:
+        return 1 - self.simulated_day_steps / self.day_steps if self.day_steps else 0.0
+
+    def reset(self) -> None:
+        self._previous = None
+
+    def previous_checkpoints(self) -> EvaluationCheckpoints | None:
+        # punkty kontrolne ostatnio ocenionej generacji, do zapisu w SimulationCheckpoint
+        return None if self._previous is None else self._previous.checkpoints
+
+    def restore_previous(self, population: Population, checkpoints: EvaluationCheckpoints | None) -> None:
+        # population: ostatnio oceniona generacja z zyskami, checkpoints: jej previous_checkpoints()
+        self._previous = None if checkpoints is None else \
+            _EvaluatedGeneration(population.actions, population.profits.copy(), checkpoints)
+
+    def simulate(self, actions: np.ndarray, start_day: int = 0, cash: np.ndarray | None = None,
+                 inventory: np.ndarray | None = None) -> PopulationState:
+        # actions: (agents, tickers, days); symulacja od start_day ze stanem początkowym cash/inventory
+        actions = np.asarray(actions)[:, :, start_day:]
+        num_of_agents, num_of_tickers, num_of_days = actions.shape
+        prices = self.prices[:, start_day:start_day + num_of_days]
+
+        inventory = np.cumsum(actions, axis=2, dtype=np.int64) if inventory is None else \
+            np.cumsum(actions, axis=2, dtype=np.int64) + inventory[:, :, np.newaxis]
+        negative_inventory = (inventory < 0).any(axis=(1, 2))
+
+        # Kolejność sumowania taka sama jak w Agent.execute: dzień po dniu, ticker po tickerze,
+        # dzięki czemu wynik jest identyczny co do bitu
+        flows = np.empty((num_of_agents, 1 + num_of_days * num_of_tickers), dtype=np.float64)
+        flows[:, 0] = self.start_asset if cash is None else cash
+        np.negative(
+            (actions * prices[np.newaxis]).transpose(0, 2, 1).reshape(num_of_agents, -1),
+            out=flows[:, 1:]
+        )
+        cash = np.cumsum(flows, axis=1)[:, num_of_tickers::num_of_tickers]
+        negative_cash = (cash < 0).any(axis=1)
+
+        profit = cash[:, -1].copy()
+        for ticker in range(num_of_tickers):
+            profit += self.final_prices[ticker] * inventory[:, ticker, -1]
+        profit[negative_inventory | negative_cash] = 0
+
+        return PopulationState(inventory, cash, negative_inventory, negative_cash, profit)
+
+    def equity_curves(self, state: PopulationState) -> np.ndarray:
+        # (agents, days): gotówka + portfel wyceniony po cenie zamknięcia z każdego dnia
+        num_of_days = state.cash.shape[1]
+        return state.cash + np.einsum('atd,td->ad', state.inventory, self.prices[:, -num_of_days:])
+
+    def evaluate_curves(self, actions: np.ndarray, function) -> np.ndarray:
+        # function(actions, state, equity) -> (agents,); symulacja od pierwszego dnia blokami po chunk_size
+        # agentów, więc pamięć nie rośnie z rozmiarem populacji
+        values = np.empty(len(actions), dtype=np.float64)
+        for chunk_start in range(0, len(actions), self.chunk_size):
+            chunk = actions[chunk_start:chunk_start + self.chunk_size]
+            state = self.simulate(chunk)
+            values[chunk_start:chunk_start + len(chunk)] = function(chunk, state, self.equity_curves(state))
+        self.curve_evaluations += len(actions)
+        self.curve_day_steps += len(actions) * actions.shape[2]
+        return values
+
+    def evaluate(self, actions: np.ndarray, parents: np.ndarray | None = None) -> np.ndarray:
+        # parents: (agents, 2) - indeksy rodziców w poprzednio ocenianej generacji; agent jest
+        # przeliczany tylko od pierwszego dnia, w którym różni się od bliższego z rodziców
+        actions = np.asarray(actions)
+        num_of_agents, num_of_tickers, num_of_days = actions.shape
+        num_of_checkpoints = -(-num_of_days // self.checkpoint_stride)
+
+        profits = np.empty(num_of_agents, dtype=np.float64)
+        checkpoints = EvaluationCheckpoints.empty(num_of_agents, num_of_checkpoints, num_of_tickers, self.start_asset)
+        start_checkpoint = np.zeros(num_of_agents, dtype=np.int64)
+        pending = np.ones(num_of_agents, dtype=bool)
+
+        previous = self._previous
+        if parents is not None and previous is not None and previous.actions.shape[1:] == actions.shape[1:]:
+            first_difference, source = self._first_difference(actions, previous.actions, np.asarray(parents))
+            identical = first_difference == num_of_days
+            profits[identical] = previous.profits[source[identical]]
+            checkpoints.copy_rows(slice(None), previous.checkpoints, source)
+            start_checkpoint = np.where(checkpoints.valid, first_difference // self.checkpoint_stride, 0)
+            pending &= ~identical
+
+        rows = np.flatnonzero(pending)
+        duplicates = {}
+        if self.cache is not None:
+            # Tylko genomy których nie ma w cache (i tylko jedna kopia każdego klona) są symulowane
+            missing = {}
+            for row, key in zip(rows.tolist(), self.cache.keys(actions[rows])):
+                if key in missing:
+                    duplicates[row] = missing[key]
+                    self.cache.hits += 1
+                    continue
+
+                profit = self.cache.get(key)
+                if profit is None:
+                    missing[key] = row
+                else:
+                    profits[row] = profit
+                    checkpoints.valid[row] = False
+            rows = np.array(list(missing.values()), dtype=np.int64)
+
+        self._simulate_rows(actions, rows, start_checkpoint, profits, checkpoints)
+
+        if self.cache is not None:
+            for key, row in zip(missing.keys(), rows.tolist()):
+                self.cache.put(key, float(profits[row]))
+        for row, original in duplicates.items():
+            profits[row] = profits[original]
+            checkpoints.copy_rows(row, checkpoints, original)
+
+        self.day_steps += num_of_agents * num_of_days
+        self._previous = _EvaluatedGeneration(actions, profits, checkpoints)
+        return profits
+
+    def _simulate_rows(self, actions: np.ndarray, rows: np.ndarray, start_checkpoint: np.ndarray,
+                       profits: np.ndarray, checkpoints: EvaluationCheckpoints) -> None:
+        num_of_days = actions.shape[2]
+        stride = self.checkpoint_stride
+        self.evaluations += len(rows)
+
+        for checkpoint in np.unique(start_checkpoint[rows]):
+            group = rows[start_checkpoint[rows] == checkpoint]
+            start_day = int(checkpoint) * stride
+            for chunk_start in range(0, len(group), self.chunk_size):
+                chunk = group[chunk_start:chunk_start + self.chunk_size]
+                state = self.simulate(actions[chunk], start_day,
+                                      checkpoints.cash[chunk, checkpoint], checkpoints.inventory[chunk, checkpoint])
+                prefix_infeasible = checkpoints.infeasible[chunk, checkpoint]
+                profits[chunk] = np.where(prefix_infeasible, 0, state.profit)
+
+                # zapis stanu przed każdym kolejnym dniem c*stride dla przyszłych dzieci
+                negative_so_far = np.logical_or.accumulate(
+                    (state.inventory < 0).any(axis=1) | (state.cash < 0), axis=1
+                )
+                later = np.arange(checkpoint + 1, checkpoints.cash.shape[1])
+                day = later * stride - 1 - start_day
+                checkpoints.cash[chunk[:, np.newaxis], later] = state.cash[:, day]
+                checkpoints.inventory[chunk[:, np.newaxis], later] = state.inventory[:, :, day].transpose(0, 2, 1)
+                checkpoints.infeasible[chunk[:, np.newaxis], later] = \
+                    prefix_infeasible[:, np.newaxis] | negative_so_far[:, day]
+                checkpoints.valid[chunk] = True
+
+                self.simulated_day_steps += len(chunk) * (num_of_days - start_day)
+
+    @staticmethod
+    def _first_difference(actions: np.ndarray, previous_actions: np.ndarray,
+                          parents: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        num_of_days = actions.shape[2]
+        first_difference = np.full(len(actions), -1, dtype=np.int64)
+        source = parents[:, 0].copy()
+        for candidate in parents.T:
+            differs = (actions != previous_actions[candidate]).any(axis=1)
+            candidate_difference = np.where(differs.any(axis=1), differs.argmax(axis=1), num_of_days)
+            closer = candidate_difference > first_difference
+            first_difference[closer] = candidate_difference[closer]
+            source[closer] = candidate[closer]
+        return first_difference, source
+
+    def evaluate_population(self, population: Population, parents: np.ndarray | None = None) -> np.ndarray:
+        population.profits[:] = self.evaluate(population.actions, parents)
+        return population.profits
+
+    def evaluate_agents(self, agents: List[Agent]) -> np.ndarray:
+        actions = np.stack([agent.actions for agent in agents])
+        profits = self.evaluate(actions)
+        for agent, profit in zip(agents, profits.tolist()):
+            agent.profit = profit
+        return profits
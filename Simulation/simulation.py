@@ -1,78 +1,189 @@
-from typing import List, Dict
-from Agent import Agent
+from collections import deque
+from typing import List
+from Agent import Agent, Population
 from Algorithm import GeneticAlgorithm
-from Stocks import StockUtility
+from Stocks import StockUtility, PricePanel
+from Util import PhaseProfiler
+from .population_evaluator import PopulationEvaluator
+from .fitness_cache import FitnessCache
+from .checkpoint import CheckpointWriter
+from .metrics import MetricsSink
+from .early_stopping import StoppingSettings, EarlyStopping
+from .fitness import FitnessFunction, FinalValueFitness
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import statistics
+import time
 
 class Simulation:
-    def __init__(self, agents: List[Agent], stock_utilities: List[tuple[str, StockUtility]],
+    DEFAULT_REPORT_INTERVAL = 100
+
+    def __init__(self, agents: Population | List[Agent], stock_utilities: List[tuple[str, StockUtility]],
                  start_asset: int, num_of_iterations: int, GA: GeneticAlgorithm,
-                 historical_prices: Dict[str, List[int]], it: int):
-        self.agents = agents
+                 historical_prices: PricePanel, it: int,
+                 fitness_cache_size: int = FitnessCache.DEFAULT_MAX_SIZE,
+                 checkpoint_writer: CheckpointWriter | None = None,
+                 report_interval: int = DEFAULT_REPORT_INTERVAL,
+                 stopping: StoppingSettings | None = None,
+                 fitness_function: FitnessFunction | None = None,
+                 results_dir: Path | None = None):
+        self.population = agents if isinstance(agents, Population) else Population.from_agents(agents)
         self.stock_utilities = stock_utilities
         self.start_asset = start_asset
         self.num_of_iterations = num_of_iterations
         self.GA = GA
         self.historical_prices = historical_prices
         self.it = it
+        self.checkpoint_writer = checkpoint_writer
+        self.report_interval = report_interval
+        self.stopping = stopping or StoppingSettings()
+        self.fitness_function = fitness_function or FinalValueFitness()
+        # katalog plików z metrykami i statystykami, domyślnie csv_results
+        self.results_dir = Path(__file__).parent.parent / "csv_results" if results_dir is None else Path(results_dir)
+        # przystosowanie bieżącej populacji, None gdy trzeba je policzyć od nowa
+        self.fitness = None
+        self.metrics = None
+        self.metrics_offset = None
+        self.evaluator = PopulationEvaluator.from_historical_prices(
+            historical_prices=historical_prices,
+            tickers=self.population.tickers,
+            simulation_length=self.population.num_of_days,
+            start_asset=start_asset,
+            cache=FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+        )
+
+        self.iteration = 0
+        self.best_agent = None
+        self.best_profit = 0
+        self.best_profit_idx = None
+        self.iteration_best_profit = None
+        # sekundy run_simulation, łącznie z uruchomieniami przed wznowieniem
+        self.elapsed = 0.0
+        # okno min_relative_improvement, wspólne z EarlyStopping, żeby trafiało do punktu kontrolnego
+        self.stopping_history = deque()
+
+    def step(self) -> int:
+        i = self.iteration
+        profiler = PhaseProfiler.current()
+        with profiler.sample(i):
+            if self.fitness is None:
+                self.fitness = self.fitness_function.evaluate(self.evaluator, self.population)
+            with profiler.phase('evolve'):
+                self.population = self.GA.evolve(self.population, self.fitness)
+            start = time.perf_counter()
+            with profiler.phase('evaluate'):
+                self.evaluator.evaluate_population(self.population, self.GA.parents)
+                self.fitness = self.fitness_function.evaluate(self.evaluator, self.population)
+            evaluation_time = time.perf_counter() - start
+        iteration_best_idx = int(np.argmax(self.population.profits))
+        iteration_best_agent = Agent(population=self.population, index=iteration_best_idx)
+        if self.best_agent is None or iteration_best_agent.profit > self.best_profit:
+            self.best_profit = iteration_best_agent.profit
+            self.best_profit_idx = i
+            self.best_agent = iteration_best_agent.copy()
+
+        self.iteration_best_profit = round(iteration_best_agent.profit - self.start_asset, 2)
+        if self.metrics is not None:
+            profits = self.population.profits
+            self.metrics.append(i, round(self.best_profit - self.start_asset, 2), self.iteration_best_profit,
+                                profits.mean() - self.start_asset, np.median(profits) - self.start_asset,
+                                np.count_nonzero(profits) / len(profits), evaluation_time)
+
+        self.GA.agent_life_lengths.add(self.population.ages)
+        self.iteration += 1
+        return iteration_best_idx
+
+    def best_agents(self, k: int) -> Population:
+        return self.population.take(np.argsort(self.population.profits)[::-1][:k])
+
+    def receive_migrants(self, migrants: Population) -> None:
+        # migranci zastępują najsłabszych agentów wyspy
+        worst = np.argsort(self.population.profits)[:len(migrants)]
+        self.population.actions[worst] = migrants.actions[:len(worst)]
+        self.population.profits[worst] = migrants.profits[:len(worst)]
+        self.population.ages[worst] = migrants.ages[:len(worst)]
+        # punkty kontrolne poprzedniej generacji nie opisują już tej populacji
+        self.evaluator.reset()
+        self.fitness = None
+
+    def results_path(self, filename, island: int | None = None) -> Path:
+        prefix = f"results_it{self.it}_" if island is None else f"results_it{self.it}_island{island}_"
+        return self.results_dir / (prefix + Path(filename).name.replace(".json", ".csv"))
+
+    def open_metrics(self, filename, island: int | None = None) -> MetricsSink:
+        # po wznowieniu z punktu kontrolnego plik jest przycinany do zapisanego tam miejsca
+        self.metrics = MetricsSink(self.results_path(filename, island))
+        self.metrics.open(self.metrics_offset)
+        return self.metrics
+
+    def early_stopping(self) -> EarlyStopping:
+        # po wznowieniu cierpliwość liczona od iteracji, w której znaleziono najlepszego agenta
+        best_iteration = None if self.best_profit_idx is None else self.best_profit_idx + 1
+        return EarlyStopping(self.stopping, self.start_asset, self.best_profit, best_iteration, self.elapsed,
+                             self.stopping_history)
 
     def run_simulation(self, filename):
-        best_agent = None
-        best_profit = 0
-        best_profit_idx = None
-        best_agents_profit = []
-        iteration_best_agents_profit = []
-        for i in range(self.num_of_iterations):
-            print("=" * 100)
-            self.agents = self.GA.evolve(self.agents)
-            iteration_best_agent = None
-            for agent in self.agents:
-                agent.execute(historical_prices=self.historical_prices, start_asset=self.start_asset)
-
-                if best_agent is None or agent.profit > best_profit:
-                    best_profit = agent.profit
-                    best_profit_idx = i
-                    best_agent = agent
-                if iteration_best_agent is None or agent.profit > iteration_best_agent.profit:
-                    iteration_best_agent = agent
-
-            iteration_best_agents_profit.append(round(iteration_best_agent.profit - self.start_asset, 2))
-            best_agents_profit.append(round(best_agent.profit - self.start_asset, 2))
-
-            self.GA.agent_life_lengths += [agent.age for agent in self.agents]
-            print(f"Iteration {i} best agent: Agent{self.agents.index(iteration_best_agent)}, profit = {round(iteration_best_agent.profit - self.start_asset, 2)}")
-            print(f"Best profit so far = {round(best_agent.profit - self.start_asset, 2)}, found in iteration = {best_profit_idx}")
-
-
-        print(f"Best agent sale history: {best_agent.sale_history}")
-        self.export_to_csv(
-            filename=filename, 
-            best_agents_profit=best_agents_profit,
-            iteration_best_agents_profit=iteration_best_agents_profit,
-            median_agent_age=statistics.median(self.GA.agent_life_lengths),
-            mean_agent_age=statistics.mean(self.GA.agent_life_lengths),
-            best_agent=best_agent
-        )
-        return best_agent, iteration_best_agents_profit, best_agents_profit
+        metrics = self.open_metrics(filename)
+        stopping = self.early_stopping()
+        while self.iteration < self.num_of_iterations:
+            i = self.iteration
+            iteration_best_idx = self.step()
+            self.elapsed = stopping.elapsed
+            if self.report_interval and (i + 1) % self.report_interval == 0:
+                print("=" * 100)
+                print(f"Iteration {i} best agent: Agent{iteration_best_idx}, profit = {self.iteration_best_profit}")
+                print(f"Best profit so far = {round(self.best_profit - self.start_asset, 2)}, found in iteration = {self.best_profit_idx}")
+            if self.checkpoint_writer is not None:
+                with PhaseProfiler.current().phase('checkpoint'):
+                    self.checkpoint_writer.maybe_save(self)
+            diversity = EarlyStopping.diversity(self.population.actions) if stopping.needs_diversity(self.iteration) else None
+            if stopping.update(self.iteration, self.best_profit, self.evaluator.evaluations, diversity):
+                print(f"Stopped after {self.iteration} iterations: {stopping.reason}")
+                break
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.wait()
 
-    def export_to_csv(self, filename, best_agents_profit, iteration_best_agents_profit, median_agent_age, mean_agent_age, best_agent):
-        results_df = pd.DataFrame({
-            "iteration": list(range(self.num_of_iterations)),
-            "best_agent_profit": best_agents_profit,
-            "iteration_best_agent_profit": iteration_best_agents_profit
-        })
+        best_agent = self.best_agent
+        print(f"Best agent sale history: {self.format_sale_history(best_agent)}")
+        if self.evaluator.cache is not None:
+            cache = self.evaluator.cache
+            print(f"Fitness cache: {cache.hits} hits, {cache.misses} misses, hit rate = {round(cache.hit_rate, 3)}")
+        print(f"Skipped day steps: {round(self.evaluator.skipped_day_steps_fraction, 3)}")
+        if self.evaluator.curve_evaluations:
+            print(f"Equity curves: {self.evaluator.curve_evaluations} agents simulated from day 0, "
+                  f"{self.evaluator.curve_day_steps} day steps")
+        if self.GA.repair is not None:
+            repair = self.GA.repair
+            print(f"Infeasible children: {round(repair.infeasible_rate_before, 3)} before repair, "
+                  f"{round(repair.infeasible_rate_after, 3)} after")
+        with PhaseProfiler.current().phase('export'):
+            metrics.close()
+            self.export_to_csv(
+                filename=filename,
+                median_agent_age=self.GA.agent_life_lengths.median,
+                mean_agent_age=self.GA.agent_life_lengths.mean,
+                best_agent=best_agent,
+                iterations=self.iteration,
+                stop_reason=stopping.reason
+            )
+        # przebieg iteracji zostaje w pliku CSV, wywołujący czyta go sam, jeśli potrzebuje
+        return best_agent, metrics.path
 
+    def export_to_csv(self, filename, median_agent_age, mean_agent_age, best_agent, iterations=None,
+                      stop_reason=EarlyStopping.MAX_ITERATIONS):
+        # wyniki z kolejnych iteracji są już w pliku MetricsSink, tu zapisywane są tylko statystyki końcowe
         stats_df = pd.DataFrame({
+            "iterations": [self.iteration if iterations is None else iterations],
+            "stop_reason": [stop_reason],
             "median_agent_age": [median_agent_age],
             "mean_agent_age": [mean_agent_age],
-            "best_sale_history": [str(best_agent.sale_history)]
+            "best_sale_history": [self.format_sale_history(best_agent)]
         })
 
         file_path = Path(filename).name
-        results_path = Path(__file__).parent.parent / "csv_results"
-        results_path.mkdir(parents=True, exist_ok=True)
-        results_df.to_csv(results_path / (
-                    f"results_it{self.it}_" + file_path.replace(".json", ".csv")))
-        stats_df.to_csv(results_path / (f"results_stats{self.it}_" + file_path.replace(".json", ".csv")))
\ No newline at end of file
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        stats_df.to_csv(self.results_dir / (f"results_stats{self.it}_" + file_path.replace(".json", ".csv")))
+
+    @staticmethod
+    def format_sale_history(agent: Agent) -> str:
+        return str({ticker: actions.tolist() for ticker, actions in agent.sale_history.items()})
\ No newline at end of file
@@ -1,5 +1,11 @@
 from .stock_utility import StockUtility
 from .period import Period
 from .stock_utility_factory import StockUtilityFactory
+from .price_store import PriceStore
+from .shared_prices import SharedPriceData
+from .synthetic_prices import SyntheticPriceSource
+from .price_panel import PricePanel
+from .estimation_cache import EstimationCache
+from ._estimation_config import EstimationConfig
 
-__all__ = ['StockUtility', 'Period', 'StockUtilityFactory']
\ No newline at end of file
+__all__ = ['StockUtility', 'Period', 'StockUtilityFactory', 'PriceStore', 'SharedPriceData', 'SyntheticPriceSource', 'PricePanel', 'EstimationCache', 'EstimationConfig']
\ No newline at end of file
@@ -11,9 +11,16 @@ class EstimationConfig:
     forecast_days: int
     lookback_days: int
 
+    # lookback_days to sesje, a nie dni kalendarzowe: zapas na weekendy (7/5) i święta
+    HOLIDAY_MARGIN_DAYS = 10
+
+    @staticmethod
+    def history_start(start_date: date, lookback_days: int) -> date:
+        # pierwszy dzień danych, po którym przed start_date jest co najmniej lookback_days sesji
+        return start_date - timedelta(lookback_days * 7 // 5 + 1 + EstimationConfig.HOLIDAY_MARGIN_DAYS)
+
     def data_period(self) -> Period:
-        start = self.start_date - timedelta(self.lookback_days)
-        return Period(start, self.end_date)
+        return Period(self.history_start(self.start_date, self.lookback_days), self.end_date)
     
     def estimation_range(self, data_length) -> range:
         return range(data_length - self.lookback_days)
@@ -0,0 +1,79 @@
+from .estimators import StockPriceEstimator, BatchEstimationResult
+from pathlib import Path
+import hashlib
+import os
+import numpy as np
+
+
+class EstimationCache:
+    # Trwały cache macierzy predykcji i współczynników, wspólny dla konfiguracji i powtórzeń.
+    # Klucz: ticker, estymator, lookback, forecast, liczba okien i odcisk danych (daty + ceny),
+    # wpis to dwa pliki .npy czytane przez np.load(mmap_mode='r'). Najdawniej używane wpisy
+    # są usuwane, gdy łączny rozmiar przekroczy max_bytes.
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(ticker: str, estimator: StockPriceEstimator, lookback_days: int, forecast_days: int,
+            num_of_windows: int, dates: np.ndarray, close_prices: np.ndarray) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{type(estimator).__name__}:{lookback_days}:{forecast_days}:{num_of_windows}'.encode())
+        digest.update(np.ascontiguousarray(dates, dtype='datetime64[D]').tobytes())
+        digest.update(np.ascontiguousarray(close_prices, dtype=np.float64).tobytes())
+        return f'{ticker}__{digest.hexdigest()}'
+
+    def get(self, key: str) -> BatchEstimationResult | None:
+        prices_path, coefficients_path = self._paths(key)
+        try:
+            result = BatchEstimationResult(np.load(prices_path, mmap_mode='r'), np.load(coefficients_path, mmap_mode='r'))
+        except (FileNotFoundError, ValueError):
+            # brak wpisu albo usunięty przez inny proces w trakcie odczytu
+            self.misses += 1
+            return None
+        try:
+            os.utime(prices_path)
+        except FileNotFoundError:
+            # wpis usunięty po wczytaniu; zmapowane tablice pozostają poprawne
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: BatchEstimationResult) -> None:
+        for path, values in zip(self._paths(key), (result.estimated_prices, result.equation_coefficients)):
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(values, dtype=np.float64))
+            os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for prices_path in self.directory.glob('*.prices.npy'):
+            coefficients_path = prices_path.with_name(prices_path.name.replace('.prices.npy', '.coefficients.npy'))
+            try:
+                size = prices_path.stat().st_size + coefficients_path.stat().st_size
+                entries.append((prices_path.stat().st_mtime, size, prices_path, coefficients_path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(entry[1] for entry in entries)
+        for _, size, *paths in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                path.unlink(missing_ok=True)
+            total -= size
+
+    def invalidate(self, ticker: str) -> None:
+        # wywoływane przez PriceStore po dociągnięciu nowych cen tickera
+        for path in self.directory.glob(f'{ticker}__*.npy'):
+            path.unlink(missing_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f'{key}.prices.npy', self.directory / f'{key}.coefficients.npy'
@@ -1,4 +1,9 @@
 from .stock_estimators_builder import EstimatorBuilder, EstimatorStrategy
 from .stock_price_estimator import StockPriceEstimator
+from .estimation_result import EstimationResult, BatchEstimationResult
+from .online_estimator import OnlineEstimator, OnlineLeastSquareMethodEstimator, OnlineMethodOfMomentsEstimator, \
+    OnlineMaximumLikelihoodEstimator, EwmaEstimator
 
-__all__ = ['EstimatorBuilder', 'EstimatorStrategy', 'StockPriceEstimator']
\ No newline at end of file
+__all__ = ['EstimatorBuilder', 'EstimatorStrategy', 'StockPriceEstimator', 'EstimationResult', 'BatchEstimationResult',
+           'OnlineEstimator', 'OnlineLeastSquareMethodEstimator', 'OnlineMethodOfMomentsEstimator',
+           'OnlineMaximumLikelihoodEstimator', 'EwmaEstimator']
\ No newline at end of file
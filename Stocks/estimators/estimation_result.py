@@ -4,4 +4,21 @@ import numpy as np
 @dataclass
 class EstimationResult:
     estimated_prices: np.array
-    equation_coefficients: tuple[np.float32, np.float32]
\ No newline at end of file
+    equation_coefficients: tuple[np.float32, np.float32]
+
+@dataclass
+class BatchEstimationResult:
+    # Wiersz i odpowiada oknu historical[i:i+lookback_days]
+    estimated_prices: np.ndarray        # (windows, forecast_days)
+    equation_coefficients: np.ndarray   # (windows, 2)
+
+    def __len__(self) -> int:
+        return len(self.estimated_prices)
+
+    def __getitem__(self, window: int) -> EstimationResult:
+        a, b = self.equation_coefficients[window]
+        return EstimationResult(self.estimated_prices[window], (a, b))
+
+    def __iter__(self):
+        for window in range(len(self)):
+            yield self[window]
\ No newline at end of file
@@ -0,0 +1,220 @@
+from abc import ABC, abstractmethod
+from typing import Self
+from .estimation_result import EstimationResult, BatchEstimationResult
+from .stock_price_estimator import (StockPriceEstimator, LeastSqaureMethodEstimator, MethodOfMomentsEstimator,
+                                    MaximumLikelihoodEstimator)
+import numpy as np
+
+
+class OnlineEstimator(ABC):
+    # Estymator strumieniowy: seed() z historią, potem update() z jedną nową ceną dziennie.
+    # Zwraca to samo co StockPriceEstimator.estimate_from_historic dla bieżącego okna.
+    def __init__(self, future_days: int) -> None:
+        self.future_days = future_days
+
+    @abstractmethod
+    def seed(self, close_prices: np.ndarray) -> EstimationResult:
+        pass
+
+    @abstractmethod
+    def update(self, close_price: float) -> EstimationResult:
+        pass
+
+    @abstractmethod
+    def estimate(self) -> EstimationResult:
+        pass
+
+    def estimate_stream(self, close_prices: np.ndarray, seed_days: int) -> BatchEstimationResult:
+        # seed() z pierwszymi seed_days cenami, potem update() z każdą kolejną, jak w pętli dziennej;
+        # wiersz i odpowiada oknu kończącemu się ceną close_prices[seed_days - 1 + i]
+        close_prices = np.asarray(close_prices, dtype=np.float64)
+        if len(close_prices) < seed_days:
+            return BatchEstimationResult(np.empty((0, self.future_days)), np.empty((0, 2)))
+        results = [self.seed(close_prices[:seed_days])]
+        results += [self.update(price) for price in close_prices[seed_days:].tolist()]
+        return BatchEstimationResult(np.array([result.estimated_prices for result in results]),
+                                     np.array([result.equation_coefficients for result in results]))
+
+    @staticmethod
+    def for_estimator(estimator: StockPriceEstimator, lookback_days: int, future_days: int) -> Self:
+        match estimator:
+            case LeastSqaureMethodEstimator():
+                return OnlineLeastSquareMethodEstimator(lookback_days, future_days)
+            case MethodOfMomentsEstimator():
+                return OnlineMethodOfMomentsEstimator(lookback_days, future_days)
+            case MaximumLikelihoodEstimator():
+                return OnlineMaximumLikelihoodEstimator(lookback_days, future_days)
+            case _:
+                raise TypeError(f'No online variant for {type(estimator).__name__}')
+
+
+class RollingWindowEstimator(OnlineEstimator):
+    # Ostatnie lookback_days cen w buforze cyklicznym; sumy są aktualizowane w O(1), a co
+    # lookback_days kroków liczone od nowa z bufora, żeby błąd zaokrągleń się nie kumulował
+    def __init__(self, lookback_days: int, future_days: int) -> None:
+        super().__init__(future_days)
+        if lookback_days < 2:
+            raise ValueError('lookback_days must be at least 2')
+        self.lookback_days = lookback_days
+        self.prices = np.zeros(lookback_days, dtype=np.float64)
+        self.head = 0
+        self.updates = 0
+
+    def seed(self, close_prices: np.ndarray) -> EstimationResult:
+        close_prices = np.asarray(close_prices, dtype=np.float64)
+        if len(close_prices) < self.lookback_days:
+            raise ValueError(f'seed needs at least {self.lookback_days} prices')
+        self.prices[:] = close_prices[-self.lookback_days:]
+        self.head = 0
+        self.updates = 0
+        self._recompute()
+        return self.estimate()
+
+    def update(self, close_price: float) -> EstimationResult:
+        n = self.lookback_days
+        removed = self.prices[self.head]
+        after_removed = self.prices[(self.head + 1) % n]
+        last = self.prices[(self.head - 1) % n]
+        self.prices[self.head] = close_price
+        self.head = (self.head + 1) % n
+        self.updates += 1
+        if self.updates % n == 0:
+            self._recompute()
+        else:
+            self._slide(removed, after_removed, last, float(close_price))
+        return self.estimate()
+
+    def window(self) -> np.ndarray:
+        return np.concatenate((self.prices[self.head:], self.prices[:self.head]))
+
+    @property
+    def last_price(self) -> float:
+        return float(self.prices[(self.head - 1) % self.lookback_days])
+
+    @abstractmethod
+    def _recompute(self) -> None:
+        pass
+
+    @abstractmethod
+    def _slide(self, removed: float, after_removed: float, last: float, added: float) -> None:
+        pass
+
+
+class OnlineLeastSquareMethodEstimator(RollingWindowEstimator):
+    def _recompute(self) -> None:
+        window = self.window()
+        self.sum_y = float(window.sum())
+        # sum_iy = suma i*y_i, wtedy suma x*y = sum_iy / (n-1) dla x = linspace(0, 1, n)
+        self.sum_iy = float(np.arange(self.lookback_days) @ window)
+
+    def _slide(self, removed: float, after_removed: float, last: float, added: float) -> None:
+        self.sum_iy += (self.lookback_days - 1) * added - (self.sum_y - removed)
+        self.sum_y += added - removed
+
+    def estimate(self) -> EstimationResult:
+        n = self.lookback_days
+        X = np.linspace(0, 1, n)
+        sum_x = X.sum()
+        sum_xx = X @ X
+        sum_xy = self.sum_iy / (n - 1)
+
+        b = (n * sum_xy - sum_x * self.sum_y) / (n * sum_xx - sum_x ** 2)
+        a = (self.sum_y - b * sum_x) / n
+        future_X = np.linspace(1, 1 + self.future_days/n, self.future_days)
+        return EstimationResult(a + b * future_X, (a, b))
+
+
+class _ReturnMomentsEstimator(RollingWindowEstimator):
+    # Średnia i wariancja n-1 stóp zwrotu z okna n cen
+    @staticmethod
+    @abstractmethod
+    def _return(previous: float, current: float) -> float:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _returns(window: np.ndarray) -> np.ndarray:
+        pass
+
+    def _recompute(self) -> None:
+        returns = self._returns(self.window())
+        self.sum_r = float(returns.sum())
+        self.sum_rr = float(returns @ returns)
+
+    def _slide(self, removed: float, after_removed: float, last: float, added: float) -> None:
+        old_return = self._return(removed, after_removed)
+        new_return = self._return(last, added)
+        self.sum_r += new_return - old_return
+        self.sum_rr += new_return ** 2 - old_return ** 2
+
+    def moments(self) -> tuple[float, float]:
+        count = self.lookback_days - 1
+        mu = self.sum_r / count
+        sigma = np.sqrt(max(self.sum_rr / count - mu ** 2, 0))
+        return mu, sigma
+
+
+class OnlineMethodOfMomentsEstimator(_ReturnMomentsEstimator):
+    @staticmethod
+    def _return(previous: float, current: float) -> float:
+        return (current - previous) / previous
+
+    @staticmethod
+    def _returns(window: np.ndarray) -> np.ndarray:
+        return np.diff(window) / window[:-1]
+
+    def estimate(self) -> EstimationResult:
+        mu, sigma = self.moments()
+        days = np.arange(1, self.future_days + 1)
+        return EstimationResult(self.last_price * (1 + mu) ** days, (mu, sigma))
+
+
+class OnlineMaximumLikelihoodEstimator(_ReturnMomentsEstimator):
+    @staticmethod
+    def _return(previous: float, current: float) -> float:
+        return np.log(current) - np.log(previous)
+
+    @staticmethod
+    def _returns(window: np.ndarray) -> np.ndarray:
+        return np.diff(np.log(window))
+
+    def estimate(self) -> EstimationResult:
+        mu, sigma = self.moments()
+        days = np.arange(1, self.future_days + 1)
+        return EstimationResult(self.last_price * np.exp(mu * days), (mu, sigma))
+
+
+class EwmaEstimator(OnlineEstimator):
+    # Wykładniczo ważone mu i sigma logarytmicznych stóp zwrotu (nowsze dni ważą więcej),
+    # prognoza jak w estymatorze ML. alpha = 1 - 0.5 ** (1 / halflife)
+    def __init__(self, halflife: float, future_days: int) -> None:
+        super().__init__(future_days)
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mu = 0.0
+        self.variance = 0.0
+        self.last_price = None
+
+    def seed(self, close_prices: np.ndarray) -> EstimationResult:
+        close_prices = np.asarray(close_prices, dtype=np.float64)
+        if len(close_prices) < 2:
+            raise ValueError('seed needs at least 2 prices')
+        log_returns = np.diff(np.log(close_prices))
+        self.mu, self.variance = float(log_returns[0]), 0.0
+        for log_return in log_returns[1:].tolist():
+            self._add(log_return)
+        self.last_price = float(close_prices[-1])
+        return self.estimate()
+
+    def update(self, close_price: float) -> EstimationResult:
+        self._add(float(np.log(close_price) - np.log(self.last_price)))
+        self.last_price = float(close_price)
+        return self.estimate()
+
+    def _add(self, log_return: float) -> None:
+        delta = log_return - self.mu
+        self.mu += self.alpha * delta
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta ** 2)
+
+    def estimate(self) -> EstimationResult:
+        days = np.arange(1, self.future_days + 1)
+        return EstimationResult(self.last_price * np.exp(self.mu * days), (self.mu, np.sqrt(self.variance)))
@@ -1,6 +1,5 @@
 from abc import ABC
-import yfinance as yf
-from .estimation_result import EstimationResult
+from .estimation_result import EstimationResult, BatchEstimationResult
 import numpy as np
 
 class StockPriceEstimator(ABC):
@@ -8,56 +7,85 @@ class StockPriceEstimator(ABC):
         pass
 
     def estimate_from_historic(self, historic_close_prices: np.ndarray, future_days: int) -> EstimationResult:
+        close_prices = np.asarray(historic_close_prices, dtype=np.float64)
+        return self.estimate_windows(close_prices, len(close_prices), future_days)[0]
+
+    def estimate_windows(self, close_prices: np.ndarray, lookback_days: int, future_days: int,
+                         num_of_windows: int | None = None) -> BatchEstimationResult:
         pass
 
+    @staticmethod
+    def _num_of_windows(close_prices: np.ndarray, lookback_days: int, num_of_windows: int | None) -> int:
+        max_windows = max(len(close_prices) - lookback_days + 1, 0)
+        return max_windows if num_of_windows is None else min(num_of_windows, max_windows)
+
+    @staticmethod
+    def _windows(values: np.ndarray, window: int, num_of_windows: int) -> np.ndarray:
+        # widok (okna, window) bez kopiowania; sumy i momenty liczone osobno dla każdego okna,
+        # bo różnice globalnej sumy skumulowanej tracą precyzję przy długich szeregach
+        if len(values) < window:
+            return np.empty((0, window), dtype=values.dtype)
+        return np.lib.stride_tricks.sliding_window_view(values, window)[:num_of_windows]
+
+    @staticmethod
+    def _window_moments(values: np.ndarray, window: int, num_of_windows: int) -> tuple[np.ndarray, np.ndarray]:
+        windows = StockPriceEstimator._windows(values, window, num_of_windows)
+        return windows.mean(axis=1), windows.std(axis=1)
+
 class LeastSqaureMethodEstimator(StockPriceEstimator):
     def __init__(self) -> None:
         super().__init__()
 
-    def estimate_from_historic(self, historic_close_prices: np.ndarray, future_days: int) -> EstimationResult:
-        n = len(historic_close_prices)
-        X = np.linspace(0, 1, n).reshape(-1, 1)
-        y = historic_close_prices.values.reshape(-1, 1)
-        
-        X_with_intercept = np.hstack([np.ones((n, 1)), X])
-        coefficients = np.linalg.inv(X_with_intercept.T @ X_with_intercept) @ X_with_intercept.T @ y
-        
-        a = coefficients[0, 0]
-        b = coefficients[1, 0]
-        
-        future_X = np.linspace(1, 1 + future_days/n, future_days).reshape(-1, 1)
-        predictions = a + b * future_X
-        
-        return EstimationResult(predictions.flatten(), (a, b))
-    
+    def estimate_windows(self, close_prices: np.ndarray, lookback_days: int, future_days: int,
+                         num_of_windows: int | None = None) -> BatchEstimationResult:
+        close_prices = np.asarray(close_prices, dtype=np.float64)
+        n = lookback_days
+        num_of_windows = self._num_of_windows(close_prices, n, num_of_windows)
+        windows = self._windows(close_prices, n, num_of_windows)
+
+        # rozwiązanie równań normalnych dla y = a + b*x w postaci zamkniętej dla wszystkich okien naraz,
+        # z x wycentrowanym, żeby nie odejmować od siebie dużych sum
+        X = np.linspace(0, 1, n)
+        centered_X = X - X.mean()
+        b = (windows @ centered_X) / (centered_X @ centered_X)
+        a = windows.mean(axis=1) - b * X.mean()
+
+        future_X = np.linspace(1, 1 + future_days/n, future_days)
+        predictions = a[:, np.newaxis] + b[:, np.newaxis] * future_X
+
+        return BatchEstimationResult(predictions, np.column_stack((a, b)))
+
 class MethodOfMomentsEstimator(StockPriceEstimator):
     def __init__(self) -> None:
         super().__init__()
 
-    def estimate_from_historic(self, historic_close_prices: np.ndarray, future_days: int) -> EstimationResult:
-        returns = np.diff(historic_close_prices) / historic_close_prices[:-1]
-        
-        mu = np.mean(returns)
-        sigma = np.std(returns)
-        
-        last_price = historic_close_prices.iloc[-1]
-        predictions = [
-            last_price * (1 + mu) ** day for day in range(1, future_days + 1)
-        ]
-        
-        return EstimationResult(np.array(predictions), (mu, sigma))
-    
+    def estimate_windows(self, close_prices: np.ndarray, lookback_days: int, future_days: int,
+                         num_of_windows: int | None = None) -> BatchEstimationResult:
+        close_prices = np.asarray(close_prices, dtype=np.float64)
+        num_of_windows = self._num_of_windows(close_prices, lookback_days, num_of_windows)
+        returns = np.diff(close_prices) / close_prices[:-1]
+
+        mu, sigma = self._window_moments(returns, lookback_days - 1, num_of_windows)
+
+        last_price = close_prices[lookback_days - 1:lookback_days - 1 + num_of_windows]
+        days = np.arange(1, future_days + 1)
+        predictions = last_price[:, np.newaxis] * (1 + mu[:, np.newaxis]) ** days
+
+        return BatchEstimationResult(predictions, np.column_stack((mu, sigma)))
+
 class MaximumLikelihoodEstimator(StockPriceEstimator):
     def __init__(self) -> None:
         super().__init__()
 
-    def estimate_from_historic(self, historic_close_prices: np.ndarray, future_days: int) -> EstimationResult:
-        log_returns = np.diff(np.log(historic_close_prices))
-        
-        mu = np.mean(log_returns) 
-        sigma = np.std(log_returns)
-        
-        last_price = historic_close_prices.iloc[-1]
-        mean_prediction = last_price * np.exp(mu * np.arange(1, future_days + 1))
-
-        return EstimationResult(mean_prediction, (mu, sigma))
\ No newline at end of file
+    def estimate_windows(self, close_prices: np.ndarray, lookback_days: int, future_days: int,
+                         num_of_windows: int | None = None) -> BatchEstimationResult:
+        close_prices = np.asarray(close_prices, dtype=np.float64)
+        num_of_windows = self._num_of_windows(close_prices, lookback_days, num_of_windows)
+        log_returns = np.diff(np.log(close_prices))
+
+        mu, sigma = self._window_moments(log_returns, lookback_days - 1, num_of_windows)
+
+        last_price = close_prices[lookback_days - 1:lookback_days - 1 + num_of_windows]
+        mean_prediction = last_price[:, np.newaxis] * np.exp(mu[:, np.newaxis] * np.arange(1, future_days + 1))
+
+        return BatchEstimationResult(mean_prediction, np.column_stack((mu, sigma)))
@@ -0,0 +1,80 @@
+from .period import Period
+from concurrent.futures import ThreadPoolExecutor
+from typing import Self, Sequence
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    # Ceny zamknięcia wszystkich tickerów w jednej tablicy (dni, tickery) na wspólnym kalendarzu.
+    # Tablica jest w porządku kolumnowym, więc panel[ticker] to ciągły widok bez kopiowania.
+    # Ma interfejs get_close_prices, więc może też być źródłem cen dla StockUtility.use_price_store.
+    FILL_POLICIES = ('ffill', 'intersect')
+    DEFAULT_FILL = 'ffill'
+
+    def __init__(self, dates: np.ndarray, tickers: Sequence[str], prices: np.ndarray) -> None:
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.tickers = list(tickers)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def load(cls, tickers: Sequence[str], period: Period, source, fill: str = DEFAULT_FILL,
+             workers: int | None = None) -> Self:
+        # źródło (PriceStore, SharedPriceData, ...) odpytywane równolegle dla wszystkich tickerów
+        with ThreadPoolExecutor(max_workers=workers or len(tickers) or 1) as executor:
+            close_prices = list(executor.map(lambda ticker: source.get_close_prices(ticker, period), tickers))
+        return cls.from_series(dict(zip(tickers, close_prices)), fill)
+
+    @classmethod
+    def from_series(cls, close_prices: dict[str, pd.Series], fill: str = DEFAULT_FILL) -> Self:
+        # ffill: brakujący dzień dostaje ostatnią znaną cenę, a kalendarz zaczyna się od dnia, w którym
+        # notowane były już wszystkie tickery (cen sprzed pierwszej sesji nie ma skąd wziąć),
+        # intersect: zostają tylko dni, w których notowane były wszystkie tickery
+        if fill not in cls.FILL_POLICIES:
+            raise ValueError(f'Fill policy not recognized: {fill}')
+        for ticker, close in close_prices.items():
+            if close.dropna().empty:
+                raise LookupError(f'No close prices for {ticker}')
+
+        frame = pd.DataFrame({
+            ticker: pd.Series(close.to_numpy(dtype=np.float64),
+                              index=pd.DatetimeIndex(close.index).tz_localize(None).normalize())
+            for ticker, close in close_prices.items()
+        }).sort_index()
+        if fill == 'ffill':
+            frame = frame.ffill().dropna()
+        else:
+            frame = frame.dropna()
+        return cls(frame.index.values.astype('datetime64[D]'), list(frame.columns),
+                   np.asfortranarray(frame.to_numpy(dtype=np.float64)))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, ticker: str) -> np.ndarray:
+        return self.prices[:, self._columns[ticker]]
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._columns
+
+    def matrix(self, tickers: Sequence[str] | None = None) -> np.ndarray:
+        # (tickery, dni), układ oczekiwany przez PopulationEvaluator i warm start
+        if tickers is None or list(tickers) == self.tickers:
+            return self.prices.T
+        return self.prices[:, [self._columns[ticker] for ticker in tickers]].T
+
+    def between(self, period: Period) -> Self:
+        lo, hi = self._bounds(period)
+        return PricePanel(self.dates[lo:hi], self.tickers, self.prices[lo:hi])
+
+    def get_close_prices(self, ticker: str, period: Period) -> pd.Series:
+        if ticker not in self._columns:
+            raise LookupError(f'{ticker} is not in the price panel')
+        lo, hi = self._bounds(period)
+        return pd.Series(self[ticker][lo:hi], index=pd.DatetimeIndex(self.dates[lo:hi]), name='Close', copy=False)
+
+    def _bounds(self, period: Period) -> tuple[int, int]:
+        lo, hi = np.searchsorted(self.dates, [np.datetime64(str(period.start)[:10], 'D'),
+                                              np.datetime64(str(period.end)[:10], 'D')])
+        return int(lo), int(hi)
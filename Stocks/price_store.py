@@ -0,0 +1,89 @@
+from .period import Period
+from Util import DateFormatter, DirectoryUtil
+from datetime import date
+from pathlib import Path
+import os
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+
+class PriceStore:
+    # Lokalny cache cen zamknięcia: jeden plik .npz (kolumny dates/close) na ticker,
+    # plus przedział [start, end) który był już pobrany z sieci
+    def __init__(self, directory: Path, offline: bool = False) -> None:
+        self.directory = Path(directory)
+        self.offline = offline
+        # wywoływane z tickerem po każdym dociągnięciu nowych cen (np. EstimationCache.invalidate)
+        self.refresh_listeners = []
+        DirectoryUtil.directory_exists(self.directory.parent, self.directory.name, True)
+
+    def get_close_prices(self, ticker: str, period: Period) -> pd.Series:
+        start, end = self._day(period.start), self._day(period.end)
+        dates, close, covered = self._load(ticker)
+
+        if covered is None or start < covered[0] or end > covered[1]:
+            dates, close, covered = self._refresh(ticker, start, end, dates, close, covered)
+
+        lo, hi = np.searchsorted(dates, [start, end])
+        return pd.Series(close[lo:hi], index=pd.DatetimeIndex(dates[lo:hi]), name='Close')
+
+    def _refresh(self, ticker, start, end, dates, close, covered):
+        if self.offline:
+            raise LookupError(f'{ticker} prices for {start} - {end} are not in the local store (offline mode)')
+
+        # dni od dzisiaj w górę mogą się jeszcze zmienić, więc nie oznaczamy ich jako pobrane
+        today = np.datetime64(date.today(), 'D')
+        if covered is None:
+            missing = [(start, end)]
+            covered = (start, min(end, today))
+        else:
+            missing = [(start, covered[0]), (covered[1], end)]
+            covered = (min(start, covered[0]), max(min(end, today), covered[1]))
+
+        for missing_start, missing_end in missing:
+            if missing_start >= missing_end:
+                continue
+            new_dates, new_close = self._fetch(ticker, missing_start, missing_end)
+            dates = np.concatenate((dates, new_dates))
+            close = np.concatenate((close, new_close))
+
+        # przy powtórzonych dniach wygrywają świeżo pobrane ceny (dopisane na końcu), np. dzisiejsze
+        dates, last = np.unique(dates[::-1], return_index=True)
+        close = close[::-1][last]
+        self._save(ticker, dates, close, covered)
+        for listener in self.refresh_listeners:
+            listener(ticker)
+        return dates, close, covered
+
+    @staticmethod
+    def _fetch(ticker: str, start: np.datetime64, end: np.datetime64) -> tuple[np.ndarray, np.ndarray]:
+        history = yf.Ticker(ticker).history(
+            start=DateFormatter.format_date(start.astype(date)),
+            end=DateFormatter.format_date(end.astype(date))
+        )
+        index = history.index.tz_localize(None) if history.index.tz is not None else history.index
+        return index.normalize().values.astype('datetime64[D]'), history.Close.to_numpy(dtype=np.float64)
+
+    def _path(self, ticker: str) -> Path:
+        return self.directory / f'{ticker}.npz'
+
+    def _load(self, ticker: str):
+        path = self._path(ticker)
+        if not path.exists():
+            return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64), None
+
+        with np.load(path) as data:
+            covered = data['covered']
+            return data['dates'], data['close'], (covered[0], covered[1])
+
+    def _save(self, ticker: str, dates: np.ndarray, close: np.ndarray, covered) -> None:
+        path = self._path(ticker)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, dates=dates, close=close, covered=np.array(covered, dtype='datetime64[D]'))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _day(value) -> np.datetime64:
+        return np.datetime64(str(value)[:10], 'D')
@@ -0,0 +1,68 @@
+from .period import Period
+from multiprocessing import shared_memory
+from typing import Self
+import numpy as np
+import pandas as pd
+
+
+class SharedPriceData:
+    # Ceny zamknięcia wielu tickerów w jednym bloku pamięci współdzielonej.
+    # Ma ten sam interfejs co PriceStore, więc można go podpiąć przez StockUtility.use_price_store
+    # w procesach roboczych; przy pickle przekazywana jest tylko nazwa bloku i układ danych.
+    def __init__(self, memory: shared_memory.SharedMemory, layout: dict[str, tuple[int, int]], owner: bool) -> None:
+        self.memory = memory
+        self.layout = layout
+        self.owner = owner
+        self._views = {}
+        for ticker, (offset, length) in layout.items():
+            dates = np.ndarray(length, dtype='datetime64[D]', buffer=memory.buf, offset=offset)
+            close = np.ndarray(length, dtype=np.float64, buffer=memory.buf, offset=offset + dates.nbytes)
+            if not owner:
+                dates.flags.writeable = False
+                close.flags.writeable = False
+            self._views[ticker] = (dates, close)
+
+    @classmethod
+    def create(cls, close_prices: dict[str, pd.Series]) -> Self:
+        layout = {}
+        size = 0
+        for ticker, close in close_prices.items():
+            layout[ticker] = (size, len(close))
+            size += 16 * len(close)
+
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(memory, layout, owner=True)
+        for ticker, close in close_prices.items():
+            dates, values = shared._views[ticker]
+            dates[:] = pd.DatetimeIndex(close.index).tz_localize(None).values.astype('datetime64[D]')
+            values[:] = close.to_numpy(dtype=np.float64)
+        return shared
+
+    @classmethod
+    def from_source(cls, source, periods: dict[str, Period]) -> Self:
+        return cls.create({ticker: source.get_close_prices(ticker, period) for ticker, period in periods.items()})
+
+    def get_close_prices(self, ticker: str, period: Period) -> pd.Series:
+        if ticker not in self._views:
+            raise LookupError(f'{ticker} is not in shared price data')
+
+        dates, close = self._views[ticker]
+        lo, hi = np.searchsorted(dates, [np.datetime64(str(period.start)[:10], 'D'), np.datetime64(str(period.end)[:10], 'D')])
+        return pd.Series(close[lo:hi], index=pd.DatetimeIndex(dates[lo:hi]), name='Close')
+
+    def close(self) -> None:
+        self._views = {}
+        try:
+            self.memory.close()
+        except BufferError:
+            # ktoś jeszcze trzyma widok na dane, blok zostanie zwolniony razem z nim
+            pass
+        if self.owner:
+            self.memory.unlink()
+
+    def __getstate__(self):
+        return {'name': self.memory.name, 'layout': self.layout}
+
+    def __setstate__(self, state):
+        memory = shared_memory.SharedMemory(name=state['name'], track=False)
+        self.__init__(memory, state['layout'], owner=False)
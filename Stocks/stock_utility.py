@@ -1,14 +1,19 @@
 from .period import Period
-from Util import DateFormatter, DirectoryUtil
-from .estimators import StockPriceEstimator
+from Util import DateFormatter, DirectoryUtil, PhaseProfiler
+from .estimators import StockPriceEstimator, BatchEstimationResult
 from ._estimation_config import EstimationConfig
+from .price_store import PriceStore
+from .estimation_cache import EstimationCache
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
 
 class StockUtility:
     _ESTIMATION_CONFIG = EstimationConfig
+    _PRICE_STORE: PriceStore | None = None
+    _ESTIMATION_CACHE: EstimationCache | None = None
 
     def __init__(self, stock_name: str, estimator: StockPriceEstimator) -> None:
         self.stock_name: str = stock_name
@@ -16,27 +21,62 @@ class StockUtility:
         self.estimator = estimator
 
     def get_historical_close_prices(self, period: Period) -> pd.DataFrame:
-        history = self.stock_ticker.history(
-            start = DateFormatter.format_date(period.start),
-            end = DateFormatter.format_date(period.end)
-            )
-        self.df_ = pd.DataFrame(history)
-        return self.df_.Close
+        with PhaseProfiler.current().phase('price_fetch'):
+            if StockUtility._PRICE_STORE is not None:
+                close = StockUtility._PRICE_STORE.get_close_prices(self.stock_name, period)
+                self.df_ = close.to_frame()
+                return close
 
-    def get_estimations(self):
-        data_period = StockUtility._ESTIMATION_CONFIG.data_period()
-        data = self.get_historical_close_prices(data_period)
+            history = self.stock_ticker.history(
+                start = DateFormatter.format_date(period.start),
+                end = DateFormatter.format_date(period.end)
+                )
+            self.df_ = pd.DataFrame(history)
+            return self.df_.Close
 
+    def get_estimation_matrix(self) -> BatchEstimationResult:
+        config = StockUtility._ESTIMATION_CONFIG
+        data = self.get_historical_close_prices(config.data_period())
         # adjust for weekends
-        for i in StockUtility._ESTIMATION_CONFIG.estimation_range(len(data)):
-            window_start = i
-            window_end = i + StockUtility._ESTIMATION_CONFIG.lookback_days
-            estimation_data = data.iloc[window_start:window_end]
-            estimation_results = self.estimator.estimate_from_historic(
-                estimation_data, 
-                StockUtility._ESTIMATION_CONFIG.forecast_days
+        num_of_windows = len(config.estimation_range(len(data)))
+
+        cache = StockUtility._ESTIMATION_CACHE
+        if cache is not None:
+            key = cache.key(self.stock_name, self.estimator, config.lookback_days, config.forecast_days,
+                            num_of_windows, data.index.values, data.to_numpy())
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+        with PhaseProfiler.current().phase('estimation'):
+            result = self.estimator.estimate_windows(
+                data.to_numpy(),
+                config.lookback_days,
+                config.forecast_days,
+                num_of_windows
             )
-            yield estimation_results
+        if cache is not None:
+            cache.put(key, result)
+        return result
+
+    def estimation_windows(self, dates: np.ndarray) -> np.ndarray:
+        # indeks okna z get_estimation_matrix dla każdej daty: okno kończy się ceną z poprzedniej sesji,
+        # więc decyzja z danego dnia nie widzi jego ani późniejszych cen
+        config = StockUtility._ESTIMATION_CONFIG
+        data = self.get_historical_close_prices(config.data_period())
+        data_dates = pd.DatetimeIndex(data.index).tz_localize(None).values.astype('datetime64[D]')
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        positions = np.searchsorted(data_dates, dates)
+        windows = positions - config.lookback_days
+        listed = data_dates[np.minimum(positions, len(data_dates) - 1)] == dates if len(data_dates) else False
+        missing = ~listed | (windows < 0) | (windows >= len(config.estimation_range(len(data))))
+        if np.any(missing):
+            raise LookupError(f'No estimation window for {self.stock_name} ending before {dates[missing][0]}: '
+                              f'{config.lookback_days} earlier sessions are needed')
+        return windows
+
+    def get_estimations(self):
+        yield from self.get_estimation_matrix()
     
     def save_data(self, filename: str|None = None, extension='csv') -> None:
         if filename is None:
@@ -62,4 +102,12 @@ class StockUtility:
 
     @staticmethod
     def create_config(json_content: str) -> None:
-        StockUtility._ESTIMATION_CONFIG = EstimationConfig.from_json(json_content=json_content)
\ No newline at end of file
+        StockUtility._ESTIMATION_CONFIG = EstimationConfig.from_json(json_content=json_content)
+
+    @staticmethod
+    def use_price_store(price_store: PriceStore | None) -> None:
+        StockUtility._PRICE_STORE = price_store
+
+    @staticmethod
+    def use_estimation_cache(estimation_cache: EstimationCache | None) -> None:
+        StockUtility._ESTIMATION_CACHE = estimation_cache
\ No newline at end of file
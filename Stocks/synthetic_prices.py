@@ -0,0 +1,53 @@
+from .period import Period
+from .estimators.stock_price_estimator import StockPriceEstimator, MethodOfMomentsEstimator, MaximumLikelihoodEstimator
+from datetime import date
+from typing import Self
+import zlib
+import numpy as np
+import pandas as pd
+
+
+class SyntheticPriceSource:
+    # Ceny z geometrycznego ruchu Browna, powtarzalne dla (seed, ticker). Każdy ticker ma jedną
+    # ścieżkę liczoną od ORIGIN, więc nakładające się okresy zwracają te same ceny.
+    # Ma ten sam interfejs co PriceStore, więc działa z StockUtility.use_price_store bez sieci.
+    ORIGIN = date(2000, 1, 3)
+    DEFAULT_PARAMETERS = (0.0005, 0.02)
+
+    def __init__(self, seed: int = 0, parameters: dict[str, tuple[float, float]] | None = None,
+                 start_price: float = 100.0) -> None:
+        # parameters: ticker -> (mu, sigma) dziennych logarytmicznych stóp zwrotu
+        self.seed = seed
+        self.parameters = parameters or {}
+        self.start_price = start_price
+        self._paths: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_estimates(cls, close_prices: dict[str, np.ndarray], estimator: StockPriceEstimator | None = None,
+                       seed: int = 0) -> Self:
+        # parametry z estymatora ML (mu, sigma log-zwrotów) albo MoM (mu, sigma zwrotów prostych)
+        estimator = MaximumLikelihoodEstimator() if estimator is None else estimator
+        parameters = {}
+        for ticker, close in close_prices.items():
+            mu, sigma = estimator.estimate_from_historic(close, 1).equation_coefficients
+            if isinstance(estimator, MethodOfMomentsEstimator):
+                sigma = sigma / (1 + mu)
+                mu = np.log(1 + mu) - sigma ** 2 / 2
+            parameters[ticker] = (float(mu), float(sigma))
+        return cls(seed, parameters)
+
+    def get_close_prices(self, ticker: str, period: Period) -> pd.Series:
+        days = pd.bdate_range(self.ORIGIN, period.end, inclusive='left')
+        path = self._path(ticker, len(days))
+        index = days.searchsorted(pd.Timestamp(period.start))
+        return pd.Series(path[index:len(days)], index=days[index:], name='Close')
+
+    def _path(self, ticker: str, length: int) -> np.ndarray:
+        path = self._paths.get(ticker)
+        if path is None or len(path) < length:
+            mu, sigma = self.parameters.get(ticker, self.DEFAULT_PARAMETERS)
+            rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+            log_returns = rng.normal(mu, sigma, max(length - 1, 0))
+            path = self.start_price * np.exp(np.concatenate(([0.0], np.cumsum(log_returns))))
+            self._paths[ticker] = path
+        return path
@@ -1,4 +1,6 @@
 from .date_formatter import DateFormatter
 from .directory_util import DirectoryUtil
+from .profiler import PhaseProfiler, PhaseStats
+from .chart_renderer import ChartRenderer, ChartJob
 
-__all__ = ['DateFormatter', 'DirectoryUtil']
\ No newline at end of file
+__all__ = ['DateFormatter', 'DirectoryUtil', 'PhaseProfiler', 'PhaseStats', 'ChartRenderer', 'ChartJob']
\ No newline at end of file
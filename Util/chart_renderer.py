@@ -0,0 +1,137 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+import json
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+PROFIT_COLUMNS = ['iteration_best_agent_profit', 'best_agent_profit']
+CHUNK_SIZE = 65536
+
+
+@dataclass
+class ChartJob:
+    config_name: str
+    it: int
+    start_asset: float
+    start_date: str
+    end_date: str
+    best_agent: dict
+    # plik z metrykami kolejnych iteracji, wczytywany dopiero w procesie rysującym
+    metrics_path: Path
+
+    @staticmethod
+    def from_config(config_path: Path, it: int, best_agent: dict, metrics_path: Path) -> Self:
+        with open(config_path, "r", encoding="utf-8-sig") as conf:
+            cnf = json.load(conf)
+        return ChartJob(Path(config_path).name, it, cnf["start_asset"], cnf["start_date"], cnf["end_date"],
+                        best_agent, Path(metrics_path))
+
+
+def positions(history: dict) -> dict[str, np.ndarray]:
+    # liczba posiadanych akcji każdego dnia; int64, żeby suma akcji int16 się nie przepełniła
+    return {stock: np.cumsum(ops, dtype=np.int64) for stock, ops in history.items()}
+
+
+def _plot_positions(ax, job: ChartJob) -> None:
+    for stock, held in positions(job.best_agent['history']).items():
+        ax.plot(np.arange(len(held)), held, label=stock)
+    ax.set_title(f"Best agent profit - {round(job.best_agent['profit'] - job.start_asset, 2)}")
+    ax.set_xlabel("Day")
+    ax.set_ylabel("Number of stocks")
+    ax.legend()
+    ax.grid(True)
+
+
+def profits(metrics_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    # tylko dwie kolumny z pliku MetricsSink, w porcjach
+    iteration_best, best = [], []
+    for chunk in pd.read_csv(metrics_path, usecols=PROFIT_COLUMNS, chunksize=CHUNK_SIZE):
+        iteration_best.append(chunk['iteration_best_agent_profit'].to_numpy())
+        best.append(chunk['best_agent_profit'].to_numpy())
+    return np.concatenate(iteration_best), np.concatenate(best)
+
+
+def _plot_profits(ax, profits: np.ndarray, title: str) -> None:
+    ax.plot(np.arange(len(profits)), profits)
+    ax.set_title(title)
+    ax.set_xlabel("Iteration")
+    ax.set_ylabel("Profit")
+    ax.grid(True)
+
+
+def render(job: ChartJob, directory: Path, preview: bool = False, preview_format: str = "png") -> list[Path]:
+    # wywoływane w procesie roboczym, bez okien (backend Agg)
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    directory = Path(directory)
+    iteration_best, best = profits(job.metrics_path)
+    if preview:
+        # podgląd: trzy wykresy na jednej figurze, niska rozdzielczość albo SVG
+        fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+        _plot_positions(axes[0], job)
+        _plot_profits(axes[1], iteration_best, "Each iteration's best agent's profit")
+        _plot_profits(axes[2], best, "Best agent's profit each iteration")
+        fig.tight_layout()
+        path = directory / f"preview{job.config_name}{job.start_date}{job.end_date}{job.it}.{preview_format}"
+        fig.savefig(path, dpi=ChartRenderer.PREVIEW_DPI)
+        plt.close(fig)
+        return [path]
+
+    charts = [
+        (f"best_agent_stocks{job.config_name}{job.start_date}{job.end_date}{job.it}.png",
+         lambda ax: _plot_positions(ax, job)),
+        (f"iterations_best_profit{job.config_name}{job.it}.png",
+         lambda ax: _plot_profits(ax, iteration_best, "Each iteration's best agent's profit")),
+        (f"best_profit_per_iteration{job.config_name}{job.it}.png",
+         lambda ax: _plot_profits(ax, best, "Best agent's profit each iteration"))
+    ]
+    paths = []
+    for filename, plot in charts:
+        fig, ax = plt.subplots()
+        plot(ax)
+        fig.tight_layout()
+        fig.savefig(directory / filename, dpi=ChartRenderer.DPI)
+        plt.close(fig)
+        paths.append(directory / filename)
+    return paths
+
+
+class ChartRenderer:
+    # Wykresy rysowane w osobnych procesach: submit() od razu wraca, a kolejne symulacje
+    # nie czekają na matplotlib. close() czeka na wszystkie zlecone wykresy.
+    DPI = 300
+    PREVIEW_DPI = 72
+    PREVIEW_FORMATS = ('png', 'svg')
+
+    def __init__(self, directory: Path, workers: int = 1, preview: bool = False, preview_format: str = "png") -> None:
+        if preview_format not in self.PREVIEW_FORMATS:
+            raise ValueError(f'preview_format must be one of {self.PREVIEW_FORMATS}')
+        self.directory = Path(directory)
+        self.preview = preview
+        self.preview_format = preview_format
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # spawn: proces rysujący nie dziedziczy stanu (wątków, puli symulacji) po rodzicu
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.futures: list[Future] = []
+
+    def submit(self, job: ChartJob) -> Future:
+        future = self.executor.submit(render, job, self.directory, self.preview, self.preview_format)
+        self.futures.append(future)
+        return future
+
+    def close(self) -> list[Path]:
+        self.executor.shutdown(wait=True)
+        paths = [path for future in self.futures for path in future.result()]
+        self.futures = []
+        return paths
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.executor.shutdown(wait=True)
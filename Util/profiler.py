@@ -0,0 +1,140 @@
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+import cProfile
+import threading
+import time
+import tracemalloc
+import pandas as pd
+
+
+@dataclass
+class PhaseStats:
+    # wall_time, cpu_time, net_allocated: razem z fazami zagnieżdżonymi (faza zagnieżdżona sama w sobie
+    # liczy się raz); self_*: bez faz zagnieżdżonych, więc suma self_* po fazach nie liczy niczego dwa razy
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    net_allocated: int = 0
+    self_wall_time: float = 0.0
+    self_cpu_time: float = 0.0
+    self_allocated: int = 0
+    active: int = 0
+
+
+class _PhaseTimer:
+    __slots__ = ('stats', 'trace_allocations', 'stack', 'wall_start', 'cpu_start', 'memory_start',
+                 'child_wall', 'child_cpu', 'child_allocated')
+
+    def __init__(self, stats: PhaseStats, trace_allocations: bool, stack: list):
+        self.stats = stats
+        self.trace_allocations = trace_allocations
+        # aktywne fazy bieżącego wątku, od zewnętrznej
+        self.stack = stack
+
+    def __enter__(self):
+        if self.trace_allocations:
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+        self.child_wall, self.child_cpu, self.child_allocated = 0.0, 0.0, 0
+        self.stats.active += 1
+        self.stack.append(self)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        allocated = tracemalloc.get_traced_memory()[0] - self.memory_start if self.trace_allocations else 0
+        self.stack.pop()
+        self.stats.active -= 1
+        self.stats.calls += 1
+        if self.stats.active == 0:
+            self.stats.wall_time += wall
+            self.stats.cpu_time += cpu
+            self.stats.net_allocated += allocated
+        self.stats.self_wall_time += wall - self.child_wall
+        self.stats.self_cpu_time += cpu - self.child_cpu
+        self.stats.self_allocated += allocated - self.child_allocated
+        if self.stack:
+            parent = self.stack[-1]
+            parent.child_wall += wall
+            parent.child_cpu += cpu
+            parent.child_allocated += allocated
+        return False
+
+
+class PhaseProfiler:
+    # Czas ścienny i procesora, liczba wywołań i (opcjonalnie) alokacje w nazwanych fazach programu.
+    # Bieżący profiler jest ustawiany przez PhaseProfiler.use, domyślny nic nie mierzy.
+    _CURRENT: Self | None = None
+
+    def __init__(self, enabled: bool = True, trace_allocations: bool = False, sample_every: int = 0):
+        self.enabled = enabled
+        self.trace_allocations = trace_allocations
+        # co ile iteracji symulacji zbierać pełny profil cProfile (0 - nigdy)
+        self.sample_every = sample_every
+        self.phases: dict[str, PhaseStats] = {}
+        self._local = threading.local()
+        self.profile = cProfile.Profile() if enabled and sample_every > 0 else None
+
+    @classmethod
+    def from_json(cls, json_content: dict | None, enabled: bool = False) -> Self:
+        if json_content is None and not enabled:
+            return cls(enabled=False)
+        return cls(enabled=True, **(json_content or {}))
+
+    @staticmethod
+    def use(profiler: Self | None) -> None:
+        PhaseProfiler._CURRENT = profiler
+
+    @staticmethod
+    def current() -> Self:
+        if PhaseProfiler._CURRENT is None:
+            PhaseProfiler._CURRENT = PhaseProfiler(enabled=False)
+        return PhaseProfiler._CURRENT
+
+    def start(self) -> None:
+        if self.enabled and self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        if self.enabled and self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return nullcontext()
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return _PhaseTimer(stats, self.trace_allocations, stack)
+
+    def sample(self, iteration: int):
+        if self.profile is None or iteration % self.sample_every != 0:
+            return nullcontext()
+        return self.profile
+
+    def to_frame(self) -> pd.DataFrame:
+        columns = ['phase', 'calls', 'wall_time', 'cpu_time', 'net_allocated', 'self_wall_time', 'self_cpu_time',
+                   'self_allocated']
+        return pd.DataFrame([
+            {'phase': name, 'calls': stats.calls, 'wall_time': stats.wall_time, 'cpu_time': stats.cpu_time,
+             'net_allocated': stats.net_allocated, 'self_wall_time': stats.self_wall_time,
+             'self_cpu_time': stats.self_cpu_time, 'self_allocated': stats.self_allocated}
+            for name, stats in self.phases.items()
+        ], columns=columns)
+
+    def export(self, path: Path) -> None:
+        # path: plik CSV z fazami, profil cProfile trafia obok z rozszerzeniem .pstats
+        if not self.enabled:
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_csv(path)
+        if self.profile is not None:
+            self.profile.dump_stats(path.with_suffix('.pstats'))
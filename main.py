@@ -1,19 +1,29 @@
 import json
 from pathlib import Path
-from math import inf
 from datetime import datetime
 import argparse
+import numpy as np
 
-from Algorithm import GeneticAlgorithm, Genome
-from Simulation import Simulation
-from Stocks import StockUtilityFactory, Period
+from Algorithm import GeneticAlgorithm, Genome, FeasibilityRepair
+from Agent import Population
+from Simulation import Simulation, FitnessCache, PopulationEvaluator, IslandModel, IslandSettings, \
+    SimulationCheckpoint, CheckpointWriter, StoppingSettings, FitnessSettings
+from Stocks import StockUtility, StockUtilityFactory, Period, PriceStore, PricePanel, EstimationCache, EstimationConfig
 from Stocks.estimators import EstimatorStrategy
-from Util import DirectoryUtil
+from Util import DirectoryUtil, PhaseProfiler
 
-def main(name, it=0):
+def main(name, it=0, offline=False, price_store=None, resume=False, profile=False):
     with open(name, encoding='utf-8-sig') as f:
         cfg = json.load(f)
 
+    estimation_cache = EstimationCache(Path(__file__).parent / "data" / "estimations",
+                                       cfg.get('estimation_cache_bytes', EstimationCache.DEFAULT_MAX_BYTES))
+    StockUtility.use_estimation_cache(estimation_cache)
+    if price_store is None:
+        price_store = PriceStore(Path(__file__).parent / "data" / "prices", offline=offline)
+        price_store.refresh_listeners.append(estimation_cache.invalidate)
+    StockUtility.use_price_store(price_store)
+
     size = cfg['size']
     start_date = datetime.strptime(cfg['start_date'], '%Y-%m-%d').date()
     end_date = datetime.strptime(cfg['end_date'], '%Y-%m-%d').date()
@@ -24,6 +34,10 @@ def main(name, it=0):
     max_sell = cfg['max_actions_per_day']['sell']
     strategy = cfg['estimator_strategy']
     num_of_iterations = cfg['num_of_iterations']
+    islands = IslandSettings.from_json(cfg.get('islands'))
+    profiler = PhaseProfiler.from_json(cfg.get('profile'), enabled=profile)
+    PhaseProfiler.use(profiler)
+    profiler.start()
 
     if strategy == 'mom':
         factory = StockUtilityFactory(EstimatorStrategy.METHOD_OF_MOMENTS, name)
@@ -36,38 +50,85 @@ def main(name, it=0):
 
     stocks = [(t, factory.create_stock_utilty(t)) for t in tickers]
 
-    period = Period(start_date, end_date)
-    historical_prices = {}
-    simulation_length = inf
-    for ticker, stock_utility in stocks:
-        historical_prices[ticker] = stock_utility.get_historical_close_prices(period).tolist()
-        simulation_length = min(len(historical_prices[ticker]), simulation_length)
+    # wszystkie tickery naraz, na wspólnym kalendarzu, razem z danymi do estymacji (lookback_days sesji przed startem);
+    # estymatory czytają dalej z panelu, a symulacja z jego wycinka [start, end)
+    with profiler.phase('price_fetch'):
+        panel = PricePanel.load(tickers, Period(EstimationConfig.history_start(start_date, cfg['lookback_days']), end_date), price_store,
+                                fill=cfg.get('fill_policy', PricePanel.DEFAULT_FILL))
+    StockUtility.use_price_store(panel)
+    historical_prices = panel.between(Period(start_date, end_date))
+    simulation_length = len(historical_prices)
+
+    checkpoint_path = Path(__file__).parent / "checkpoints" / f"{Path(name).stem}_it{it}.npz"
+    checkpoint = None
+    if resume and islands.count > 1:
+        raise ValueError('Resuming is supported only for runs without islands')
+    if resume and checkpoint_path.exists():
+        checkpoint = SimulationCheckpoint.load(checkpoint_path)
+        print(f"Resuming from iteration {checkpoint.iteration}")
+
+    # warm start i ziarna wysp korzystają z generatora GA, więc seed z konfiguracji ustala cały przebieg
+    # powtórzenia (it) tej samej konfiguracji dostają różne, ale powtarzalne strumienie
+    seed = cfg.get('seed')
+    GA = GeneticAlgorithm(ga_params, seed=None if seed is None else np.random.SeedSequence([*np.atleast_1d(seed), it]))
 
+    # w trybie wysp 'size' to liczebność jednej wyspy
+    size *= islands.count
+    evaluator = PopulationEvaluator.from_historical_prices(historical_prices, tickers, simulation_length, start_asset)
     agents = []
-    i = 0
-    while len(agents) < size:
-        genome = Genome.warm_start(stocks=stocks, historical_prices=historical_prices,
-                                   start_asset=start_asset, max_actions_per_day_bought=max_buy,
-                                   max_actions_per_day_sold=max_sell, simulation_length=simulation_length)
-        agent = genome.to_agent()
-        agent.execute(historical_prices=historical_prices, start_asset=start_asset)
-        if agent.profit > 0:
-            agents.append(agent)
-            print(f"Agent number {len(agents)} has been added")
-        i += 1
-        if i >= size * 100:
+    warm_started = 0
+    while checkpoint is None and warm_started < size:
+        with profiler.phase('warm_start'):
+            population = Genome.warm_start_population(stocks=stocks, historical_prices=historical_prices,
+                                                      start_asset=start_asset, max_actions_per_day_bought=max_buy,
+                                                      max_actions_per_day_sold=max_sell, simulation_length=simulation_length,
+                                                      size=size - warm_started, rng=GA.rng)
+            evaluator.evaluate_population(population)
+        population = population.take(np.flatnonzero(population.profits > 0))
+        agents.append(population)
+        warm_started += len(population)
+        print(f"{warm_started} agents have been added")
+        if len(agents) >= 100:
             raise Exception("Warm start failed, change configuration")
+    agents = checkpoint.population if checkpoint is not None else Population.concatenate(agents)
 
-    GA = GeneticAlgorithm(ga_params)
-    simulation = Simulation(agents, stocks, start_asset, num_of_iterations, GA, historical_prices, it)
-    best_agent, iteration_best_agent, best_agents_profit = simulation.run_simulation(name)
-    return {'profit': best_agent.profit, 'history': best_agent.sale_history}, iteration_best_agent, best_agents_profit
+    if GA.settings.repair:
+        GA.use_repair(FeasibilityRepair.from_historical_prices(historical_prices, tickers, simulation_length, start_asset))
+    simulation = Simulation(agents, stocks, start_asset, num_of_iterations, GA, historical_prices, it,
+                            fitness_cache_size=cfg.get('fitness_cache_size', FitnessCache.DEFAULT_MAX_SIZE),
+                            checkpoint_writer=CheckpointWriter(checkpoint_path, cfg.get('checkpoint_interval', CheckpointWriter.DEFAULT_INTERVAL)),
+                            report_interval=cfg.get('report_interval', Simulation.DEFAULT_REPORT_INTERVAL),
+                            stopping=StoppingSettings.from_json(cfg.get('stopping')),
+                            fitness_function=FitnessSettings.from_json(cfg.get('fitness')).create(),
+                            results_dir=cfg.get('results_dir'))
+    if checkpoint is not None:
+        checkpoint.restore(simulation)
+    results_dir = simulation.results_dir
+    if islands.count > 1:
+        simulation = IslandModel(simulation, islands)
+    try:
+        best_agent, metrics_path = simulation.run_simulation(name)
+    finally:
+        profiler.stop()
+        PhaseProfiler.use(None)
+    profiler.export(results_dir / f"profile_it{it}_{Path(name).stem}.csv")
+    return {'profit': best_agent.profit, 'history': best_agent.sale_history}, metrics_path
 
 if __name__ == "__main__":
     argparser = argparse.ArgumentParser()
     argparser.add_argument("--config", "-c", help="Path to the configuration file", type=str, default="config/config1_0.json")
     argparser.add_argument("--test", "-t", help="should run estimation tests", action="store_true", default=False)
+    argparser.add_argument("--evaluate-estimators", help="compute estimator error metrics for the test configs", action="store_true", default=False)
+    argparser.add_argument("--plot", help="also plot the estimator error metrics", action="store_true", default=False)
+    argparser.add_argument("--online", help="evaluate the estimators fed one close price per day", action="store_true", default=False)
+    argparser.add_argument("--ewma", help="also evaluate the exponentially weighted estimator", action="store_true", default=False)
+    argparser.add_argument("--benchmark", "-b", help="run the offline benchmark suite", action="store_true", default=False)
+    argparser.add_argument("--baseline", help="benchmark JSON to compare the results with", type=str, default=None)
     argparser.add_argument("--iter", "-i", help="pass iteration number", type=int, default=0)
+    argparser.add_argument("--offline", help="use only locally stored prices, never download", action="store_true", default=False)
+    argparser.add_argument("--profile", help="record time spent in each phase of the run", action="store_true", default=False)
+    argparser.add_argument("--walk-forward", help="evolve on rolling train windows and replay the evolved plans on the following test windows", action="store_true", default=False)
+    argparser.add_argument("--resume", help="continue from the last checkpoint of this config and iteration", action="store_true", default=False)
 
     args = argparser.parse_args()
 
@@ -78,7 +139,44 @@ if __name__ == "__main__":
         est_test.run_tests()
         exit(0)
 
+    if args.evaluate_estimators:
+        from tests import EstimatorEvaluation
+
+        evaluation = EstimatorEvaluation(source=PriceStore(Path(__file__).parent / "data" / "prices", offline=args.offline),
+                                         online=args.online, ewma=args.ewma)
+        results = evaluation.run()
+        print(results.to_string(index=False))
+        print(f"Metrics written to {EstimatorEvaluation.write(results)}")
+        if args.plot:
+            print(f"Plot written to {EstimatorEvaluation.plot(results)}")
+        exit(0)
+
+    if args.benchmark:
+        from tests import Benchmark
+
+        report = Benchmark().run()
+        print(f"Benchmark written to {Benchmark.save(report, Path(__file__).parent / 'tests' / 'results' / 'benchmark.json')}")
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                comparison = Benchmark.compare(report, json.load(f))
+            for row in comparison:
+                print(f"{row['benchmark']} size={row['size']} tickers={row['tickers']} days={row['days']}: "
+                      f"{round(row['ratio'], 2)}x{' REGRESSION' if row['regression'] else ''}")
+            exit(1 if any(row['regression'] for row in comparison) else 0)
+        exit(0)
+
+    if args.walk_forward:
+        from Experiments import WalkForward
+
+        walk_forward = WalkForward(args.config, PriceStore(Path(__file__).parent / "data" / "prices", offline=args.offline))
+        results = walk_forward.run()
+        print(results.to_string(index=False))
+        for key, value in walk_forward.summary(results).items():
+            print(f"{key}: {round(value, 4)}")
+        print(f"Walk-forward results written to {walk_forward.write(results)}")
+        exit(0)
+
     main_dir = Path(__file__).parent
     DirectoryUtil.directory_exists(main_dir, "graphs", True)
     DirectoryUtil.directory_exists(main_dir, "csv_results", True)
-    main(args.config)
\ No newline at end of file
+    main(args.config, args.iter, offline=args.offline, resume=args.resume, profile=args.profile)
\ No newline at end of file
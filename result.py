@@ -1,55 +1,42 @@
-import json
-import matplotlib.pyplot as plt
+import argparse
 from pathlib import Path
-from Util import DirectoryUtil
+from Util import DirectoryUtil, ChartRenderer, ChartJob
+from Experiments import ExperimentRunner
 
-from main import main
 path = "configs"
-configs = Path(path)
 
-main_dir = Path(__file__).parent
-DirectoryUtil.directory_exists(main_dir, "graphs", True)
-for f in configs.glob("config1_0.json"):
-    for it in range(10):
-        print(str(f), f"test number {it}")
-        with open(f, "r", encoding="utf-8-sig") as conf:
-            cnf = json.load(conf)
-        start_asset = cnf["start_asset"]
-        best_agent, iteration_best_agent, best_agents_profit = main(path + "/" + f.name, it)
 
-        for stock, ops in best_agent['history'].items():
-            x = list(range(len(ops)))
-            y = [ops[0]]
-            for j in range(1, len(ops)):
-                y.append(ops[j] + y[j-1])
-            plt.plot(x, y, label=stock)
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--pattern", "-p", help="glob of config files in configs/", type=str, default="config1_0.json")
+    argparser.add_argument("--repetitions", "-r", help="number of runs of every config", type=int, default=10)
+    argparser.add_argument("--workers", "-w", help="number of worker processes (default: all cores)", type=int, default=None)
+    argparser.add_argument("--offline", help="use only locally stored prices, never download", action="store_true", default=False)
+    argparser.add_argument("--preview", help="one low resolution figure per run instead of three 300 dpi charts", action="store_true", default=False)
+    argparser.add_argument("--preview-format", help="preview file format", choices=ChartRenderer.PREVIEW_FORMATS, default="png")
+    argparser.add_argument("--chart-workers", help="number of chart rendering processes", type=int, default=1)
+    args = argparser.parse_args()
 
-        plt.title(f"Best agent profit - {round(best_agent['profit'] - start_asset, 2)}")
-        plt.xlabel("Day")
-        plt.ylabel("Number of stocks")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        sd = cnf["start_date"]
-        ed = cnf["end_date"]
+    configs = Path(path)
+    main_dir = Path(__file__).parent
+    DirectoryUtil.directory_exists(main_dir, "graphs", True)
+    # wykresy rysują osobne procesy, kolejne wyniki nie czekają na matplotlib
+    renderer = ChartRenderer(main_dir / "graphs", workers=args.chart_workers, preview=args.preview,
+                             preview_format=args.preview_format)
 
-        plt.savefig(f"graphs/best_agent_stocks{f.name}{sd}{ed}{it}.png", dpi=300)
-        plt.close()
+    runner = ExperimentRunner(
+        [path + "/" + f.name for f in sorted(configs.glob(args.pattern))],
+        repetitions=args.repetitions,
+        workers=args.workers,
+        offline=args.offline
+    )
 
-        plt.plot([i for i in range(len(iteration_best_agent))], iteration_best_agent)
-        plt.title(f"Each iteration's best agent's profit")
-        plt.xlabel("Iteration")
-        plt.ylabel("Profit")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(f"graphs/iterations_best_profit{f.name}{it}.png", dpi=300)
-        plt.close()
+    results = []
+    for result in runner.run():
+        print(f"{result.config_path} test number {result.it} finished in {round(result.wall_time, 2)} s")
+        renderer.submit(ChartJob.from_config(Path(result.config_path), result.it, result.best_agent, result.metrics_path))
+        results.append(result)
 
-        plt.plot([i for i in range(len(best_agents_profit))], best_agents_profit)
-        plt.title(f"Best agent's profit each iteration")
-        plt.xlabel("Iteration")
-        plt.ylabel("Profit")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(f"graphs/best_profit_per_iteration{f.name}{it}.png", dpi=300)
-        plt.close()
\ No newline at end of file
+    summary_path = ExperimentRunner.write_summary(results)
+    print(f"Summary written to {summary_path}")
+    print(f"{len(renderer.close())} charts written to {main_dir / 'graphs'}")
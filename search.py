@@ -0,0 +1,25 @@
+import argparse
+from Experiments import HyperparameterSearch
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--config", "-c", help="base configuration file", type=str, default="configs/config1_0.json")
+    argparser.add_argument("--min-iterations", help="iterations of every candidate on the first rung", type=int, default=100)
+    argparser.add_argument("--max-iterations", help="iterations of the candidates on the last rung", type=int, default=2700)
+    argparser.add_argument("--eta", help="1/eta of the candidates is promoted to the next rung", type=int, default=3)
+    argparser.add_argument("--candidates", "-n", help="number of sampled settings (default: eta^(rungs-1))", type=int, default=None)
+    argparser.add_argument("--repetitions", "-r", help="runs of every candidate on every rung", type=int, default=1)
+    argparser.add_argument("--workers", "-w", help="number of worker processes (default: all cores)", type=int, default=None)
+    argparser.add_argument("--seed", help="seed of the sampler and of the runs", type=int, default=0)
+    argparser.add_argument("--output", "-o", help="where to write the tuned config (default: <config>_tuned.json)", type=str, default=None)
+    argparser.add_argument("--offline", help="use only locally stored prices, never download", action="store_true", default=False)
+    args = argparser.parse_args()
+
+    search = HyperparameterSearch(args.config, min_iterations=args.min_iterations, max_iterations=args.max_iterations,
+                                  eta=args.eta, candidates=args.candidates, repetitions=args.repetitions,
+                                  workers=args.workers, seed=args.seed, offline=args.offline)
+    print(f"{search.candidates} candidates, budgets {search.budgets}")
+    best = search.run()
+    print(f"Search results written to {search.write_results()}")
+    print(f"Best settings (profit {round(best.score, 2)}) written to {search.write_config(best, args.output)}")
@@ -1,3 +1,5 @@
 from .estimators_test import EstimatorsTests
+from .benchmark import Benchmark
+from .estimator_evaluation import EstimatorEvaluation
 
-__all__ = ['EstimatorsTests']
\ No newline at end of file
+__all__ = ['EstimatorsTests', 'Benchmark', 'EstimatorEvaluation']
\ No newline at end of file
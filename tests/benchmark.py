@@ -0,0 +1,131 @@
+from Agent import Agent
+from Algorithm import GeneticAlgorithm, Genome
+from Simulation import Simulation, PopulationEvaluator
+from Stocks import StockUtility, StockUtilityFactory, Period, SyntheticPriceSource, PricePanel
+from Stocks.estimators import EstimatorBuilder, EstimatorStrategy
+from Util import DirectoryUtil
+from .test_config import BENCHMARK_GRID
+from datetime import date
+from itertools import product
+from pathlib import Path
+import json
+import platform
+import time
+import numpy as np
+import pandas as pd
+
+
+class Benchmark:
+    # Pomiary przepustowości na syntetycznych cenach (bez sieci). Wynik to JSON, który można
+    # porównać z zapisanym wcześniej plikiem bazowym.
+    START_DATE = date(2020, 1, 2)
+    START_ASSET = 10000
+    LOOKBACK_DAYS = 14
+    FORECAST_DAYS = 5
+
+    def __init__(self, grid: dict = BENCHMARK_GRID, repeats: int = 3, seed: int = 0):
+        self.grid = grid
+        self.repeats = repeats
+        self.seed = seed
+        self.source = SyntheticPriceSource(seed)
+
+    def run(self) -> dict:
+        previous_store = StockUtility._PRICE_STORE
+        StockUtility.use_price_store(self.source)
+        try:
+            results = []
+            for size, num_of_tickers, days in product(self.grid['sizes'], self.grid['tickers'], self.grid['days']):
+                print(f"Benchmark: size = {size}, tickers = {num_of_tickers}, days = {days}")
+                results += self.run_point(size, num_of_tickers, days)
+        finally:
+            StockUtility.use_price_store(previous_store)
+
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'processor': platform.processor()
+            },
+            'seed': self.seed,
+            'repeats': self.repeats,
+            'results': results
+        }
+
+    def run_point(self, size: int, num_of_tickers: int, days: int) -> list[dict]:
+        end_date = pd.bdate_range(self.START_DATE, periods=days + 1)[-1].date()
+        config = {
+            'start_date': self.START_DATE.isoformat(),
+            'end_date': end_date.isoformat(),
+            'forecast_days': self.FORECAST_DAYS,
+            'lookback_days': self.LOOKBACK_DAYS
+        }
+        factory = StockUtilityFactory(EstimatorStrategy.MAXIMUM_LIKELIHOOD, config)
+        stocks = [(f"SYN{i}", factory.create_stock_utilty(f"SYN{i}")) for i in range(num_of_tickers)]
+        historical_prices = PricePanel.load([ticker for ticker, _ in stocks], Period(self.START_DATE, end_date), self.source)
+
+        def point(benchmark: str, seconds: float, items: int) -> dict:
+            return {'benchmark': benchmark, 'size': size, 'tickers': num_of_tickers, 'days': days,
+                    'seconds': seconds, 'throughput': items / seconds}
+
+        results = []
+        close = historical_prices[stocks[0][0]]
+        for strategy in EstimatorStrategy:
+            estimator = EstimatorBuilder.create_builder().with_startegy(strategy).build()
+            seconds = self.time(lambda: estimator.estimate_windows(close, self.LOOKBACK_DAYS, self.FORECAST_DAYS))
+            results.append(point(f"estimator_{strategy.name.lower()}", seconds, len(close) - self.LOOKBACK_DAYS + 1))
+
+        warm_start = lambda: Genome.warm_start_population(
+            stocks=stocks, historical_prices=historical_prices, start_asset=self.START_ASSET,
+            max_actions_per_day_bought=3, max_actions_per_day_sold=3, simulation_length=days, size=size,
+            rng=np.random.default_rng(self.seed)
+        )
+        results.append(point('warm_start', self.time(warm_start), size))
+        population = warm_start()
+
+        evaluator = PopulationEvaluator.from_historical_prices(historical_prices, population.tickers, days, self.START_ASSET)
+        results.append(point('evaluate', self.time(lambda: evaluator.evaluate(population.actions)), size))
+        evaluator.evaluate_population(population)
+
+        agents = [Agent(population=population.take([i])) for i in range(min(size, 50))]
+        execute = lambda: [agent.execute(historical_prices, self.START_ASSET) for agent in agents]
+        results.append(point('agent_execute', self.time(execute), len(agents)))
+
+        GA = GeneticAlgorithm(seed=self.seed)
+        results.append(point('evolve', self.time(lambda: GA.evolve(population)), size))
+
+        simulation = Simulation(population, stocks, self.START_ASSET, self.repeats, GeneticAlgorithm(seed=self.seed),
+                                historical_prices, 0, report_interval=0)
+        results.append(point('simulation_step', self.time(simulation.step), 1))
+        return results
+
+    def time(self, func) -> float:
+        # najlepszy z kilku pomiarów, najmniej zaszumiony przez resztę systemu
+        best = float('inf')
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    @staticmethod
+    def save(report: dict, path: Path) -> Path:
+        path = Path(path)
+        DirectoryUtil.directory_exists(path.parent.parent, path.parent.name, True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return path
+
+    @staticmethod
+    def compare(report: dict, baseline: dict, tolerance: float = 0.2) -> list[dict]:
+        # regresja: przepustowość spadła o więcej niż tolerance względem pliku bazowego
+        key = lambda result: (result['benchmark'], result['size'], result['tickers'], result['days'])
+        reference = {key(result): result for result in baseline['results']}
+        comparison = []
+        for result in report['results']:
+            if key(result) not in reference:
+                continue
+            ratio = result['throughput'] / reference[key(result)]['throughput']
+            comparison.append({**dict(zip(('benchmark', 'size', 'tickers', 'days'), key(result))),
+                               'ratio': ratio, 'regression': ratio < 1 - tolerance})
+        return comparison
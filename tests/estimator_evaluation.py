@@ -0,0 +1,124 @@
+from Stocks import Period, PriceStore, EstimationConfig
+from Stocks.estimators import EstimatorBuilder, EstimatorStrategy, OnlineEstimator, EwmaEstimator
+from Util import DirectoryUtil
+from .test_config import TEST_ESTIMATOR_CONFIGS
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import product
+from pathlib import Path
+from typing import Sequence
+import numpy as np
+import pandas as pd
+
+
+def error_metrics(close_prices: np.ndarray, estimated_prices: np.ndarray, lookback_days: int) -> dict:
+    # okno i to close_prices[i:i+lookback_days], prognozowane są kolejne forecast_days cen;
+    # liczone są tylko okna, dla których cała prognoza ma już znane ceny
+    forecast_days = estimated_prices.shape[1]
+    targets = np.lib.stride_tricks.sliding_window_view(close_prices[lookback_days:], forecast_days)
+    num_of_windows = min(len(targets), len(estimated_prices))
+    targets, estimated_prices = targets[:num_of_windows], estimated_prices[:num_of_windows]
+    last_prices = close_prices[lookback_days - 1:lookback_days - 1 + num_of_windows, np.newaxis]
+
+    errors = estimated_prices - targets
+    return {
+        'windows': num_of_windows,
+        'mse': float(np.mean(errors ** 2)) if num_of_windows else np.nan,
+        'mae': float(np.mean(np.abs(errors))) if num_of_windows else np.nan,
+        'hit_rate': float(np.mean(np.sign(estimated_prices - last_prices) == np.sign(targets - last_prices)))
+                    if num_of_windows else np.nan
+    }
+
+
+EWMA = 'EWMA'
+
+
+def _evaluate(job: tuple) -> dict:
+    # online: prognozy z estymatora strumieniowego, który dostaje jedną cenę dziennie;
+    # EWMA nie ma wersji wsadowej, więc zawsze jest liczony strumieniowo z halflife = lookback_days
+    strategy, config_idx, config, ticker, close_prices, online = job
+    lookback_days = config['lookback_days']
+    if strategy == EWMA:
+        result = EwmaEstimator(lookback_days, config['forecast_days']).estimate_stream(close_prices, lookback_days)
+    else:
+        estimator = EstimatorBuilder.create_builder().with_startegy(strategy).build()
+        if online:
+            result = OnlineEstimator.for_estimator(estimator, lookback_days, config['forecast_days']).estimate_stream(
+                close_prices, lookback_days)
+        else:
+            result = estimator.estimate_windows(close_prices, lookback_days, config['forecast_days'])
+    return {
+        'strategy': strategy if strategy == EWMA else strategy.name,
+        'online': online or strategy == EWMA,
+        'config': config_idx,
+        'ticker': ticker,
+        'lookback_days': lookback_days,
+        'forecast_days': config['forecast_days'],
+        **error_metrics(close_prices, result.estimated_prices, lookback_days)
+    }
+
+
+class EstimatorEvaluation:
+    # Bezgłowa wersja EstimatorsTests: metryki błędu dla wszystkich okien naraz,
+    # kombinacje strategia x konfiguracja x ticker liczone równolegle, wynik w jednej tabeli
+    def __init__(self, configs: Sequence[dict] = tuple(TEST_ESTIMATOR_CONFIGS), tickers: Sequence[str] = ('AAPL',),
+                 strategies: Sequence[EstimatorStrategy] = tuple(EstimatorStrategy), workers: int | None = None,
+                 source=None, online: bool = False, ewma: bool = False):
+        self.configs = list(configs)
+        self.tickers = list(tickers)
+        self.strategies = list(strategies)
+        self.workers = workers
+        self.online = online
+        self.ewma = ewma
+        self.source = PriceStore(Path(__file__).parent.parent / "data" / "prices") if source is None else source
+
+    def jobs(self) -> list[tuple]:
+        # ceny pobierane raz na (konfiguracja, ticker), razem z lookback_days sesjami przed start_date,
+        # więc pierwsze okno kończy się ostatnią sesją przed start_date, jak w StockUtility.estimation_windows
+        prices = {}
+        for (config_idx, config), ticker in product(enumerate(self.configs), self.tickers):
+            start = date.fromisoformat(config['start_date'])
+            period = Period(EstimationConfig.history_start(start, config['lookback_days']),
+                            date.fromisoformat(config['end_date']))
+            close = self.source.get_close_prices(ticker, period)
+            dates = pd.DatetimeIndex(close.index).tz_localize(None).values.astype('datetime64[D]')
+            first = int(np.searchsorted(dates, np.datetime64(start, 'D'))) - config['lookback_days']
+            prices[config_idx, ticker] = close.to_numpy(dtype=np.float64)[max(first, 0):]
+
+        strategies = self.strategies + [EWMA] if self.ewma else self.strategies
+        return [
+            (strategy, config_idx, config, ticker, prices[config_idx, ticker], self.online)
+            for strategy, (config_idx, config), ticker in product(strategies, enumerate(self.configs), self.tickers)
+        ]
+
+    def run(self) -> pd.DataFrame:
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            rows = list(executor.map(_evaluate, self.jobs()))
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def write(results: pd.DataFrame, filename: str = "estimator_metrics.csv") -> Path:
+        path = Path(__file__).parent
+        DirectoryUtil.directory_exists(path, "results", True)
+        results.to_csv(path / "results" / filename, index=False)
+        return path / "results" / filename
+
+    @staticmethod
+    def plot(results: pd.DataFrame, filename: str = "estimator_metrics.png") -> Path:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        metrics = ['mse', 'mae', 'hit_rate']
+        fig, axes = plt.subplots(1, len(metrics), figsize=(6 * len(metrics), 5))
+        for ax, metric in zip(axes, metrics):
+            results.pivot_table(index='config', columns='strategy', values=metric).plot.bar(ax=ax)
+            ax.set_title(metric)
+            ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+
+        path = Path(__file__).parent
+        DirectoryUtil.directory_exists(path, "results", True)
+        fig.savefig(path / "results" / filename)
+        plt.close(fig)
+        return path / "results" / filename
@@ -0,0 +1,41 @@
+from datetime import date
+import numpy as np
+
+from Agent import Population
+from Algorithm import FeasibilityRepair
+from Simulation import PopulationEvaluator
+from Stocks import PricePanel, Period, SyntheticPriceSource
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+START_ASSET = 10_000.0
+GA_CONFIG = {
+    'children_ratio': 0.3,
+    'crossover_imbalance': 0.25,
+    'float_mutation_variance': 0.1,
+    'rotation_size_variance': 1,
+    'rotation_shift_variance': 1,
+    'mutate_change_chance': 0.5,
+    'mutate_rotate_chance': 0.5,
+    'crossover_point_amount': 2,
+    'crossover_point_chance': 0.5
+}
+
+
+def synthetic_panel() -> PricePanel:
+    return PricePanel.load(TICKERS, Period(date(2020, 1, 1), date(2020, 7, 1)), SyntheticPriceSource(0))
+
+
+def random_actions(rng: np.random.Generator, size: int, num_of_days: int) -> np.ndarray:
+    # rzadkie zakupy i sprzedaże, część planów łamie ograniczenia
+    actions = rng.integers(-3, 6, (size, len(TICKERS), num_of_days))
+    actions[rng.random(actions.shape) < 0.8] = 0
+    return actions
+
+
+def initial_population(panel: PricePanel, size: int) -> Population:
+    # agenci z dodatnim zyskiem po naprawie, jak po warm starcie
+    repair = FeasibilityRepair.from_historical_prices(panel, TICKERS, len(panel), START_ASSET)
+    actions = repair.repair(random_actions(np.random.default_rng(0), size, len(panel)))
+    population = Population(TICKERS, actions)
+    PopulationEvaluator.from_historical_prices(panel, TICKERS, len(panel), START_ASSET).evaluate_population(population)
+    return population
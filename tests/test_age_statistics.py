@@ -0,0 +1,47 @@
+import statistics
+import numpy as np
+import pytest
+
+from Algorithm import AgeStatistics
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_statistics_module(seed):
+    rng = np.random.default_rng(seed)
+    batches = [rng.integers(0, 150, rng.integers(0, 40)) for _ in range(30)]
+    ages = AgeStatistics()
+    for batch in batches:
+        ages.add(batch)
+    values = np.concatenate(batches).tolist()
+
+    assert len(ages) == len(values)
+    assert ages.mean == statistics.mean(values) and type(ages.mean) is type(statistics.mean(values))
+    assert ages.median == statistics.median(values)
+    assert ages.variance == pytest.approx(statistics.variance(values), rel=1e-12)
+    assert ages.running_mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+
+
+def test_merge_equals_single_run():
+    rng = np.random.default_rng(0)
+    parts = [rng.integers(0, 300, size) for size in (1, 17, 0, 250)]
+    merged = AgeStatistics()
+    for part in parts:
+        island = AgeStatistics()
+        island.add(part)
+        merged.merge(island)
+    single = AgeStatistics()
+    single.add(np.concatenate(parts))
+
+    assert (merged.count, merged.mean, merged.median) == (single.count, single.mean, single.median)
+    np.testing.assert_array_equal(merged.histogram[:len(single.histogram)], single.histogram)
+    assert merged.variance == pytest.approx(single.variance, rel=1e-12)
+
+
+def test_even_count_median_and_empty():
+    ages = AgeStatistics()
+    with pytest.raises(ValueError):
+        ages.median
+    with pytest.raises(ValueError):
+        ages.mean
+    ages.add(np.array([1, 2, 3, 10]))
+    assert (ages.median, ages.mean) == (2.5, 4)
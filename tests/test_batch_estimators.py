@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from Stocks.estimators.stock_price_estimator import (LeastSqaureMethodEstimator, MethodOfMomentsEstimator,
+                                                     MaximumLikelihoodEstimator)
+
+FUTURE_DAYS = 10
+
+
+# wzory sprzed estymacji wsadowej, liczone osobno dla każdego okna
+def least_square_method(close_prices: np.ndarray) -> tuple[np.ndarray, tuple[float, float]]:
+    n = len(close_prices)
+    X = np.linspace(0, 1, n).reshape(-1, 1)
+    X_with_intercept = np.hstack([np.ones((n, 1)), X])
+    coefficients = np.linalg.inv(X_with_intercept.T @ X_with_intercept) @ X_with_intercept.T @ close_prices.reshape(-1, 1)
+    a, b = coefficients[0, 0], coefficients[1, 0]
+    return (a + b * np.linspace(1, 1 + FUTURE_DAYS / n, FUTURE_DAYS)), (a, b)
+
+
+def method_of_moments(close_prices: np.ndarray) -> tuple[np.ndarray, tuple[float, float]]:
+    returns = np.diff(close_prices) / close_prices[:-1]
+    mu, sigma = np.mean(returns), np.std(returns)
+    return np.array([close_prices[-1] * (1 + mu) ** day for day in range(1, FUTURE_DAYS + 1)]), (mu, sigma)
+
+
+def maximum_likelihood(close_prices: np.ndarray) -> tuple[np.ndarray, tuple[float, float]]:
+    log_returns = np.diff(np.log(close_prices))
+    mu, sigma = np.mean(log_returns), np.std(log_returns)
+    return close_prices[-1] * np.exp(mu * np.arange(1, FUTURE_DAYS + 1)), (mu, sigma)
+
+
+ESTIMATORS = [
+    (LeastSqaureMethodEstimator, least_square_method),
+    (MethodOfMomentsEstimator, method_of_moments),
+    (MaximumLikelihoodEstimator, maximum_likelihood)
+]
+
+
+@pytest.fixture(scope='module')
+def close_prices() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, 3000)))
+
+
+@pytest.mark.parametrize('estimator, per_window', ESTIMATORS)
+@pytest.mark.parametrize('lookback_days', [5, 30, 250])
+def test_batch_matches_per_window_estimation(close_prices, estimator, per_window, lookback_days):
+    batch = estimator().estimate_windows(close_prices, lookback_days, FUTURE_DAYS)
+    expected = [per_window(close_prices[i:i + lookback_days]) for i in range(len(close_prices) - lookback_days + 1)]
+    predictions = np.array([prediction for prediction, _ in expected])
+    coefficients = np.array([coefficient for _, coefficient in expected])
+
+    assert len(batch) == len(expected)
+    np.testing.assert_allclose(batch.estimated_prices, predictions, rtol=1e-13)
+    # nachylenie bliskie zeru porównywane względem skali współczynników okna
+    scale = np.abs(coefficients).max(axis=1, keepdims=True)
+    assert np.all(np.abs(batch.equation_coefficients - coefficients) <= 1e-13 * scale)
+
+
+@pytest.mark.parametrize('estimator, per_window', ESTIMATORS)
+def test_single_window_and_short_series(close_prices, estimator, per_window):
+    window = close_prices[:30]
+    result = estimator().estimate_from_historic(window, FUTURE_DAYS)
+    np.testing.assert_allclose(result.estimated_prices, per_window(window)[0], rtol=1e-13)
+    assert len(estimator().estimate_windows(close_prices[:20], 30, FUTURE_DAYS)) == 0
+    assert len(estimator().estimate_windows(close_prices[:100], 30, FUTURE_DAYS, num_of_windows=5)) == 5
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from Agent import Population
+from Algorithm import GeneticAlgorithm, FeasibilityRepair
+from Simulation import Simulation, SimulationCheckpoint, StoppingSettings, FitnessSettings
+from Stocks import PricePanel
+from .synthetic_market import TICKERS, START_ASSET, GA_CONFIG, synthetic_panel, initial_population
+
+NUM_OF_ITERATIONS = 40
+CHECKPOINT_ITERATION = 12
+
+
+@pytest.fixture(scope='module')
+def panel() -> PricePanel:
+    return synthetic_panel()
+
+
+def create_simulation(panel: PricePanel, population: Population, fitness_cache_size: int, fitness: str,
+                      stopping: StoppingSettings) -> Simulation:
+    GA = GeneticAlgorithm({**GA_CONFIG, 'repair': True}, seed=3)
+    GA.use_repair(FeasibilityRepair.from_historical_prices(panel, TICKERS, len(panel), START_ASSET))
+    return Simulation(population.take(slice(None)), [], START_ASSET, NUM_OF_ITERATIONS, GA, panel, 0,
+                      fitness_cache_size=fitness_cache_size, stopping=stopping,
+                      fitness_function=FitnessSettings(function=fitness).create())
+
+
+def simulated(simulation: Simulation) -> tuple[int, int]:
+    return simulation.evaluator.simulated_day_steps, simulation.evaluator.curve_day_steps
+
+
+def run(simulation: Simulation, checkpoint_path=None) -> tuple[int, int]:
+    # pętla run_simulation bez plików z metrykami: punkt kontrolny po kroku, potem kryteria stopu;
+    # zwraca liczniki symulowanych dni z chwili zapisu punktu kontrolnego
+    stopping = simulation.early_stopping()
+    at_checkpoint = (0, 0)
+    while simulation.iteration < simulation.num_of_iterations:
+        simulation.step()
+        if checkpoint_path is not None and simulation.iteration == CHECKPOINT_ITERATION:
+            SimulationCheckpoint.capture(simulation).save(checkpoint_path)
+            at_checkpoint = simulated(simulation)
+        if stopping.update(simulation.iteration, simulation.best_profit, simulation.evaluator.evaluations):
+            break
+    return at_checkpoint
+
+
+@pytest.mark.parametrize('fitness_cache_size, fitness, stopping', [
+    (1000, 'final_value', StoppingSettings()),
+    (0, 'drawdown', StoppingSettings()),
+    (0, 'final_value', StoppingSettings(min_relative_improvement=0.002, improvement_window=15)),
+    (0, 'risk_adjusted', StoppingSettings(max_evaluations=450))
+])
+def test_resume_matches_uninterrupted_run(panel, tmp_path, fitness_cache_size, fitness, stopping):
+    population = initial_population(panel, 40)
+    path = tmp_path / 'checkpoint.npz'
+
+    uninterrupted = create_simulation(panel, population, fitness_cache_size, fitness, stopping)
+    at_checkpoint = run(uninterrupted, path)
+    resumed = create_simulation(panel, population, fitness_cache_size, fitness, stopping)
+    SimulationCheckpoint.load(path).restore(resumed)
+    run(resumed)
+
+    assert CHECKPOINT_ITERATION < uninterrupted.iteration
+    assert resumed.iteration == uninterrupted.iteration
+    np.testing.assert_array_equal(resumed.population.actions, uninterrupted.population.actions)
+    np.testing.assert_array_equal(resumed.population.profits, uninterrupted.population.profits)
+    np.testing.assert_array_equal(resumed.population.ages, uninterrupted.population.ages)
+    np.testing.assert_array_equal(resumed.fitness, uninterrupted.fitness)
+    assert resumed.best_profit == uninterrupted.best_profit
+    assert resumed.best_profit_idx == uninterrupted.best_profit_idx
+    # wznowienie nie symuluje ponownie genomów ocenionych przed przerwą
+    assert resumed.evaluator.evaluations == uninterrupted.evaluator.evaluations
+    assert simulated(resumed) == tuple(np.subtract(simulated(uninterrupted), at_checkpoint))
+    assert resumed.fitness_function.cache.hits == uninterrupted.fitness_function.cache.hits
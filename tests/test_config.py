@@ -35,4 +35,10 @@ TEST_ESTIMATOR_CONFIGS = [
         'forecast_days': 67,
         'lookback_days': 12
     },
-]
\ No newline at end of file
+]
+
+BENCHMARK_GRID = {
+    'sizes': [100, 1000],
+    'tickers': [3, 10],
+    'days': [100, 250]
+}
\ No newline at end of file
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Algorithm import GeneticAlgorithm
+from Simulation import Simulation, StoppingSettings, EarlyStopping
+from Stocks import PricePanel
+from .synthetic_market import START_ASSET, GA_CONFIG, synthetic_panel, initial_population
+
+
+@pytest.fixture(scope='module')
+def panel() -> PricePanel:
+    return synthetic_panel()
+
+
+def stopped_at(settings: StoppingSettings, net_profits, evaluations=None, diversity=None) -> tuple[int | None, str]:
+    stopping = EarlyStopping(settings, START_ASSET)
+    for iteration, net_profit in enumerate(net_profits, start=1):
+        if stopping.update(iteration, START_ASSET + net_profit, 0 if evaluations is None else evaluations[iteration - 1],
+                           None if diversity is None else diversity[iteration - 1]):
+            return iteration, stopping.reason
+    return None, stopping.reason
+
+
+def test_patience_counts_iterations_since_last_improvement():
+    profits = [10, 20, 30, 30, 30, 40, 40, 40, 40, 40]
+    assert stopped_at(StoppingSettings(patience=3), profits) == (9, EarlyStopping.PATIENCE)
+    assert stopped_at(StoppingSettings(patience=3), range(10)) == (None, EarlyStopping.MAX_ITERATIONS)
+    assert stopped_at(StoppingSettings(), [0] * 10) == (None, EarlyStopping.MAX_ITERATIONS)
+
+
+def test_min_relative_improvement_over_window():
+    # zysk rośnie o 10 do iteracji 20, potem stoi
+    profits = [10 * min(iteration, 20) for iteration in range(1, 60)]
+    settings = StoppingSettings(min_relative_improvement=0.01, improvement_window=10)
+    assert stopped_at(settings, profits) == (30, EarlyStopping.MIN_IMPROVEMENT)
+    # poprawa 5% na okno 10 iteracji wystarcza przy progu 1%, ale nie przy 10%
+    growing = [100 * 1.005 ** iteration for iteration in range(1, 60)]
+    assert stopped_at(settings, growing)[0] is None
+    assert stopped_at(StoppingSettings(min_relative_improvement=0.1, improvement_window=10), growing) == \
+        (11, EarlyStopping.MIN_IMPROVEMENT)
+
+
+def test_diversity_and_budgets():
+    actions = np.zeros((4, 2, 5), dtype=np.int16)
+    actions[1, 0, 0] = 1
+    assert EarlyStopping.diversity(actions) == 0.5
+    settings = StoppingSettings(min_diversity=0.6, diversity_interval=5)
+    assert [EarlyStopping(settings, START_ASSET).needs_diversity(i) for i in range(1, 11)] == [False] * 4 + [True] + [False] * 4 + [True]
+    assert stopped_at(settings, [0] * 10, diversity=[None] * 4 + [0.5] + [None] * 5) == (5, EarlyStopping.DIVERSITY)
+
+    assert stopped_at(StoppingSettings(max_evaluations=100), [0] * 10, evaluations=np.arange(1, 11) * 30) == \
+        (4, EarlyStopping.EVALUATION_BUDGET)
+    # czas sprzed wznowienia wlicza się do budżetu
+    stopping = EarlyStopping(StoppingSettings(max_seconds=10), START_ASSET, elapsed=11)
+    assert stopping.elapsed >= 11
+    assert stopping.update(1, START_ASSET, 0) and stopping.reason == EarlyStopping.TIME_BUDGET
+
+
+def test_simulation_reports_stop_reason(panel, tmp_path):
+    GA = GeneticAlgorithm(GA_CONFIG, seed=0)
+    simulation = Simulation(initial_population(panel, 30), [], START_ASSET, 500, GA, panel, 0, report_interval=0,
+                            stopping=StoppingSettings(patience=5), results_dir=tmp_path)
+    simulation.run_simulation('stopping.json')
+
+    stats = pd.read_csv(tmp_path / 'results_stats0_stopping.csv', index_col=0)
+    metrics = pd.read_csv(tmp_path / 'results_it0_stopping.csv', index_col=0)
+    assert stats['stop_reason'][0] == EarlyStopping.PATIENCE
+    assert stats['iterations'][0] == simulation.iteration == len(metrics) < 500
+    assert simulation.iteration - 1 - simulation.best_profit_idx == 5
@@ -0,0 +1,92 @@
+from datetime import date
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from Stocks import EstimationCache, PriceStore, Period
+from Stocks.estimators import BatchEstimationResult
+from Stocks.estimators.stock_price_estimator import LeastSqaureMethodEstimator, MethodOfMomentsEstimator
+
+
+def result(seed: int, windows: int = 100) -> BatchEstimationResult:
+    rng = np.random.default_rng(seed)
+    return BatchEstimationResult(rng.normal(size=(windows, 5)), rng.normal(size=(windows, 2)))
+
+
+def key(ticker: str, close_prices: np.ndarray, estimator=LeastSqaureMethodEstimator(), lookback_days: int = 10) -> str:
+    dates = np.datetime64('2020-01-01') + np.arange(len(close_prices))
+    return EstimationCache.key(ticker, estimator, lookback_days, 5, 100, dates, close_prices)
+
+
+def test_entry_round_trip_and_key_fingerprint(tmp_path):
+    cache = EstimationCache(tmp_path)
+    prices = np.linspace(100, 110, 120)
+    assert cache.get(key('AAA', prices)) is None
+    cache.put(key('AAA', prices), result(0))
+    cached = cache.get(key('AAA', prices))
+
+    np.testing.assert_array_equal(cached.estimated_prices, result(0).estimated_prices)
+    np.testing.assert_array_equal(cached.equation_coefficients, result(0).equation_coefficients)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # inne ceny, estymator albo okno to inny wpis
+    changed = prices.copy()
+    changed[-1] += 0.01
+    assert len({key('AAA', prices), key('AAA', changed), key('BBB', prices),
+                key('AAA', prices, MethodOfMomentsEstimator()), key('AAA', prices, lookback_days=11)}) == 5
+    assert cache.get(key('AAA', changed)) is None
+
+
+def test_refreshed_prices_invalidate_only_that_ticker(tmp_path, monkeypatch):
+    def fetch(ticker, start, end):
+        days = pd.bdate_range(str(start), str(end), inclusive='left').values.astype('datetime64[D]')
+        return days, np.ones(len(days))
+
+    monkeypatch.setattr(PriceStore, '_fetch', staticmethod(fetch))
+    cache = EstimationCache(tmp_path / 'estimations')
+    store = PriceStore(tmp_path / 'prices')
+    store.refresh_listeners.append(cache.invalidate)
+    prices = np.ones(120)
+    for ticker in ('AAA', 'AA', 'BBB'):
+        cache.put(key(ticker, prices), result(0))
+
+    store.get_close_prices('AAA', Period(date(2020, 1, 1), date(2020, 2, 1)))
+
+    assert cache.get(key('AAA', prices)) is None
+    assert cache.get(key('AA', prices)) is not None and cache.get(key('BBB', prices)) is not None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry_bytes = 2 * 128 + 100 * 7 * 8
+    cache = EstimationCache(tmp_path, max_bytes=int(2.5 * entry_bytes))
+    keys = [key(ticker, np.ones(120)) for ticker in ('AAA', 'BBB')]
+    for i, entry in enumerate(keys):
+        cache.put(entry, result(i))
+        os.utime(tmp_path / f'{entry}.prices.npy', (1_000 + i, 1_000 + i))
+    # odczyt odświeża wpis, więc usuwany jest BBB
+    cache.get(keys[0])
+    cache.put(key('CCC', np.ones(120)), result(2))
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert sum(path.stat().st_size for path in tmp_path.glob('*.npy')) <= cache.max_bytes
+
+
+def test_entry_removed_while_reading_is_still_a_hit(tmp_path, monkeypatch):
+    cache = EstimationCache(tmp_path)
+    entry = key('AAA', np.ones(120))
+    cache.put(entry, result(0))
+    load = np.load
+
+    def load_then_invalidate(path, *args, **kwargs):
+        # inny proces usuwa wpis zaraz po wczytaniu
+        values = load(path, *args, **kwargs)
+        if str(path).endswith('.coefficients.npy'):
+            cache.invalidate('AAA')
+        return values
+
+    monkeypatch.setattr(np, 'load', load_then_invalidate)
+    cached = cache.get(entry)
+
+    np.testing.assert_array_equal(cached.estimated_prices, result(0).estimated_prices)
+    assert cache.hits == 1 and not any(tmp_path.iterdir())
@@ -0,0 +1,21 @@
+from datetime import date
+import numpy as np
+
+from Stocks import SyntheticPriceSource, Period
+from .estimator_evaluation import EstimatorEvaluation
+
+
+def test_first_window_ends_before_start_date():
+    source = SyntheticPriceSource(0)
+    configs = [{'start_date': '2020-03-02', 'end_date': '2020-06-01', 'forecast_days': 5, 'lookback_days': lookback_days}
+               for lookback_days in (10, 60)]
+    evaluation = EstimatorEvaluation(configs, tickers=('AAA',), source=source)
+
+    for job in evaluation.jobs():
+        _, _, config, _, close_prices, _ = job
+        lookback_days = config['lookback_days']
+        expected = source.get_close_prices('AAA', Period(date(2019, 1, 1), date(2020, 6, 1)))
+        first = int(np.searchsorted(expected.index, np.datetime64('2020-03-02')))
+        assert len(close_prices) == len(expected) - first + lookback_days
+        np.testing.assert_array_equal(close_prices, expected.to_numpy()[first - lookback_days:])
+    assert EstimatorEvaluation(source=source).tickers == ['AAPL']
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from Algorithm import GeneticAlgorithm, FeasibilityRepair
+from Simulation import PopulationEvaluator
+from Stocks import PricePanel
+from .synthetic_market import TICKERS, START_ASSET, GA_CONFIG, synthetic_panel, random_actions, initial_population
+
+
+@pytest.fixture(scope='module')
+def panel() -> PricePanel:
+    return synthetic_panel()
+
+
+def test_repair_output_is_feasible(panel):
+    actions = random_actions(np.random.default_rng(2), 200, len(panel))
+    repair = FeasibilityRepair.from_historical_prices(panel, TICKERS, len(panel), START_ASSET)
+    evaluator = PopulationEvaluator.from_historical_prices(panel, TICKERS, len(panel), START_ASSET)
+    infeasible = evaluator.simulate(actions).infeasible
+    original = actions.copy()
+
+    repaired = repair.repair(actions)
+
+    assert infeasible.any()
+    assert not evaluator.simulate(repaired).infeasible.any()
+    assert not repair.infeasible(repaired).any()
+    np.testing.assert_array_equal(repaired[~infeasible], original[~infeasible])
+    assert repair.infeasible_rate_after == 0
+
+
+def test_evolved_children_are_feasible(panel):
+    GA = GeneticAlgorithm({**GA_CONFIG, 'repair': True}, seed=4)
+    repair = FeasibilityRepair.from_historical_prices(panel, TICKERS, len(panel), START_ASSET)
+    GA.use_repair(repair)
+    evaluator = PopulationEvaluator.from_historical_prices(panel, TICKERS, len(panel), START_ASSET)
+    population = initial_population(panel, 60)
+    for _ in range(10):
+        population = GA.evolve(population)
+        evaluator.evaluate_population(population, GA.parents)
+        assert not evaluator.simulate(population.actions).infeasible.any()
+    assert repair.infeasible_rate_before > 0
+    assert repair.infeasible_rate_after == 0
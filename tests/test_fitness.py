@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from Agent import Population
+from Simulation import PopulationEvaluator, FitnessSettings
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+START_ASSET = 1e6
+
+
+def population_and_prices() -> tuple[Population, np.ndarray]:
+    rng = np.random.default_rng(0)
+    prices = np.exp(rng.normal(4, 0.1, (len(TICKERS), 100)))
+    actions = np.zeros((200, len(TICKERS), 100), dtype=np.int16)
+    actions[:, :, ::7] = rng.integers(0, 2, (200, len(TICKERS), 15))
+    actions[100:, :, 3::7] = -rng.integers(0, 2, (100, len(TICKERS), 14))
+    # klony
+    actions[1] = actions[0]
+    actions[5] = actions[2]
+    return Population(TICKERS, actions), prices
+
+
+@pytest.mark.parametrize('function', ['risk_adjusted', 'drawdown', 'turnover'])
+def test_chunked_and_cached_fitness_matches_single_pass(function):
+    population, prices = population_and_prices()
+    evaluator = PopulationEvaluator(prices, START_ASSET, chunk_size=7)
+    evaluator.evaluate_population(population)
+    day_steps, simulated_day_steps = evaluator.day_steps, evaluator.simulated_day_steps
+    fitness_function = FitnessSettings.from_json({'function': function}).create()
+
+    fitness = fitness_function.evaluate(evaluator, population)
+    again = fitness_function.evaluate(evaluator, population)
+
+    feasible = population.profits > 0
+    single_pass = PopulationEvaluator(prices, START_ASSET)
+    state = single_pass.simulate(population.actions[feasible])
+    expected = np.maximum(fitness_function.from_curves(single_pass, population.actions[feasible], state,
+                                                        single_pass.equity_curves(state)), 0)
+    np.testing.assert_array_equal(fitness[feasible], expected)
+    np.testing.assert_array_equal(again, fitness)
+    assert (fitness[~feasible] == 0).all()
+    # klony i drugie wywołanie nie są symulowane ponownie, a liczniki zysku się nie zmieniają
+    assert evaluator.curve_evaluations == len(np.unique(population.actions[feasible], axis=0))
+    assert (evaluator.day_steps, evaluator.simulated_day_steps) == (day_steps, simulated_day_steps)
+
+
+def test_final_value_fitness_is_profit():
+    population, prices = population_and_prices()
+    evaluator = PopulationEvaluator(prices, START_ASSET)
+    evaluator.evaluate_population(population)
+    np.testing.assert_array_equal(FitnessSettings().create().evaluate(evaluator, population), population.profits)
+    assert evaluator.curve_evaluations == 0
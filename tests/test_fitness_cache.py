@@ -0,0 +1,42 @@
+import numpy as np
+
+from Simulation import PopulationEvaluator, FitnessCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FitnessCache(max_size=2)
+    keys = cache.keys(np.arange(3 * 4, dtype=np.int16).reshape(3, 2, 2))
+    cache.put(keys[0], 1.0)
+    cache.put(keys[1], 2.0)
+    assert cache.get(keys[0]) == 1.0
+    cache.put(keys[2], 3.0)
+
+    assert cache.get(keys[1]) is None
+    assert (cache.get(keys[0]), cache.get(keys[2])) == (1.0, 3.0)
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_key_depends_only_on_content():
+    actions = np.arange(8, dtype=np.int16).reshape(2, 4)
+    assert FitnessCache.key(actions) == FitnessCache.key(actions.copy())
+    assert FitnessCache.key(actions) == FitnessCache.key(np.asfortranarray(actions))
+    changed = actions.copy()
+    changed[1, 3] += 1
+    assert FitnessCache.key(actions) != FitnessCache.key(changed)
+
+
+def test_clones_and_cached_genomes_are_not_simulated():
+    rng = np.random.default_rng(0)
+    prices = np.exp(rng.normal(4, 0.1, (2, 30)))
+    actions = rng.integers(0, 2, (6, 2, 30)).astype(np.int16)
+    actions[3] = actions[0]
+    evaluator = PopulationEvaluator(prices, 1e6, cache=FitnessCache())
+
+    profits = evaluator.evaluate(actions)
+    assert evaluator.evaluations == 5
+    np.testing.assert_array_equal(profits, PopulationEvaluator(prices, 1e6).simulate(actions).profit)
+
+    again = evaluator.evaluate(actions[::-1].copy())
+    assert evaluator.evaluations == 5
+    np.testing.assert_array_equal(again, profits[::-1])
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from Agent import Population
+from Algorithm import GeneticAlgorithm, GASettings
+from Algorithm.gene_batch import GeneBatch
+
+LENGTH = 12
+
+
+class ReplayRng:
+    # zwraca z góry ustalone losowania w kolejności wywołań GeneBatch
+    def __init__(self, *draws):
+        self.draws = list(draws)
+
+    def _next(self, *args, **kwargs):
+        return np.asarray(self.draws.pop(0))
+
+    integers = lognormal = random = normal = _next
+
+
+# pętle operatorów sprzed GeneBatch, z losowaniami podanymi z zewnątrz
+def rotate(content: np.ndarray, start: int, size: int, shift: int) -> np.ndarray:
+    new_content = content.copy()
+    if size == 1:
+        return new_content
+    for i in range(size):
+        cur_pos = (start+i) % len(content)
+        target_pos = (cur_pos+shift) % len(content)
+        if i >= size-shift:
+            target_pos = (target_pos+len(content)-size) % len(content)
+        new_content[cur_pos] = content[target_pos]
+    return new_content
+
+
+def crossover_point(content1: np.ndarray, content2: np.ndarray, points, first_child: bool) -> np.ndarray:
+    child1, child2 = content1, content2
+    for point in points:
+        child1, child2 = np.concatenate((child1[:point], child2[point:])), np.concatenate((child2[:point], child1[point:]))
+    return child1 if first_child else child2
+
+
+def test_rotation_matches_sequential_loop():
+    cases = [(start, size, shift) for start in (0, 5, 11) for size in (0, 1, 2, 7, 12, 19, 30) for shift in (0, 1, 4, 13)]
+    start, size, shift = map(np.array, zip(*cases))
+    content = np.arange(len(cases) * LENGTH, dtype=np.float64).reshape(len(cases), LENGTH)
+    genes = GeneBatch(content.copy())
+    genes.mutate_rotate(GASettings(), ReplayRng(start, size.astype(float), shift.astype(float)),
+                        np.ones(len(cases), dtype=bool))
+
+    for row, case in zip(range(len(cases)), cases):
+        np.testing.assert_array_equal(genes.content[row], rotate(content[row], *case), err_msg=str(case))
+
+
+@pytest.mark.parametrize('amount', [1, 2, 5])
+def test_point_crossover_matches_tail_swaps(amount):
+    rng = np.random.default_rng(amount)
+    genes = 50
+    content1, content2 = rng.normal(size=(2, genes, LENGTH))
+    points = rng.integers(0, LENGTH, (genes, amount))
+    first_child = rng.random(genes)
+    settings = GASettings(crossover_point_amount=amount)
+    children = GeneBatch(content1).crossover_point(GeneBatch(content2), settings, ReplayRng(points, first_child))
+
+    for row in range(genes):
+        expected = crossover_point(content1[row], content2[row], points[row], first_child[row] < 0.5)
+        np.testing.assert_array_equal(children.content[row], expected)
+
+
+def test_mutation_and_blend_distributions():
+    rng = np.random.default_rng(0)
+    settings = GASettings(float_mutation_variance=2.0, crossover_imbalance=0.25)
+    genes = GeneBatch(np.zeros((20_000, LENGTH)))
+    mask = np.arange(len(genes.content)) % 2 == 0
+    genes.mutate_change(settings, rng, mask)
+
+    changed = genes.content != 0
+    assert (changed.sum(axis=1) == mask).all()
+    assert genes.content[changed].std() == pytest.approx(2.0, rel=0.03)
+    assert np.bincount(changed[mask].argmax(axis=1), minlength=LENGTH) / mask.sum() == pytest.approx(
+        np.full(LENGTH, 1 / LENGTH), abs=0.01)
+
+    blended = GeneBatch(np.ones((2000, LENGTH))).crossover_uniform(GeneBatch(np.zeros((2000, LENGTH))), settings, rng)
+    # beta ~ U(-imbalance, 1+imbalance)
+    assert blended.content.min() >= -0.25 and blended.content.max() <= 1.25
+    assert blended.content.mean() == pytest.approx(0.5, abs=0.01)
+    assert blended.content.var() == pytest.approx(1.5**2 / 12, rel=0.03)
+
+
+def test_survivor_drawn_twice_ages_twice():
+    population = Population(['AAA'], np.zeros((3, 1, LENGTH), dtype=np.int16))
+    population.profits[:] = [0.0, 1.0, 0.0]
+    population.ages[:] = [5, 2, 7]
+    GA = GeneticAlgorithm(seed=0)
+    GA.settings.children_ratio = 0.0
+    evolved = GA.evolve(population)
+
+    np.testing.assert_array_equal(evolved.ages, [5, 5, 5])
+    assert (GA.agent_life_lengths.count, GA.agent_life_lengths.mean) == (2, 6)
@@ -0,0 +1,27 @@
+import json
+import numpy as np
+
+from Algorithm import GASettings
+from Experiments import HyperparameterSearch
+from Experiments.hyperparameter_search import sample_settings, SEARCH_SPACE
+
+
+def test_sampling_keeps_settings_outside_search_space():
+    base = GASettings(repair=True)
+    settings = sample_settings(np.random.default_rng(0), base=base)
+    assert settings.repair
+    assert settings != base
+    assert all(SEARCH_SPACE[name][0] <= getattr(settings, name) <= SEARCH_SPACE[name][1] for name in SEARCH_SPACE)
+
+
+def test_trial_configs_have_own_seeds_and_results_dir(tmp_path):
+    config = tmp_path / 'base.json'
+    config.write_text(json.dumps({'ga': {'repair': True}, 'num_of_iterations': 10}))
+    search = HyperparameterSearch(str(config), min_iterations=10, max_iterations=90, seed=5)
+    first = search.trial_config(1, GASettings(repair=True), 10)
+    second = search.trial_config(2, GASettings(repair=True), 10)
+    assert first['seed'] != second['seed']
+    assert search.trial_config(1, GASettings(), 30)['seed'] == first['seed']
+    assert first['ga']['repair']
+    assert first['results_dir'] == str(search.results_dir)
+    assert search.results_dir.name == 'search_base'
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from Simulation import IslandModel, METRICS_DTYPE
+
+
+def island_metrics(median_profit: float, best_profit: float) -> pd.DataFrame:
+    records = np.zeros(3, dtype=METRICS_DTYPE)
+    records['iteration'] = np.arange(3)
+    records['best_agent_profit'] = best_profit
+    records['median_profit'] = median_profit
+    records['mean_profit'] = median_profit
+    return pd.DataFrame(records)
+
+
+def test_merged_metrics_keep_single_island_schema():
+    merged = IslandModel.merge_metrics([island_metrics(10.0, 5.0), island_metrics(40.0, 7.0)], [30, 10])
+    assert list(merged.columns) == list(METRICS_DTYPE.names)
+    np.testing.assert_allclose(merged['median_profit'], 17.5)
+    np.testing.assert_allclose(merged['mean_profit'], 17.5)
+    np.testing.assert_array_equal(merged['best_agent_profit'], 7.0)
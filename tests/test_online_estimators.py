@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Stocks import SyntheticPriceSource
+from Stocks.estimators import OnlineEstimator, EwmaEstimator, StockPriceEstimator
+from Stocks.estimators.stock_price_estimator import (LeastSqaureMethodEstimator, MethodOfMomentsEstimator,
+                                                     MaximumLikelihoodEstimator)
+from .estimator_evaluation import EstimatorEvaluation
+
+FUTURE_DAYS = 10
+
+
+@pytest.fixture(scope='module')
+def close_prices() -> np.ndarray:
+    rng = np.random.default_rng(1)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, 2000)))
+
+
+@pytest.mark.parametrize('estimator', [LeastSqaureMethodEstimator(), MethodOfMomentsEstimator(),
+                                       MaximumLikelihoodEstimator()])
+@pytest.mark.parametrize('lookback_days', [2, 7, 30, 250])
+def test_online_matches_batch(close_prices, estimator, lookback_days):
+    batch = estimator.estimate_windows(close_prices, lookback_days, FUTURE_DAYS)
+    online = OnlineEstimator.for_estimator(estimator, lookback_days, FUTURE_DAYS).estimate_stream(
+        close_prices, lookback_days)
+
+    assert len(online) == len(batch)
+    np.testing.assert_allclose(online.estimated_prices, batch.estimated_prices, rtol=1e-9)
+    # sumy przesuwane w O(1) tracą kilka cyfr, gdy współczynnik jest bliski zera; sigma porównywana
+    # jako wariancja, bo pierwiastek z błędu zaokrąglenia przy sigma = 0 jest rzędu 1e-10
+    online, batch = online.equation_coefficients, batch.equation_coefficients
+    if not isinstance(estimator, LeastSqaureMethodEstimator):
+        online, batch = np.column_stack((online[:, 0], online[:, 1] ** 2)), np.column_stack((batch[:, 0], batch[:, 1] ** 2))
+    scale = np.abs(batch).max(axis=1, keepdims=True)
+    assert np.all(np.abs(online - batch) <= 1e-7 * scale)
+
+
+def test_ewma_matches_exponentially_weighted_moments(close_prices):
+    halflife = 20
+    result = EwmaEstimator(halflife, FUTURE_DAYS).estimate_stream(close_prices, 30)
+
+    log_returns = pd.Series(np.diff(np.log(close_prices))).ewm(halflife=halflife, adjust=False)
+    mu, sigma = log_returns.mean().to_numpy()[28:], np.sqrt(log_returns.var(bias=True).to_numpy()[28:])
+    assert len(result) == len(close_prices) - 29
+    np.testing.assert_allclose(result.equation_coefficients[:, 0], mu, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(result.equation_coefficients[:, 1], sigma, rtol=1e-9)
+    np.testing.assert_allclose(result.estimated_prices[:, 0], close_prices[29:] * np.exp(mu), rtol=1e-12)
+
+
+def test_short_stream_and_unknown_estimator(close_prices):
+    assert len(EwmaEstimator(5, FUTURE_DAYS).estimate_stream(close_prices[:3], 5)) == 0
+    with pytest.raises(TypeError):
+        OnlineEstimator.for_estimator(StockPriceEstimator(), 10, FUTURE_DAYS)
+
+
+def test_online_evaluation_reports_batch_metrics():
+    configs = [{'start_date': '2020-01-01', 'end_date': '2021-01-01', 'forecast_days': 5, 'lookback_days': 10}]
+    evaluation = dict(configs=configs, tickers=['AAA'], workers=1, source=SyntheticPriceSource(0))
+    batch = EstimatorEvaluation(**evaluation).run()
+    online = EstimatorEvaluation(**evaluation, online=True, ewma=True).run()
+
+    assert online['strategy'].tolist() == batch['strategy'].tolist() + ['EWMA']
+    assert online['online'].all() and not batch['online'].any()
+    columns = ['windows', 'mse', 'mae', 'hit_rate']
+    np.testing.assert_allclose(online[columns][:len(batch)].to_numpy(), batch[columns].to_numpy(), rtol=1e-9)
+    assert online['windows'].iloc[-1] == batch['windows'].iloc[0]
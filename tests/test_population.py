@@ -0,0 +1,39 @@
+import numpy as np
+
+from Agent import Population, ACTION_DTYPE, GENOME_DTYPE, round_actions
+from Algorithm import GeneticAlgorithm, GASettings
+from Algorithm.gene_batch import GeneBatch
+
+LIMITS = np.iinfo(ACTION_DTYPE)
+
+
+def test_round_actions_clips_instead_of_wrapping():
+    values = np.array([-1e9, -32768.7, -2.5, -0.4, 0.6, 32767.4, 40000.0, 1e12])
+    np.testing.assert_array_equal(round_actions(values), [LIMITS.min, LIMITS.min, -2, 0, 1, LIMITS.max, LIMITS.max,
+                                                          LIMITS.max])
+    assert round_actions(values).dtype == ACTION_DTYPE
+
+
+def test_population_conversions_clip():
+    genomes = Population(['AAA'], np.array([[[1e6, -1e6, 3.6]]]), GENOME_DTYPE)
+    np.testing.assert_array_equal(genomes.astype(ACTION_DTYPE).actions, [[[LIMITS.max, LIMITS.min, 4]]])
+    wide = Population(['AAA'], np.array([[[70_000, -70_000, 5]]]), np.int64)
+    np.testing.assert_array_equal(wide.astype(ACTION_DTYPE).actions, [[[LIMITS.max, LIMITS.min, 5]]])
+    histories = Population.from_sale_histories([{'AAA': [100_000, -3, 2.4]}])
+    np.testing.assert_array_equal(histories.actions, [[[LIMITS.max, -3, 2]]])
+
+
+def test_mutated_children_are_clipped():
+    population = Population(['AAA', 'BBB'], np.full((40, 2, 30), LIMITS.max - 1, dtype=ACTION_DTYPE))
+    population.actions[::2] = LIMITS.min + 1
+    settings = GASettings(float_mutation_variance=1e5, mutate_change_chance=1.0)
+    GA = GeneticAlgorithm(seed=0)
+    GA.settings = settings
+    # zerowy zysk całej populacji: evolve tylko mutuje, więc te same losowania da GeneBatch z tym samym ziarnem
+    children = GA.evolve(population)
+    genes = GeneBatch(population.actions.astype(GENOME_DTYPE).reshape(-1, 30))
+    genes.mutate(settings, np.random.default_rng(0))
+
+    assert (np.abs(genes.content) > LIMITS.max + 1).any()
+    np.testing.assert_array_equal(children.actions.reshape(-1, 30),
+                                  np.clip(np.rint(genes.content), LIMITS.min, LIMITS.max))
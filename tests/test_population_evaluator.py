@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from Agent import Agent, Population
+from Algorithm import GeneticAlgorithm
+from Simulation import PopulationEvaluator, FitnessCache
+from Stocks import PricePanel
+from .synthetic_market import TICKERS, START_ASSET, GA_CONFIG, synthetic_panel, random_actions, initial_population
+
+
+@pytest.fixture(scope='module')
+def panel() -> PricePanel:
+    return synthetic_panel()
+
+
+def test_simulate_matches_agent_execute(panel):
+    prices = panel.matrix(TICKERS)
+    population = Population(TICKERS, random_actions(np.random.default_rng(5), 100, len(panel)))
+    population.actions[:50] = np.abs(population.actions[:50]) // 3
+    evaluator = PopulationEvaluator(prices, START_ASSET, chunk_size=16)
+    profits = evaluator.evaluate(population.actions)
+
+    historical_prices = {ticker: prices[i] for i, ticker in enumerate(TICKERS)}
+    agents = Agent.views(population.take(slice(None)))
+    for agent in agents:
+        agent.execute(historical_prices, START_ASSET)
+    expected = np.array([agent.profit for agent in agents])
+
+    assert 0 < np.count_nonzero(expected) < len(expected)
+    np.testing.assert_array_equal(profits, expected)
+    np.testing.assert_array_equal(evaluator.simulate(population.actions).profit, expected)
+
+
+def test_incremental_evaluation_matches_simulate(panel):
+    evaluator = PopulationEvaluator.from_historical_prices(panel, TICKERS, len(panel), START_ASSET,
+                                                           cache=FitnessCache(), checkpoint_stride=8)
+    reference = PopulationEvaluator.from_historical_prices(panel, TICKERS, len(panel), START_ASSET)
+    GA = GeneticAlgorithm(GA_CONFIG, seed=1)
+    population = initial_population(panel, 60)
+    evaluator.evaluate_population(population)
+    for generation in range(15):
+        population = GA.evolve(population)
+        # co trzecia generacja bez rodziców, więc niezmienione genomy przychodzą z cache
+        evaluator.evaluate_population(population, GA.parents if generation % 3 else None)
+        np.testing.assert_array_equal(population.profits, reference.simulate(population.actions).profit)
+    assert evaluator.cache.hits > 0
+    assert evaluator.simulated_day_steps < evaluator.day_steps
@@ -0,0 +1,63 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+
+from Stocks import PricePanel, Period
+
+
+def close_prices() -> dict[str, pd.Series]:
+    # BBB zaczyna notowania później i nie ma notowania 2020-01-08, CCC nie ma 2020-01-06
+    days = pd.bdate_range('2020-01-01', '2020-01-14')
+    aaa = pd.Series(np.arange(len(days), dtype=np.float64) + 10, index=days)
+    bbb = pd.Series(np.arange(len(days), dtype=np.float64) + 20, index=days).drop(days[:2]).drop(pd.Timestamp('2020-01-08'))
+    # strefa czasowa i godzina jak w danych z yfinance
+    ccc = pd.Series(np.arange(len(days), dtype=np.float64) + 30,
+                    index=(days + pd.Timedelta(hours=9)).tz_localize('America/New_York')).drop(
+        pd.Timestamp('2020-01-06 09:00', tz='America/New_York'))
+    return {'AAA': aaa, 'BBB': bbb, 'CCC': ccc}
+
+
+def test_ffill_starts_at_latest_first_trade():
+    panel = PricePanel.from_series(close_prices())
+
+    expected_dates = pd.bdate_range('2020-01-03', '2020-01-14').values.astype('datetime64[D]')
+    np.testing.assert_array_equal(panel.dates, expected_dates)
+    assert panel.tickers == ['AAA', 'BBB', 'CCC']
+    # brakujący dzień dostaje ostatnią znaną cenę
+    assert panel['BBB'][panel.dates == np.datetime64('2020-01-08')] == 24.0
+    assert panel['CCC'][panel.dates == np.datetime64('2020-01-06')] == 32.0
+    np.testing.assert_array_equal(panel['AAA'], np.arange(2, 10) + 10.0)
+    assert panel.prices.flags.f_contiguous and panel['AAA'].base is not None
+
+
+def test_intersect_keeps_days_quoted_by_all_tickers():
+    panel = PricePanel.from_series(close_prices(), fill='intersect')
+
+    assert np.datetime64('2020-01-06') not in panel.dates
+    assert np.datetime64('2020-01-08') not in panel.dates
+    assert len(panel) == 6
+    assert not np.isnan(panel.prices).any()
+
+
+def test_missing_ticker_or_policy_raises():
+    prices = close_prices()
+    with pytest.raises(LookupError):
+        PricePanel.from_series({**prices, 'DDD': pd.Series([np.nan], index=pd.DatetimeIndex(['2020-01-02']))})
+    with pytest.raises(ValueError):
+        PricePanel.from_series(prices, fill='bfill')
+    with pytest.raises(LookupError):
+        PricePanel.from_series(prices).get_close_prices('DDD', Period(date(2020, 1, 1), date(2020, 2, 1)))
+
+
+def test_between_matrix_and_close_prices_share_calendar():
+    panel = PricePanel.from_series(close_prices())
+    period = Period(date(2020, 1, 6), date(2020, 1, 10))
+    window = panel.between(period)
+
+    np.testing.assert_array_equal(window.dates, pd.bdate_range('2020-01-06', '2020-01-09').values.astype('datetime64[D]'))
+    np.testing.assert_array_equal(window.matrix(['CCC', 'AAA']), window.prices[:, [2, 0]].T)
+    assert window.matrix().shape == (3, 4)
+    close = panel.get_close_prices('BBB', period)
+    np.testing.assert_array_equal(close.to_numpy(), window['BBB'])
+    assert (close.index == pd.DatetimeIndex(window.dates)).all()
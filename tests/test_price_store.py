@@ -0,0 +1,72 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+
+from Stocks import PriceStore, Period
+
+
+class FakeMarket:
+    # ceny = numer dnia od 2020-01-01 (+ version), zapamiętuje pobierane zakresy
+    def __init__(self):
+        self.requests = []
+        self.version = 0.0
+
+    def fetch(self, ticker, start, end):
+        self.requests.append((ticker, str(start), str(end)))
+        days = pd.bdate_range(str(start), str(end), inclusive='left').values.astype('datetime64[D]')
+        return days, (days - np.datetime64('2020-01-01')).astype(np.float64) + self.version
+
+
+@pytest.fixture
+def market(monkeypatch) -> FakeMarket:
+    market = FakeMarket()
+    monkeypatch.setattr(PriceStore, '_fetch', staticmethod(market.fetch))
+    return market
+
+
+def test_covered_period_is_served_locally(tmp_path, market):
+    store = PriceStore(tmp_path)
+    first = store.get_close_prices('AAA', Period(date(2020, 1, 1), date(2020, 3, 1)))
+    inside = store.get_close_prices('AAA', Period(date(2020, 1, 10), date(2020, 2, 1)))
+    offline = PriceStore(tmp_path, offline=True).get_close_prices('AAA', Period(date(2020, 1, 10), date(2020, 2, 1)))
+
+    assert market.requests == [('AAA', '2020-01-01', '2020-03-01')]
+    pd.testing.assert_series_equal(inside, first.loc['2020-01-10':'2020-01-31'])
+    pd.testing.assert_series_equal(offline, inside)
+
+
+def test_only_missing_ranges_are_fetched_and_merged(tmp_path, market):
+    store = PriceStore(tmp_path)
+    refreshed = []
+    store.refresh_listeners.append(refreshed.append)
+    store.get_close_prices('AAA', Period(date(2020, 2, 1), date(2020, 3, 1)))
+    market.version = 0.5
+    prices = store.get_close_prices('AAA', Period(date(2020, 1, 1), date(2020, 4, 1)))
+
+    assert market.requests[1:] == [('AAA', '2020-01-01', '2020-02-01'), ('AAA', '2020-03-01', '2020-04-01')]
+    assert refreshed == ['AAA', 'AAA']
+    assert prices.index.is_monotonic_increasing and prices.index.is_unique
+    expected = pd.bdate_range('2020-01-01', '2020-04-01', inclusive='left')
+    assert (prices.index == expected).all()
+    # dni pobrane wcześniej zostają, nowe zakresy mają ceny z drugiego pobrania
+    assert prices['2020-02-03'] == 33.0
+    assert prices['2020-01-02'] == 1.5
+
+
+def test_refetched_day_replaces_stored_price(tmp_path, market):
+    store = PriceStore(tmp_path)
+    dates, close = market.fetch('AAA', np.datetime64('2020-01-01'), np.datetime64('2020-01-10'))
+    covered = (np.datetime64('2020-01-01'), np.datetime64('2020-01-08'))
+    store._save('AAA', dates, close, covered)
+    market.version = 100.0
+    prices = store.get_close_prices('AAA', Period(date(2020, 1, 1), date(2020, 1, 10)))
+
+    assert prices['2020-01-08'] == 107.0
+    assert prices['2020-01-07'] == 6.0
+
+
+def test_offline_store_does_not_download(tmp_path, market):
+    with pytest.raises(LookupError):
+        PriceStore(tmp_path, offline=True).get_close_prices('AAA', Period(date(2020, 1, 1), date(2020, 2, 1)))
+    assert market.requests == []
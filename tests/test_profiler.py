@@ -0,0 +1,48 @@
+import threading
+import time
+import pytest
+
+from Util import PhaseProfiler
+
+
+def test_nested_phases_report_self_time():
+    profiler = PhaseProfiler(trace_allocations=True)
+    profiler.start()
+    kept = []
+    with profiler.phase('warm_start'):
+        time.sleep(0.02)
+        with profiler.phase('price_fetch'):
+            time.sleep(0.03)
+            kept.append(bytearray(1_000_000))
+            with profiler.phase('price_fetch'):
+                time.sleep(0.01)
+    profiler.stop()
+    frame = profiler.to_frame().set_index('phase')
+    warm_start, price_fetch = frame.loc['warm_start'], frame.loc['price_fetch']
+
+    assert price_fetch['calls'] == 2
+    # faza zagnieżdżona sama w sobie liczy się raz do czasu łącznego
+    assert price_fetch['wall_time'] == pytest.approx(price_fetch['self_wall_time'])
+    assert 0.04 <= price_fetch['wall_time'] < warm_start['wall_time']
+    assert warm_start['self_wall_time'] == pytest.approx(warm_start['wall_time'] - price_fetch['wall_time'])
+    assert 0.02 <= warm_start['self_wall_time'] < 0.04
+    assert frame['self_wall_time'].sum() == pytest.approx(warm_start['wall_time'])
+    assert price_fetch['self_allocated'] >= 1_000_000 > warm_start['self_allocated']
+    assert warm_start['net_allocated'] >= 1_000_000
+
+
+def test_phases_in_other_threads_are_not_children():
+    profiler = PhaseProfiler()
+
+    def fetch():
+        with profiler.phase('price_fetch'):
+            time.sleep(0.02)
+
+    with profiler.phase('evaluate'):
+        thread = threading.Thread(target=fetch)
+        thread.start()
+        thread.join()
+    frame = profiler.to_frame().set_index('phase')
+
+    assert frame.loc['evaluate', 'self_wall_time'] == pytest.approx(frame.loc['evaluate', 'wall_time'])
+    assert frame.loc['price_fetch', 'wall_time'] >= 0.02
@@ -0,0 +1,21 @@
+import numpy as np
+
+from Experiments.walk_forward import replay, buy_and_hold
+from Simulation import PopulationEvaluator
+
+
+def test_replay_truncates_or_pads_by_day_number():
+    actions = np.arange(2 * 3 * 5).reshape(2, 3, 5)
+    np.testing.assert_array_equal(replay(actions, 3), actions[:, :, :3])
+    padded = replay(actions, 7)
+    np.testing.assert_array_equal(padded[:, :, :5], actions)
+    assert not padded[:, :, 5:].any()
+
+
+def test_buy_and_hold_is_feasible_and_splits_cash():
+    prices = np.array([[10.0, 11.0, 12.0], [3.0, 2.0, 4.0]])
+    actions = buy_and_hold(prices, 100.0)
+    np.testing.assert_array_equal(actions[0, :, 0], [4, 16])
+    assert not actions[0, :, 1:].any()
+    profit = PopulationEvaluator(prices, 100.0).evaluate(actions)[0]
+    assert profit == 100.0 - 4 * 10 - 16 * 3 + 4 * 12 + 16 * 4